@@ -0,0 +1,71 @@
+"""
+Admission Middleware
+Admits or sheds requests through an AdmissionController before their bodies are read
+"""
+
+import json
+import logging
+from typing import Callable, Optional
+
+from app.services.admission import AdmissionController, AdmissionRejectedError
+
+logger = logging.getLogger(__name__)
+
+
+class AdmissionMiddleware:
+    """
+    ASGI middleware holding an admission slot for each classified request
+
+    Admission happens before the upload is read, so shed requests cost
+    almost nothing. The slot is held until the response has been produced.
+    """
+
+    def __init__(
+        self,
+        app,
+        controller: AdmissionController,
+        classify: Callable[[dict], Optional[str]],
+        on_reject: Optional[Callable[[AdmissionRejectedError], None]] = None,
+    ):
+        """
+        Initialize the middleware
+
+        Args:
+            app: Downstream ASGI application
+            controller: Controller owning the lanes
+            classify: Maps an HTTP scope to a lane name, or None to bypass admission
+            on_reject: Optional callback for every shed request (e.g. metrics)
+        """
+        self.app = app
+        self.controller = controller
+        self.classify = classify
+        self.on_reject = on_reject
+
+    async def __call__(self, scope, receive, send):
+        lane = self.classify(scope) if scope["type"] == "http" else None
+        if lane is None:
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            async with self.controller.admit(lane):
+                await self.app(scope, receive, send)
+        except AdmissionRejectedError as e:
+            logger.warning(str(e))
+            if self.on_reject:
+                self.on_reject(e)
+            await self._reject(send, e)
+
+    @staticmethod
+    async def _reject(send, error: AdmissionRejectedError) -> None:
+        body = json.dumps({"detail": "Server is busy. Please retry shortly."}).encode("utf-8")
+        await send({
+            "type": "http.response.start",
+            "status": error.status_code,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode("latin-1")),
+                (b"retry-after", str(error.retry_after).encode("latin-1")),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
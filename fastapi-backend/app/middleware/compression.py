@@ -0,0 +1,135 @@
+"""
+Compression Middleware
+Brotli/gzip encoding of buffered responses above a size threshold
+"""
+
+import gzip
+import logging
+from typing import List, Optional, Tuple
+
+# Brotli is optional; gzip is always available
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+COMPRESSIBLE_TYPES = (b"application/json", b"text/", b"application/x-ndjson")
+
+
+def _accepted_encodings(header: bytes) -> List[str]:
+    """Encodings from an Accept-Encoding header, skipping those with q=0"""
+    encodings = []
+    for part in header.decode("latin-1").split(","):
+        name, _, params = part.strip().partition(";")
+        params = params.replace(" ", "")
+        if params.startswith("q="):
+            try:
+                if float(params[2:]) == 0:
+                    continue
+            except ValueError:
+                continue
+        if name:
+            encodings.append(name.strip().lower())
+    return encodings
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware compressing complete responses with brotli or gzip
+
+    Only responses delivered in a single body message are compressed, so
+    streamed responses (such as NDJSON section events) pass through untouched
+    and keep flushing as they are produced. Brotli is preferred when the
+    brotli package is installed and the client accepts it.
+    """
+
+    def __init__(self, app, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4):
+        """
+        Initialize the middleware
+
+        Args:
+            app: Downstream ASGI application
+            minimum_size: Smallest body, in bytes, worth compressing
+            gzip_level: gzip compression level (1-9)
+            brotli_quality: Brotli quality (0-11); low values are much faster
+        """
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = self._choose_encoding(dict(scope["headers"]).get(b"accept-encoding", b""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message: Optional[dict] = None
+        passthrough = False
+
+        async def compressing_send(message):
+            nonlocal start_message, passthrough
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            if message.get("more_body", False) or not self._should_compress(start_message, body):
+                # Streaming or not worth it: forward as-is from here on
+                passthrough = True
+                await send(start_message)
+                await send(message)
+                return
+
+            compressed = self._compress(body, encoding)
+            headers = [
+                (name, value) for name, value in start_message["headers"]
+                if name not in (b"content-length", b"content-encoding")
+            ]
+            headers += self._vary_headers(start_message["headers"])
+            headers += [
+                (b"content-encoding", encoding.encode("latin-1")),
+                (b"content-length", str(len(compressed)).encode("latin-1")),
+            ]
+            await send({**start_message, "headers": headers})
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, compressing_send)
+
+    def _choose_encoding(self, accept_encoding: bytes) -> Optional[str]:
+        accepted = _accepted_encodings(accept_encoding)
+        if brotli is not None and "br" in accepted:
+            return "br"
+        if "gzip" in accepted:
+            return "gzip"
+        return None
+
+    def _should_compress(self, start_message: dict, body: bytes) -> bool:
+        if len(body) < self.minimum_size or start_message["status"] in (204, 304):
+            return False
+        headers = dict(start_message["headers"])
+        if b"content-encoding" in headers:
+            return False
+        content_type = headers.get(b"content-type", b"")
+        return content_type.startswith(COMPRESSIBLE_TYPES)
+
+    def _compress(self, body: bytes, encoding: str) -> bytes:
+        if encoding == "br":
+            return brotli.compress(body, quality=self.brotli_quality)
+        return gzip.compress(body, compresslevel=self.gzip_level)
+
+    @staticmethod
+    def _vary_headers(headers: List[Tuple[bytes, bytes]]) -> List[Tuple[bytes, bytes]]:
+        for name, value in headers:
+            if name == b"vary" and b"accept-encoding" in value.lower():
+                return []
+        return [(b"vary", b"Accept-Encoding")]
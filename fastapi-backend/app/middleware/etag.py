@@ -0,0 +1,95 @@
+"""
+ETag Middleware
+Tags buffered responses with a content hash and answers matching GETs with 304
+"""
+
+import hashlib
+import logging
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+CONDITIONAL_METHODS = ("GET", "HEAD")
+
+
+def _matches(if_none_match: bytes, etag: bytes) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag"""
+    if if_none_match.strip() == b"*":
+        return True
+    opaque = etag[2:] if etag.startswith(b"W/") else etag
+    for candidate in if_none_match.split(b","):
+        candidate = candidate.strip()
+        if candidate.startswith(b"W/"):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+
+class ETagMiddleware:
+    """
+    ASGI middleware adding weak ETags to successful buffered responses
+
+    The tag is a hash of the uncompressed body, so it is stable across
+    content encodings (hence weak). GET/HEAD requests whose If-None-Match
+    matches receive a bodyless 304. Other methods only get the header:
+    conditional POSTs are not answered with 304, as HTTP reserves that for
+    safe methods. Streamed responses are left untouched.
+    """
+
+    def __init__(self, app):
+        """
+        Initialize the middleware
+
+        Args:
+            app: Downstream ASGI application
+        """
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        if_none_match: Optional[bytes] = None
+        if scope["method"] in CONDITIONAL_METHODS:
+            if_none_match = dict(scope["headers"]).get(b"if-none-match")
+
+        start_message: Optional[dict] = None
+        passthrough = False
+
+        async def etag_send(message):
+            nonlocal start_message, passthrough
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            headers = dict(start_message["headers"])
+            if message.get("more_body", False) or start_message["status"] != 200 or b"etag" in headers:
+                passthrough = True
+                await send(start_message)
+                await send(message)
+                return
+
+            etag = b'W/"' + hashlib.sha256(body).hexdigest()[:32].encode("latin-1") + b'"'
+            if if_none_match is not None and _matches(if_none_match, etag):
+                not_modified_headers = [
+                    (name, value) for name, value in start_message["headers"]
+                    if name not in (b"content-length", b"content-type")
+                ]
+                await send({
+                    "type": "http.response.start",
+                    "status": 304,
+                    "headers": not_modified_headers + [(b"etag", etag)],
+                })
+                await send({"type": "http.response.body", "body": b""})
+                return
+
+            await send({**start_message, "headers": list(start_message["headers"]) + [(b"etag", etag)]})
+            await send(message)
+
+        await self.app(scope, receive, etag_send)
@@ -0,0 +1,66 @@
+"""
+Profiling Middleware
+Profiles requests that ask for it and tags their responses with the profile ID
+"""
+
+import time
+from typing import Callable, Optional
+
+from app.services.profiler import Profiler
+
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware opening a request profile when the request asks for one
+
+    The profile is the current_profile context variable for the rest of the
+    request, so the parse pool and the AI structurer add their stages to it.
+    Responses carry an X-Profile-Id header naming the saved profile.
+    """
+
+    def __init__(self, app, profiler: Profiler, should_profile: Callable[[dict], bool]):
+        """
+        Initialize the middleware
+
+        Args:
+            app: Downstream ASGI application
+            profiler: Profiler deciding on and storing profiles
+            should_profile: Whether a scope's route may be profiled at all
+        """
+        self.app = app
+        self.profiler = profiler
+        self.should_profile = should_profile
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.should_profile(scope) or not self._requested(scope):
+            await self.app(scope, receive, send)
+            return
+
+        async with self.profiler.begin(f"{scope['method']} {scope['path']}") as profile:
+            if profile is None:
+                await self.app(scope, receive, send)
+                return
+
+            started = time.perf_counter()
+
+            async def send_with_profile_id(message):
+                if message["type"] == "http.response.start":
+                    profile.details["status_code"] = message["status"]
+                    message = {
+                        **message,
+                        "headers": [*message.get("headers", []), (b"x-profile-id", profile.id.encode("latin-1"))],
+                    }
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_profile_id)
+            finally:
+                profile.details["wall_ms"] = round((time.perf_counter() - started) * 1000, 2)
+
+    def _requested(self, scope) -> bool:
+        header_value: Optional[str] = None
+        for name, value in scope.get("headers", []):
+            if name == Profiler.HEADER:
+                header_value = value.decode("latin-1")
+                break
+        return self.profiler.requested(header_value)
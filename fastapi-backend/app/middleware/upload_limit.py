@@ -0,0 +1,93 @@
+"""
+Upload Limit Middleware
+Rejects oversized request bodies while they are still streaming in
+"""
+
+import json
+import logging
+from typing import Dict
+
+logger = logging.getLogger(__name__)
+
+
+class _BodyTooLarge(BaseException):
+    """
+    Signals that the body limit was crossed mid-stream.
+
+    Derives from BaseException so FastAPI's form parsing (which wraps any
+    Exception into a generic 400) lets it propagate back to the middleware.
+    """
+
+
+class UploadLimitMiddleware:
+    """
+    ASGI middleware that caps request body size per path
+
+    Requests with a Content-Length over the limit are refused before any of
+    the body is read. Chunked requests are counted as they stream in and are
+    aborted with 413 the moment they pass the limit, instead of after the
+    whole upload has been spooled.
+    """
+
+    def __init__(self, app, limits: Dict[str, int]):
+        """
+        Initialize the middleware
+
+        Args:
+            app: Downstream ASGI application
+            limits: Maximum body size in bytes, keyed by request path
+        """
+        self.app = app
+        self.limits = limits
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] not in self.limits:
+            await self.app(scope, receive, send)
+            return
+
+        limit = self.limits[scope["path"]]
+
+        content_length = dict(scope["headers"]).get(b"content-length")
+        if content_length is not None and content_length.isdigit() and int(content_length) > limit:
+            await self._reject(send, limit)
+            return
+
+        received = 0
+        response_started = False
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    raise _BodyTooLarge()
+            return message
+
+        async def tracking_send(message):
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, tracking_send)
+        except _BodyTooLarge:
+            if response_started:
+                raise RuntimeError("Request body limit exceeded after response started")
+            await self._reject(send, limit)
+
+    @staticmethod
+    async def _reject(send, limit: int) -> None:
+        logger.warning(f"Rejected request body larger than {limit} bytes")
+        body = json.dumps({"detail": "Request body exceeds upload size limit"}).encode("utf-8")
+        await send({
+            "type": "http.response.start",
+            "status": 413,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode("latin-1")),
+                (b"connection", b"close"),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -3,7 +3,7 @@ Pydantic models for request/response schemas
 """
 
 from pydantic import BaseModel, Field
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Literal
 
 
 class HealthResponse(BaseModel):
@@ -47,6 +47,10 @@ class Education(BaseModel):
     achievements: List[str] = Field(default_factory=list)
 
 
+# Which parts of a parse result to return: structured data, raw text, or both
+ResponseFields = Literal["structured", "raw", "both"]
+
+
 class StructuredResumeData(BaseModel):
     """Complete structured resume data"""
     personal_info: Optional[PersonalInfo] = None
@@ -64,6 +68,43 @@ class ParsedResumeResponse(BaseModel):
     """Response model for parsed resume"""
     success: bool
     filename: str
-    raw_text: str
+    raw_text: Optional[str] = None
     structured_data: Optional[StructuredResumeData] = None
     message: str
+    cached: bool = False
+    # Structured data reused from a similar earlier upload, not this file's own
+    near_duplicate: bool = False
+
+
+class BatchFileResult(BaseModel):
+    """Result for one file of a batch parse"""
+    filename: str
+    success: bool
+    raw_text: Optional[str] = None
+    structured_data: Optional[StructuredResumeData] = None
+    cached: bool = False
+    near_duplicate: bool = False
+    error: Optional[str] = None
+    status_code: Optional[int] = None
+
+
+class BatchParseResponse(BaseModel):
+    """Response model for batch resume parsing"""
+    success: bool
+    total: int
+    succeeded: int
+    failed: int
+    results: List[BatchFileResult]
+    message: str
+
+
+class JobResponse(BaseModel):
+    """Status and, once finished, result of an asynchronous parse job"""
+    job_id: str
+    status: str
+    filename: str
+    created_at: float
+    updated_at: float
+    result: Optional[ParsedResumeResponse] = None
+    error: Optional[str] = None
+    status_code: Optional[int] = None
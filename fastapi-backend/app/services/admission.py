@@ -0,0 +1,205 @@
+"""
+Admission Control Service
+Priority lanes with per-lane concurrency, bounded queues and latency-based load shedding
+"""
+
+import asyncio
+import logging
+import math
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Deque, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Weight of the newest observation in the per-lane latency average
+LATENCY_SMOOTHING = 0.2
+
+
+class AdmissionRejectedError(Exception):
+    """Raised when a request is shed instead of admitted"""
+
+    def __init__(self, lane: str, reason: str, status_code: int, retry_after: int):
+        super().__init__(f"Request shed from {lane} lane: {reason}")
+        self.lane = lane
+        self.reason = reason
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+@dataclass
+class LaneLimits:
+    """Capacity of one admission lane"""
+    concurrency: int
+    queue_size: int
+    # Longest a request may wait for a slot; also the shedding budget
+    max_wait_seconds: float
+
+
+@dataclass
+class _Lane:
+    name: str
+    limits: LaneLimits
+    active: int = 0
+    waiters: Deque[asyncio.Future] = field(default_factory=deque)
+    latency: Optional[float] = None
+    admitted: int = 0
+    rejected_queue_full: int = 0
+    rejected_latency: int = 0
+    timed_out: int = 0
+
+    def estimated_wait(self, position: int) -> Optional[float]:
+        """Expected wait for the request at a queue position, from observed latency"""
+        if self.latency is None:
+            return None
+        return math.ceil((position + 1) / self.limits.concurrency) * self.latency
+
+
+class AdmissionController:
+    """
+    Admits requests into named lanes in priority order
+
+    Each lane has its own concurrency limit and wait queue, so slow work
+    (requests waiting seconds on Claude) cannot occupy the slots of fast
+    work. When total_concurrency is set, lanes also share that many slots
+    and freed slots go to waiters of the earliest lane first, leaving the
+    later lanes to wait.
+
+    Requests are shed instead of queued when:
+      - the lane's queue is full (429: the client should back off), or
+      - the wait predicted from the lane's observed latency would exceed
+        max_wait_seconds (503: the service cannot meet the budget now).
+    Queued requests that still wait longer than max_wait_seconds get 503.
+    """
+
+    def __init__(self, lanes: Dict[str, LaneLimits], total_concurrency: Optional[int] = None):
+        """
+        Initialize the controller
+
+        Args:
+            lanes: Lane name -> limits, highest priority first
+            total_concurrency: Optional cap on active requests across all lanes
+        """
+        self._lanes = {name: _Lane(name, limits) for name, limits in lanes.items()}
+        self.total_concurrency = total_concurrency
+        self._active_total = 0
+
+    @asynccontextmanager
+    async def admit(self, lane_name: str) -> AsyncIterator[None]:
+        """
+        Hold a slot in a lane for the duration of the block
+
+        Args:
+            lane_name: Lane to admit into
+
+        Raises:
+            AdmissionRejectedError: If the request is shed
+            KeyError: If the lane does not exist
+        """
+        lane = self._lanes[lane_name]
+        await self._acquire(lane)
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            elapsed = time.monotonic() - started
+            lane.latency = elapsed if lane.latency is None else (
+                LATENCY_SMOOTHING * elapsed + (1 - LATENCY_SMOOTHING) * lane.latency
+            )
+            lane.active -= 1
+            self._active_total -= 1
+            self._dispatch()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return per-lane occupancy, queue depth, latency and shedding counters
+
+        Returns:
+            Dictionary of admission statistics
+        """
+        return {
+            "total_active": self._active_total,
+            "total_concurrency": self.total_concurrency,
+            "lanes": {
+                name: {
+                    "active": lane.active,
+                    "queued": len(lane.waiters),
+                    "concurrency": lane.limits.concurrency,
+                    "queue_size": lane.limits.queue_size,
+                    "max_wait_seconds": lane.limits.max_wait_seconds,
+                    "latency_ms_avg": round(lane.latency * 1000, 1) if lane.latency is not None else None,
+                    "admitted": lane.admitted,
+                    "rejected_queue_full": lane.rejected_queue_full,
+                    "rejected_latency": lane.rejected_latency,
+                    "timed_out": lane.timed_out,
+                }
+                for name, lane in self._lanes.items()
+            },
+        }
+
+    async def _acquire(self, lane: _Lane) -> None:
+        """Take a slot now, or queue for one, or shed the request"""
+        if not lane.waiters and not self._higher_priority_waiting(lane) and self._has_capacity(lane):
+            self._start(lane)
+            return
+
+        position = len(lane.waiters)
+        estimated_wait = lane.estimated_wait(position)
+        retry_after = max(1, math.ceil(estimated_wait or lane.limits.max_wait_seconds))
+        if position >= lane.limits.queue_size:
+            lane.rejected_queue_full += 1
+            raise AdmissionRejectedError(lane.name, "queue full", 429, retry_after)
+        if estimated_wait is not None and estimated_wait > lane.limits.max_wait_seconds:
+            lane.rejected_latency += 1
+            raise AdmissionRejectedError(lane.name, f"estimated wait {estimated_wait:.1f}s", 503, retry_after)
+
+        waiter = asyncio.get_running_loop().create_future()
+        lane.waiters.append(waiter)
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), lane.limits.max_wait_seconds)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if waiter.done() and not waiter.cancelled():
+                # Granted at the last moment: hand the slot back
+                lane.active -= 1
+                self._active_total -= 1
+                self._dispatch()
+            else:
+                waiter.cancel()
+                lane.waiters.remove(waiter)
+            if isinstance(e, asyncio.TimeoutError):
+                lane.timed_out += 1
+                raise AdmissionRejectedError(lane.name, "queue wait timed out", 503, retry_after)
+            raise
+
+    def _start(self, lane: _Lane) -> None:
+        lane.active += 1
+        lane.admitted += 1
+        self._active_total += 1
+
+    def _has_capacity(self, lane: _Lane) -> bool:
+        if lane.active >= lane.limits.concurrency:
+            return False
+        return self.total_concurrency is None or self._active_total < self.total_concurrency
+
+    def _higher_priority_waiting(self, lane: _Lane) -> bool:
+        """Whether an earlier lane is queued for the shared slots"""
+        if self.total_concurrency is None:
+            return False
+        for other in self._lanes.values():
+            if other is lane:
+                return False
+            if other.waiters:
+                return True
+        return False
+
+    def _dispatch(self) -> None:
+        """Grant freed slots to waiters, highest-priority lane first"""
+        for lane in self._lanes.values():
+            while lane.waiters and self._has_capacity(lane):
+                waiter = lane.waiters.popleft()
+                if waiter.done():
+                    continue
+                self._start(lane)
+                waiter.set_result(None)
@@ -3,30 +3,191 @@ AI Structurer Service
 Uses Claude API to structure parsed resume text into structured data
 """
 
-import json
+import asyncio
 import logging
-from typing import Optional, Dict, Any
-from anthropic import AsyncAnthropic
+import json
+import math
+import re
+import time
+from contextlib import nullcontext
+from dataclasses import replace
+from typing import Optional, Dict, Any, AsyncIterator, Iterator, List, Sequence, Tuple
+from pydantic import ValidationError
 
 from app.models.schemas import StructuredResumeData
+from app.services.incremental_json import IncrementalSectionParser
+from app.services.rule_structurer import RuleBasedStructurer
+from app.services.text_normalizer import TextNormalizer
+from app.services.anthropic_client import CircuitOpenError
+from app.services.metrics import PipelineMetrics
+from app.services.model_router import ModelRoute, ModelRouter
+from app.services.profiler import profile_stage
 
 logger = logging.getLogger(__name__)
 
+# Rough English average for Claude tokenization, used for pre-call estimates
+CHARS_PER_TOKEN = 3.5
+
+_JSON_DECODER = json.JSONDecoder()
+
+# Usage fields reported per Claude call; the cache fields are only present
+# when prompt caching is in effect
+USAGE_TOKEN_TYPES = ("input", "output", "cache_read_input", "cache_creation_input")
+
+# List sections whose entries are streamed one by one as they complete
+STREAMED_ITEM_SECTIONS = ("work_experience", "education", "projects", "volunteer_work")
+
+# JSON schema shown to Claude, per top-level field
+FIELD_SCHEMAS: Dict[str, str] = {
+    "personal_info": """  "personal_info": {
+    "full_name": "Full Name",
+    "email": "email@example.com",
+    "phone": "+1234567890",
+    "location": "City, State",
+    "linkedin": "linkedin.com/in/username",
+    "portfolio": "portfolio-url",
+    "github": "github.com/username"
+  }""",
+    "professional_summary": '  "professional_summary": "Brief professional summary or objective statement"',
+    "work_experience": """  "work_experience": [
+    {
+      "company": "Company Name",
+      "position": "Job Title",
+      "location": "City, State",
+      "start_date": "MM/YYYY",
+      "end_date": "MM/YYYY or Present",
+      "description": "Brief role description",
+      "responsibilities": ["Achievement/responsibility 1", "Achievement 2"]
+    }
+  ]""",
+    "education": """  "education": [
+    {
+      "institution": "University Name",
+      "degree": "Degree Type",
+      "field_of_study": "Major/Field",
+      "location": "City, State",
+      "start_date": "YYYY",
+      "end_date": "YYYY",
+      "gpa": "GPA if mentioned",
+      "achievements": ["Achievement 1", "Achievement 2"]
+    }
+  ]""",
+    "skills": '  "skills": ["Skill 1", "Skill 2", "Skill 3"]',
+    "certifications": '  "certifications": ["Certification 1", "Certification 2"]',
+    "projects": """  "projects": [
+    {
+      "name": "Project Name",
+      "description": "Project description",
+      "technologies": ["Tech 1", "Tech 2"],
+      "url": "project-url if available"
+    }
+  ]""",
+    "languages": '  "languages": ["English (Native)", "Spanish (Fluent)"]',
+    "volunteer_work": """  "volunteer_work": [
+    {
+      "organization": "Organization Name",
+      "role": "Role",
+      "date": "YYYY or date range",
+      "description": "What you did"
+    }
+  ]""",
+}
+
+# Sharded mode: resume sections (as labelled by RuleBasedStructurer) -> shard,
+# and the fields each dedicated shard extracts. Everything else, including
+# any section without a recognised heading, goes to the catch-all "other" shard.
+SECTION_SHARDS = {
+    "experience": "experience",
+    "education": "education",
+    "skills": "skills_projects",
+    "certifications": "skills_projects",
+    "projects": "skills_projects",
+    "languages": "skills_projects",
+}
+SHARD_FIELDS: Dict[str, Tuple[str, ...]] = {
+    "experience": ("work_experience",),
+    "education": ("education",),
+    "skills_projects": ("skills", "certifications", "projects", "languages"),
+}
+SHARD_DESCRIPTIONS = {
+    "experience": "work experience",
+    "education": "education",
+    "skills_projects": "skills, certifications, projects and languages",
+    "other": "header, summary and remaining sections",
+}
+# Shards whose sections are further split at blank lines when long
+SPLITTABLE_SHARDS = ("experience", "education")
+BLOCK_SEPARATOR_RE = re.compile(r"\n\s*\n")
+
+PROMPT_RULES = """Rules:
+1. Extract information as accurately as possible from the provided text
+2. Use null for missing fields
+3. Use empty arrays [] for missing list fields
+4. Preserve the exact formatting and content from the resume
+5. For dates, use the format provided in the resume
+6. Return ONLY the JSON object, no other text
+7. Ensure all JSON is valid and properly escaped"""
+
 
 class AIStructurer:
     """Service for structuring resume text using Claude AI"""
 
-    def __init__(self, api_key: str):
+    def __init__(
+        self,
+        api_key: str,
+        prestructurer: Optional[RuleBasedStructurer] = None,
+        normalizer: Optional[TextNormalizer] = None,
+        client: Optional[Any] = None,
+        metrics: Optional[PipelineMetrics] = None,
+        sharded: bool = False,
+        shard_min_chars: int = 3000,
+        shard_max_chars: int = 4000,
+        router: Optional[ModelRouter] = None,
+        prompt_caching: bool = False
+    ):
         """
         Initialize AI structurer with Anthropic API key
 
         Args:
             api_key: Anthropic API key
+            prestructurer: Optional rule-based stage that fills contact fields
+                deterministically and trims them from the prompt
+            normalizer: Optional cleanup applied to the text before prompting
+            client: Pre-built client exposing messages.create/stream (e.g.
+                ResilientAnthropicClient); a plain AsyncAnthropic is used if None
+            metrics: Optional sink for stage latencies, token counts and failures
+            sharded: Structure long resumes section by section with concurrent
+                Claude calls (needs the prestructurer to find sections)
+            shard_min_chars: Prompt text shorter than this is never sharded
+            shard_max_chars: Experience and education text longer than this is
+                split into several shards at blank lines
+            router: Chooses model and max_tokens per call (default model and
+                4096 tokens for every call when None)
+            prompt_caching: Mark the static instructions (system prompt) as a
+                cacheable prefix; the API ignores prefixes under its minimum
+                (1024 tokens, 2048 for Haiku), which the current prompt is
         """
+        self.prestructurer = prestructurer
+        self.normalizer = normalizer
+        self.metrics = metrics
+        self.sharded = sharded
+        self.shard_min_chars = shard_min_chars
+        self.shard_max_chars = shard_max_chars
+        self.router = router or ModelRouter()
+        self.prompt_caching = prompt_caching
+
+        if sharded and not prestructurer:
+            logger.warning("Sharded structuring needs the rule-based prestructurer; using single prompts.")
+
         if not api_key:
             logger.warning("Anthropic API key not provided. AI structuring will not be available.")
             self.client = None
+        elif client is not None:
+            self.client = client
         else:
+            # Imported here so the SDK stays off the import path when a
+            # pre-built (lazily connecting) client is supplied
+            from anthropic import AsyncAnthropic
             self.client = AsyncAnthropic(api_key=api_key)
 
     async def structure_resume(self, raw_text: str) -> Optional[StructuredResumeData]:
@@ -44,123 +205,510 @@ class AIStructurer:
             return self._get_dummy_structured_data()
 
         try:
-            prompt = self._build_structuring_prompt(raw_text)
-
-            response = await self.client.messages.create(
-                model="claude-3-5-sonnet-20241022",
-                max_tokens=4096,
-                messages=[
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ]
-            )
-
-            # Extract JSON from response
-            response_text = response.content[0].text
+            with self._stage("prompt_build"):
+                prefill = self.prestructurer.structure(raw_text) if self.prestructurer else None
+                prompt_text = self._prompt_text(raw_text)
+                shards = self._plan_shards(prompt_text) if self.sharded else []
 
-            # Parse JSON response
-            structured_json = self._extract_json(response_text)
+            if shards:
+                with self._stage("claude_shards"):
+                    structured_json = await self._structure_shards(raw_text, shards)
+            else:
+                structured_json = await self._request_json(prompt_text, raw_text)
 
             if not structured_json:
                 logger.error("Failed to extract valid JSON from Claude response")
+                self._failure("json_extraction")
                 return None
 
             # Convert to Pydantic model
-            structured_data = StructuredResumeData(**structured_json)
+            with self._stage("validation"), profile_stage("validation"):
+                structured_data = StructuredResumeData.model_validate(structured_json)
+
+            if prefill:
+                structured_data = self._merge_prefill(structured_data, prefill)
 
             logger.info("Successfully structured resume with AI")
             return structured_data
 
+        except CircuitOpenError:
+            logger.warning("Anthropic circuit open. Skipping AI structuring.")
+            self._failure("ai_circuit_open")
+            return None
+        except ValidationError as e:
+            logger.error(f"Claude response failed validation: {str(e)}")
+            self._failure("validation")
+            return None
         except Exception as e:
             logger.error(f"Error structuring resume with AI: {str(e)}", exc_info=True)
+            self._failure("ai_error")
             return None
 
-    def _build_structuring_prompt(self, raw_text: str) -> str:
+    async def stream_structure_resume(self, raw_text: str) -> AsyncIterator[Dict[str, Any]]:
         """
-        Build the prompt for Claude to structure the resume
+        Structure raw resume text with Claude, yielding sections as they complete
+
+        Uses the streaming API and an incremental JSON parser. Each section is
+        validated against its Pydantic model before it is yielded.
 
         Args:
-            raw_text: Raw resume text
+            raw_text: Raw extracted text from resume
+
+        Yields:
+            Event dicts: "item" for each entry of a list section, "section" for
+            each completed section, then a final "complete" event carrying the
+            assembled StructuredResumeData (or "error" if the call fails)
+        """
+        if not self.client:
+            logger.warning("AI client not initialized. Returning dummy data.")
+            structured_data = self._get_dummy_structured_data()
+            for event in self.iter_section_events(structured_data):
+                yield event
+            yield {"event": "complete", "structured_data": structured_data, "partial": False}
+            return
+
+        try:
+            with self._stage("prompt_build"):
+                prefill = self.prestructurer.structure(raw_text) if self.prestructurer else None
+                prompt_text = self._prompt_text(raw_text)
+                route = self._route(prompt_text)
+                system, user = self._build_structuring_request(prompt_text)
+                estimated_input_tokens = self._estimate_tokens(system + user)
+            parser = IncrementalSectionParser()
+            sections: Dict[str, Any] = {}
+            stream_started = time.perf_counter()
+            first_token_seconds = None
+
+            async with self.client.messages.stream(**self._message_kwargs(system, user, route)) as stream:
+                async for text in stream.text_stream:
+                    if first_token_seconds is None:
+                        first_token_seconds = time.perf_counter() - stream_started
+                    for key, index, value in parser.feed(text):
+                        if prefill and key == "personal_info" and index is None and isinstance(value, dict):
+                            value = self.prestructurer.merge_personal_info(
+                                self._coerce_personal_info(value), prefill.personal_info
+                            ).model_dump()
+                        event = self._validate_section_event(key, index, value)
+                        if event is None:
+                            continue
+                        if index is None:
+                            sections[key] = value
+                        yield event
+
+                final_message = await stream.get_final_message()
+                self._log_usage(raw_text, system + user, estimated_input_tokens, final_message.usage, route)
+
+            # Timed by hand: a with-block cannot span the yields above
+            if self.metrics:
+                elapsed = time.perf_counter() - stream_started
+                self.metrics.stage_seconds.observe(elapsed, stage="claude_stream")
+                self.metrics.claude_seconds.observe(elapsed, route=route.name, model=route.model)
+                if first_token_seconds is not None:
+                    self.metrics.claude_first_token_seconds.observe(
+                        first_token_seconds, route=route.name, model=route.model
+                    )
+
+            if not parser.finished:
+                logger.warning("Claude stream ended before the JSON object was complete")
+
+            with self._stage("validation"), profile_stage("validation"):
+                structured_data = StructuredResumeData.model_validate(sections)
+            if prefill:
+                structured_data = self._merge_prefill(structured_data, prefill)
+            logger.info("Successfully streamed structured resume with AI")
+            yield {"event": "complete", "structured_data": structured_data, "partial": not parser.finished}
+
+        except CircuitOpenError:
+            logger.warning("Anthropic circuit open. Skipping AI structuring.")
+            self._failure("ai_circuit_open")
+            yield {"event": "error", "detail": "AI structuring is temporarily unavailable"}
+        except Exception as e:
+            logger.error(f"Error streaming resume structure with AI: {str(e)}", exc_info=True)
+            self._failure("ai_error")
+            yield {"event": "error", "detail": "Failed to structure resume with AI"}
+
+    def iter_section_events(self, structured_data: StructuredResumeData) -> Iterator[Dict[str, Any]]:
+        """
+        Produce the same section events as a live stream from finished data
+
+        Args:
+            structured_data: Already structured resume
+
+        Yields:
+            "item" and "section" event dicts
+        """
+        for key in StructuredResumeData.model_fields:
+            data = getattr(structured_data, key)
+            if key in STREAMED_ITEM_SECTIONS:
+                for index, item in enumerate(data):
+                    yield {"event": "item", "section": key, "index": index, "data": item}
+                yield {"event": "section", "section": key, "count": len(data)}
+            else:
+                yield {"event": "section", "section": key, "data": data}
+
+    def build_message_request(self, raw_text: str, max_tokens: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Build messages.create arguments that structure a whole resume in one call
+
+        Used where calls are not made through this class, e.g. Message Batches.
+
+        Args:
+            raw_text: Raw extracted text from resume
+            max_tokens: Override for the routed max_tokens
 
         Returns:
-            Formatted prompt string
+            Keyword arguments (model, max_tokens, system, messages)
+        """
+        prompt_text = self._prompt_text(raw_text)
+        route = self._route(prompt_text)
+        if max_tokens:
+            route = replace(route, max_tokens=max_tokens)
+        system, user = self._build_structuring_request(prompt_text)
+        return self._message_kwargs(system, user, route)
+
+    def parse_message_text(self, raw_text: str, text: str) -> StructuredResumeData:
+        """
+        Validate the answer to a build_message_request call
+
+        Args:
+            raw_text: Raw extracted text the request was built from
+            text: Text content of Claude's answer
+
+        Returns:
+            StructuredResumeData with rule-based fields merged in
+
+        Raises:
+            ValueError: If the answer contains no JSON object
+            ValidationError: If the JSON does not match the schema
+        """
+        structured_json = self._extract_json(text)
+        if not structured_json:
+            raise ValueError("No JSON object in Claude response")
+        structured_data = StructuredResumeData.model_validate(structured_json)
+        if self.prestructurer:
+            structured_data = self._merge_prefill(structured_data, self.prestructurer.structure(raw_text))
+        return structured_data
+
+    async def _request_json(
+        self,
+        prompt_text: str,
+        raw_text: str,
+        fields: Optional[Sequence[str]] = None,
+        part: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Send one structuring request to Claude and extract the JSON object
+
+        The model and max_tokens come from the router. An answer cut off at a
+        sized max_tokens is requested once more with the router's full budget.
+
+        Args:
+            prompt_text: Resume text (or shard text) to structure
+            raw_text: Extracted text the prompt was built from (for usage logs)
+            fields: Top-level fields to ask for (all fields when None)
+            part: Description of the excerpt when only part of the resume is sent
+
+        Returns:
+            Parsed JSON dict or None if no JSON could be extracted
+        """
+        route = self._route(prompt_text)
+        system, user = self._build_structuring_request(prompt_text, fields, part)
+        estimated_input_tokens = self._estimate_tokens(system + user)
+        while True:
+            with self._stage("claude_call"), self._route_timer(route):
+                response = await self.client.messages.create(**self._message_kwargs(system, user, route))
+            self._log_usage(raw_text, system + user, estimated_input_tokens, response.usage, route)
+
+            if getattr(response, "stop_reason", None) != "max_tokens" or route.max_tokens >= self.router.max_tokens:
+                break
+            logger.warning(
+                f"Claude answer hit max_tokens={route.max_tokens} on the {route.name} route; "
+                f"retrying with {self.router.max_tokens}"
+            )
+            route = replace(route, max_tokens=self.router.max_tokens)
+
+        with self._stage("json_extraction"), profile_stage("json_extraction"):
+            return self._extract_json(response.content[0].text)
+
+    def _plan_shards(self, prompt_text: str) -> List[Tuple[str, Tuple[str, ...], str]]:
+        """
+        Split prompt text into per-section shards
+
+        Args:
+            prompt_text: Normalized text that would be sent in a single prompt
+
+        Returns:
+            List of (shard name, fields to extract, text); empty when the text
+            is short or has fewer than two kinds of section, in which case a
+            single prompt is used
+        """
+        if not self.prestructurer or len(prompt_text) < self.shard_min_chars:
+            return []
+
+        grouped: Dict[str, List[str]] = {}
+        for label, text in self.prestructurer.split_sections(prompt_text).items():
+            shard = SECTION_SHARDS.get(label, "other")
+            # Keep the heading so the catch-all shard can tell its sections apart
+            grouped.setdefault(shard, []).append(text if label == "header" else f"{label.title()}\n{text}")
+        if len(grouped) < 2:
+            return []
+
+        owned = {field for shard in grouped if shard in SHARD_FIELDS for field in SHARD_FIELDS[shard]}
+        shards = []
+        for shard, texts in grouped.items():
+            fields = SHARD_FIELDS.get(shard) or tuple(field for field in FIELD_SCHEMAS if field not in owned)
+            text = "\n\n".join(texts)
+            chunks = self._split_blocks(text) if shard in SPLITTABLE_SHARDS else [text]
+            for index, chunk in enumerate(chunks):
+                shards.append((shard if len(chunks) == 1 else f"{shard}.{index}", fields, chunk))
+        return shards
+
+    def _split_blocks(self, text: str) -> List[str]:
+        """Pack blank-line separated blocks (e.g. jobs) into chunks of at most shard_max_chars"""
+        chunks: List[str] = []
+        current = ""
+        for block in BLOCK_SEPARATOR_RE.split(text):
+            if current and len(current) + len(block) + 2 > self.shard_max_chars:
+                chunks.append(current)
+                current = block
+            else:
+                current = f"{current}\n\n{block}" if current else block
+        if current:
+            chunks.append(current)
+        return chunks
+
+    async def _structure_shards(
+        self, raw_text: str, shards: List[Tuple[str, Tuple[str, ...], str]]
+    ) -> Optional[Dict[str, Any]]:
         """
-        return f"""You are a resume parsing expert. Extract and structure the following resume text into a JSON format.
+        Structure every shard concurrently and merge the results
 
-Resume Text:
-{raw_text}
+        List fields from several shards (e.g. experience chunks) are
+        concatenated in document order; other fields keep the first value.
+        Only the fields a shard was asked for are taken from its answer.
+
+        Args:
+            raw_text: Extracted text (for usage logs)
+            shards: Output of _plan_shards
+
+        Returns:
+            Merged JSON dict, or None if any shard returned no JSON
+        """
+        logger.info(f"Structuring resume in {len(shards)} shards: {[name for name, _, _ in shards]}")
+        results = await asyncio.gather(
+            *(
+                self._request_json(text, raw_text, fields, SHARD_DESCRIPTIONS[name.split('.')[0]])
+                for name, fields, text in shards
+            ),
+            return_exceptions=True
+        )
+
+        merged: Dict[str, Any] = {}
+        for (name, fields, _), result in zip(shards, results):
+            if isinstance(result, BaseException):
+                raise result
+            if not result:
+                logger.error(f"Failed to extract valid JSON for shard {name}")
+                return None
+            for field in fields:
+                value = result.get(field)
+                if isinstance(value, list) and isinstance(merged.get(field), list):
+                    merged[field].extend(value)
+                elif value is not None and field not in merged:
+                    merged[field] = value
+        return merged
+
+    def _prompt_text(self, raw_text: str) -> str:
+        """Resume text to send to Claude: normalized, minus what the prestructurer covers"""
+        text = self.normalizer.normalize(raw_text) if self.normalizer else raw_text
+        if self.prestructurer:
+            text = self.prestructurer.strip_contact_lines(text)
+        return text
+
+    @staticmethod
+    def _estimate_tokens(text: str) -> int:
+        """Estimate the token count of a prompt before sending it"""
+        return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+    def _route(self, prompt_text: str) -> ModelRoute:
+        """Route a call by the size of the text it structures"""
+        lines = sum(1 for line in prompt_text.splitlines() if line.strip())
+        return self.router.route(self._estimate_tokens(prompt_text), lines)
+
+    def _message_kwargs(self, system: str, user: str, route: ModelRoute) -> Dict[str, Any]:
+        """
+        Build messages.create/stream arguments for one call
+
+        With prompt caching the system prompt is sent as a text block marked
+        cache_control "ephemeral", so the static instructions can be read from
+        the cache instead of being processed again on every call.
+        """
+        return {
+            "model": route.model,
+            "max_tokens": route.max_tokens,
+            "system": (
+                [{"type": "text", "text": system, "cache_control": {"type": "ephemeral"}}]
+                if self.prompt_caching else system
+            ),
+            "messages": [
+                {
+                    "role": "user",
+                    "content": user
+                }
+            ],
+        }
+
+    def _route_timer(self, route: ModelRoute):
+        """Time a Claude call per route when metrics are enabled"""
+        return self.metrics.claude_seconds.time(route=route.name, model=route.model) if self.metrics else nullcontext()
+
+    def _log_usage(
+        self, raw_text: str, prompt: str, estimated_input_tokens: int, usage: Any, route: ModelRoute
+    ) -> None:
+        """
+        Log estimated and actual token usage for one Claude call
+
+        Args:
+            raw_text: Extracted text before normalization
+            prompt: System and user prompt actually sent
+            estimated_input_tokens: Pre-call estimate for the prompt
+            usage: Usage block from the Claude response
+            route: Route the call was sent on
+        """
+        counts = {
+            token_type: getattr(usage, f"{token_type}_tokens", None)
+            for token_type in USAGE_TOKEN_TYPES
+        }
+        logger.info(
+            f"Claude usage: route={route.name} model={route.model} max_tokens={route.max_tokens} "
+            f"raw_chars={len(raw_text)} prompt_chars={len(prompt)} "
+            f"estimated_input_tokens={estimated_input_tokens} "
+            + " ".join(f"{token_type}_tokens={count}" for token_type, count in counts.items())
+        )
+        if self.metrics:
+            for token_type, count in counts.items():
+                if not count:
+                    continue
+                if token_type in ("input", "output"):
+                    self.metrics.tokens.inc(count, type=token_type)
+                self.metrics.route_tokens.inc(count, route=route.name, type=token_type)
+
+    def _stage(self, name: str):
+        """Time a stage when metrics are enabled"""
+        return self.metrics.stage(name) if self.metrics else nullcontext()
+
+    def _failure(self, reason: str) -> None:
+        if self.metrics:
+            self.metrics.failure(reason)
+
+    def _merge_prefill(
+        self, structured_data: StructuredResumeData, prefill: StructuredResumeData
+    ) -> StructuredResumeData:
+        """
+        Fill gaps in the AI result with rule-based fields
+
+        Args:
+            structured_data: Result from Claude
+            prefill: Result from the rule-based prestructurer
+
+        Returns:
+            Merged StructuredResumeData
+        """
+        updates: Dict[str, Any] = {
+            "personal_info": self.prestructurer.merge_personal_info(
+                structured_data.personal_info, prefill.personal_info
+            )
+        }
+        if not structured_data.professional_summary and prefill.professional_summary:
+            updates["professional_summary"] = prefill.professional_summary
+        for field in ("skills", "certifications", "languages"):
+            if not getattr(structured_data, field) and getattr(prefill, field):
+                updates[field] = getattr(prefill, field)
+        return structured_data.model_copy(update=updates)
+
+    @staticmethod
+    def _coerce_personal_info(value: Dict[str, Any]):
+        """Validate a streamed personal_info dict, ignoring it if malformed"""
+        try:
+            return StructuredResumeData.model_validate({"personal_info": value}).personal_info
+        except ValidationError:
+            return None
+
+    def _validate_section_event(self, key: str, index: Optional[int], value: Any) -> Optional[Dict[str, Any]]:
+        """
+        Validate one streamed section or list entry against the resume schema
+
+        Args:
+            key: Top-level section name
+            index: Position within a list section, or None for the whole section
+            value: Decoded JSON value
+
+        Returns:
+            Event dict, or None if the value should not be emitted
+        """
+        if key not in StructuredResumeData.model_fields:
+            return None
+        if index is not None and key not in STREAMED_ITEM_SECTIONS:
+            return None
+
+        try:
+            if index is not None:
+                validated = StructuredResumeData.model_validate({key: [value]})
+                return {"event": "item", "section": key, "index": index, "data": getattr(validated, key)[0]}
+
+            validated = StructuredResumeData.model_validate({key: value})
+        except ValidationError as e:
+            logger.warning(f"Streamed section '{key}' failed validation: {str(e)}")
+            return None
+
+        data = getattr(validated, key)
+        if key in STREAMED_ITEM_SECTIONS:
+            return {"event": "section", "section": key, "count": len(data)}
+        return {"event": "section", "section": key, "data": data}
+
+    def _build_structuring_request(
+        self, raw_text: str, fields: Optional[Sequence[str]] = None, part: Optional[str] = None
+    ) -> Tuple[str, str]:
+        """
+        Build the system and user prompts for Claude to structure the resume
+
+        The system prompt holds everything that does not depend on the
+        resume (role, schema and rules), so it is identical across calls with
+        the same fields and can be cached as a prefix.
+
+        Args:
+            raw_text: Raw resume text
+            fields: Top-level fields to ask for (all fields when None)
+            part: Description of the excerpt (e.g. "work experience") when
+                only part of the resume is sent
+
+        Returns:
+            (system prompt, user prompt)
+        """
+        subject = f"part of a resume ({part})" if part else "resume text"
+        schema = ",\n".join(FIELD_SCHEMAS[field] for field in (fields or FIELD_SCHEMAS))
+        system = f"""You are a resume parsing expert. Extract and structure the {subject} given by the user into a JSON format.
 
 Extract the following information and return ONLY valid JSON (no markdown, no explanations):
 
 {{
-  "personal_info": {{
-    "full_name": "Full Name",
-    "email": "email@example.com",
-    "phone": "+1234567890",
-    "location": "City, State",
-    "linkedin": "linkedin.com/in/username",
-    "portfolio": "portfolio-url",
-    "github": "github.com/username"
-  }},
-  "professional_summary": "Brief professional summary or objective statement",
-  "work_experience": [
-    {{
-      "company": "Company Name",
-      "position": "Job Title",
-      "location": "City, State",
-      "start_date": "MM/YYYY",
-      "end_date": "MM/YYYY or Present",
-      "description": "Brief role description",
-      "responsibilities": ["Achievement/responsibility 1", "Achievement 2"]
-    }}
-  ],
-  "education": [
-    {{
-      "institution": "University Name",
-      "degree": "Degree Type",
-      "field_of_study": "Major/Field",
-      "location": "City, State",
-      "start_date": "YYYY",
-      "end_date": "YYYY",
-      "gpa": "GPA if mentioned",
-      "achievements": ["Achievement 1", "Achievement 2"]
-    }}
-  ],
-  "skills": ["Skill 1", "Skill 2", "Skill 3"],
-  "certifications": ["Certification 1", "Certification 2"],
-  "projects": [
-    {{
-      "name": "Project Name",
-      "description": "Project description",
-      "technologies": ["Tech 1", "Tech 2"],
-      "url": "project-url if available"
-    }}
-  ],
-  "languages": ["English (Native)", "Spanish (Fluent)"],
-  "volunteer_work": [
-    {{
-      "organization": "Organization Name",
-      "role": "Role",
-      "date": "YYYY or date range",
-      "description": "What you did"
-    }}
-  ]
+{schema}
 }}
 
-Rules:
-1. Extract information as accurately as possible from the provided text
-2. Use null for missing fields
-3. Use empty arrays [] for missing list fields
-4. Preserve the exact formatting and content from the resume
-5. For dates, use the format provided in the resume
-6. Return ONLY the JSON object, no other text
-7. Ensure all JSON is valid and properly escaped"""
+{PROMPT_RULES}"""
+        return system, f"Resume Text:\n{raw_text}"
 
-    def _extract_json(self, text: str) -> Optional[Dict[str, Any]]:
+    @staticmethod
+    def _extract_json(text: str) -> Optional[Dict[str, Any]]:
         """
-        Extract and parse JSON from Claude's response
+        Extract and parse the JSON object in Claude's response in one pass
+
+        Decodes from each opening brace with raw_decode, which stops at the end
+        of the object, so markdown fences and prose after the JSON (even prose
+        containing braces) are never parsed. A failed attempt resumes the search
+        after the point where decoding failed, so the text is scanned once and
+        a truncated object is not mistaken for one of its nested objects. The
+        largest object found wins over stray "{}" in surrounding prose.
 
         Args:
             text: Response text that may contain JSON
@@ -168,32 +716,24 @@ Rules:
         Returns:
             Parsed JSON dict or None if extraction fails
         """
-        try:
-            # Try to parse directly first
-            return json.loads(text)
-        except json.JSONDecodeError:
-            # Try to extract JSON from markdown code block
-            if "```json" in text:
-                json_start = text.find("```json") + 7
-                json_end = text.find("```", json_start)
-                json_str = text[json_start:json_end].strip()
-                try:
-                    return json.loads(json_str)
-                except json.JSONDecodeError:
-                    pass
-
-            # Try to find JSON between curly braces
-            if "{" in text and "}" in text:
-                json_start = text.find("{")
-                json_end = text.rfind("}") + 1
-                json_str = text[json_start:json_end]
-                try:
-                    return json.loads(json_str)
-                except json.JSONDecodeError:
-                    pass
-
+        best: Optional[Dict[str, Any]] = None
+        best_length = 0
+
+        start = text.find("{")
+        while start != -1:
+            try:
+                value, end = _JSON_DECODER.raw_decode(text, start)
+            except json.JSONDecodeError as e:
+                start = text.find("{", max(e.pos, start + 1))
+                continue
+
+            if isinstance(value, dict) and end - start > best_length:
+                best, best_length = value, end - start
+            start = text.find("{", end)
+
+        if best is None:
             logger.error(f"Could not extract valid JSON from text: {text[:200]}...")
-            return None
+        return best
 
     def _get_dummy_structured_data(self) -> StructuredResumeData:
         """
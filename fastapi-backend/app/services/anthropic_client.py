@@ -0,0 +1,370 @@
+"""
+Anthropic Client Service
+Rate-limited, retrying and circuit-broken access to the Claude Messages API
+"""
+
+import asyncio
+import logging
+import random
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Upstream statuses worth retrying: rate limited, server errors, overloaded
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504, 529}
+
+
+class CircuitOpenError(Exception):
+    """Raised without calling upstream while the circuit breaker is open"""
+
+
+class TokenBucket:
+    """Token-bucket rate limiter shared by all callers in the process"""
+
+    def __init__(self, rate: float, capacity: float):
+        """
+        Initialize the bucket
+
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum burst size
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Wait until a token is available and take it"""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker
+
+    After failure_threshold upstream failures in a row the circuit opens and
+    calls fail fast. Once recovery_timeout has passed a single probe call is
+    let through (half-open); its outcome closes or re-opens the circuit.
+    """
+
+    def __init__(self, failure_threshold: int = 5, recovery_timeout: float = 30):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.state = "closed"
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+
+    def allow(self) -> bool:
+        """Whether a call may go upstream now"""
+        if self.state == "closed":
+            return True
+        if self.state == "open" and time.monotonic() - self._opened_at >= self.recovery_timeout:
+            self.state = "half_open"
+        if self.state == "half_open" and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        if self.state != "closed":
+            logger.info("Anthropic circuit breaker closed")
+        self.state = "closed"
+        self._failures = 0
+        self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        self._probe_in_flight = False
+        if self.state == "half_open" or self._failures >= self.failure_threshold:
+            if self.state != "open":
+                logger.warning(f"Anthropic circuit breaker opened after {self._failures} failures")
+            self.state = "open"
+            self._opened_at = time.monotonic()
+
+    def release_probe(self) -> None:
+        """Give back a half-open probe slot whose call did not reach a verdict"""
+        self._probe_in_flight = False
+
+
+class _ResilientMessages:
+    """Drop-in for client.messages exposing create() and stream()"""
+
+    def __init__(self, owner: "ResilientAnthropicClient"):
+        self._owner = owner
+
+    async def create(self, **kwargs) -> Any:
+        return await self._owner.create_message(**kwargs)
+
+    def stream(self, **kwargs):
+        return self._owner.stream_message(**kwargs)
+
+
+class ResilientAnthropicClient:
+    """
+    Wrapper around AsyncAnthropic for production traffic
+
+    All calls share one HTTP connection pool, a global concurrency semaphore
+    and a token-bucket rate limiter. Rate limits (429), overload (529), 5xx,
+    timeouts and connection errors are retried with full-jitter exponential
+    backoff, honouring Retry-After. Calls that still fail count towards a
+    circuit breaker; while it is open, calls raise CircuitOpenError at once
+    so callers can fall back instead of queueing behind a degraded upstream.
+
+    The SDK (and httpx) are imported and the connection pool is created on
+    first use, so constructing this client costs nothing at process start.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        base_url: Optional[str] = None,
+        max_concurrency: int = 8,
+        requests_per_second: float = 0,
+        burst: int = 10,
+        max_retries: int = 3,
+        base_backoff: float = 0.5,
+        max_backoff: float = 8.0,
+        timeout: float = 60.0,
+        max_connections: int = 20,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+    ):
+        """
+        Initialize the client
+
+        Args:
+            api_key: Anthropic API key
+            base_url: Override for the API endpoint (e.g. a local fake server)
+            max_concurrency: Maximum in-flight Claude calls in this process
+            requests_per_second: Sustained call rate (0 disables rate limiting)
+            burst: Calls allowed back-to-back before rate limiting applies
+            max_retries: Retries per call for transient failures
+            base_backoff: First retry delay ceiling, in seconds
+            max_backoff: Maximum retry delay, in seconds
+            timeout: Per-request timeout, in seconds
+            max_connections: Size of the shared HTTP connection pool
+            failure_threshold: Consecutive failed calls that open the circuit
+            recovery_timeout: Seconds before an open circuit lets a probe through
+        """
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+
+        self._api_key = api_key
+        self._base_url = base_url
+        self._timeout = timeout
+        self._max_connections = max_connections
+        self._client: Optional[Any] = None
+        self._http_client: Optional[Any] = None
+
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._rate_limiter = TokenBucket(requests_per_second, burst) if requests_per_second > 0 else None
+        self.circuit_breaker = CircuitBreaker(failure_threshold, recovery_timeout)
+        self.messages = _ResilientMessages(self)
+
+        self._in_flight = 0
+        self._counters = {"calls": 0, "retries": 0, "failures": 0, "short_circuited": 0}
+
+    async def create_message(self, **kwargs) -> Any:
+        """
+        Call messages.create with concurrency, rate limiting, retry and breaker
+
+        Args:
+            **kwargs: Arguments for AsyncAnthropic.messages.create
+
+        Returns:
+            Anthropic Message
+
+        Raises:
+            CircuitOpenError: If the circuit is open
+            anthropic.APIError: If the call fails permanently or retries run out
+        """
+        async with self._slot():
+            client = self._sdk()
+            return await self._with_retries(lambda: client.messages.create(**kwargs))
+
+    @asynccontextmanager
+    async def stream_message(self, **kwargs) -> AsyncIterator[Any]:
+        """
+        Open a messages.stream with the same protections as create_message
+
+        Opening the stream is retried; once events are flowing, failures are
+        recorded for the circuit breaker but not retried.
+
+        Args:
+            **kwargs: Arguments for AsyncAnthropic.messages.stream
+
+        Yields:
+            AsyncMessageStream
+        """
+        async with self._slot():
+            manager = None
+
+            async def open_stream():
+                nonlocal manager
+                manager = self._sdk().messages.stream(**kwargs)
+                return await manager.__aenter__()
+
+            stream = await self._with_retries(open_stream, record_success=False)
+            try:
+                yield stream
+            except BaseException as e:
+                await manager.__aexit__(type(e), e, e.__traceback__)
+                if self._is_retryable(e):
+                    self.circuit_breaker.record_failure()
+                    self._counters["failures"] += 1
+                else:
+                    self.circuit_breaker.release_probe()
+                raise
+            else:
+                await manager.__aexit__(None, None, None)
+                self.circuit_breaker.record_success()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return breaker state and call counters
+
+        Returns:
+            Dictionary of client statistics
+        """
+        return {
+            **self._counters,
+            "circuit": self.circuit_breaker.state,
+            "in_flight": self._in_flight,
+            "max_concurrency": self.max_concurrency,
+        }
+
+    async def warm_up(self) -> None:
+        """
+        Create the SDK client and open a pooled connection to the API host
+
+        The request is not a Claude call: it only pays for DNS, TCP and TLS
+        ahead of the first real request. Its response status is ignored and
+        it does not count towards rate limits, stats or the circuit breaker.
+        """
+        client = self._sdk()
+        try:
+            await self._http_client.get(str(client.base_url), timeout=10.0)
+        except Exception as e:
+            logger.warning(f"Anthropic connection warm-up failed: {str(e)}")
+
+    async def aclose(self) -> None:
+        """Close the shared connection pool"""
+        if self._client is not None:
+            await self._client.close()
+
+    def _sdk(self) -> Any:
+        """Build the AsyncAnthropic client and its connection pool on first use"""
+        if self._client is None:
+            import httpx
+            from anthropic import AsyncAnthropic, DefaultAsyncHttpxClient
+
+            self._http_client = DefaultAsyncHttpxClient(
+                limits=httpx.Limits(
+                    max_connections=self._max_connections,
+                    max_keepalive_connections=self._max_connections,
+                ),
+                timeout=httpx.Timeout(self._timeout, connect=10.0),
+            )
+            # Retries are handled here so they share the semaphore and breaker
+            self._client = AsyncAnthropic(
+                api_key=self._api_key,
+                base_url=self._base_url,
+                http_client=self._http_client,
+                max_retries=0,
+            )
+        return self._client
+
+    @asynccontextmanager
+    async def _slot(self):
+        """Check the breaker, then hold a concurrency slot and a rate token"""
+        if not self.circuit_breaker.allow():
+            self._counters["short_circuited"] += 1
+            raise CircuitOpenError("Anthropic API circuit is open")
+
+        try:
+            async with self._semaphore:
+                if self._rate_limiter:
+                    await self._rate_limiter.acquire()
+                self._in_flight += 1
+                self._counters["calls"] += 1
+                try:
+                    yield
+                finally:
+                    self._in_flight -= 1
+        except asyncio.CancelledError:
+            # Cancelled while queued, rate limited or waiting on a retry: no
+            # verdict was reached, so a half-open probe slot is handed back
+            self.circuit_breaker.release_probe()
+            raise
+
+    async def _with_retries(self, call, record_success: bool = True) -> Any:
+        """Run call, retrying transient failures with jittered backoff"""
+        attempt = 0
+        while True:
+            try:
+                result = await call()
+            except asyncio.CancelledError:
+                # The caller gave up (client disconnect, coalesced waiter cancelled):
+                # no verdict, so a half-open probe slot is handed back
+                self.circuit_breaker.release_probe()
+                raise
+            except Exception as e:
+                if not self._is_retryable(e):
+                    self.circuit_breaker.release_probe()
+                    raise
+                if attempt >= self.max_retries:
+                    self.circuit_breaker.record_failure()
+                    self._counters["failures"] += 1
+                    raise
+
+                delay = self._backoff(attempt, e)
+                attempt += 1
+                self._counters["retries"] += 1
+                logger.warning(
+                    f"Transient Anthropic error ({type(e).__name__}); "
+                    f"retry {attempt}/{self.max_retries} in {delay:.2f}s"
+                )
+                await asyncio.sleep(delay)
+                continue
+
+            if record_success:
+                self.circuit_breaker.record_success()
+            return result
+
+    def _backoff(self, attempt: int, error: Exception) -> float:
+        """Full-jitter exponential backoff, never shorter than Retry-After"""
+        delay = random.uniform(0, min(self.max_backoff, self.base_backoff * (2 ** attempt)))
+
+        response = getattr(error, "response", None)
+        retry_after = response.headers.get("retry-after") if response is not None else None
+        if retry_after:
+            try:
+                delay = max(delay, min(float(retry_after), self.max_backoff))
+            except ValueError:
+                pass
+        return delay
+
+    @staticmethod
+    def _is_retryable(error: BaseException) -> bool:
+        from anthropic import APIConnectionError, APIStatusError, APITimeoutError
+
+        if isinstance(error, (APITimeoutError, APIConnectionError)):
+            return True
+        if isinstance(error, APIStatusError):
+            return error.status_code in RETRYABLE_STATUS_CODES
+        return False
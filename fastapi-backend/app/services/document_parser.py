@@ -5,30 +5,137 @@ Handles extraction of text from PDF, DOCX, and TXT files
 
 import io
 import os
-from typing import BinaryIO
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from typing import Any, BinaryIO, List, Optional, Tuple, Union
 import logging
 
-# PDF parsing
-try:
-    from pypdf import PdfReader
-except ImportError:
-    from PyPDF2 import PdfReader
-
-# DOCX parsing
-from docx import Document
+from app.services.docx_stream import extract_docx_text
+from app.services.metrics import PipelineMetrics
+from app.services.pdf_engines import (
+    PDF_ENGINE_AUTO,
+    PDF_ENGINES,
+    PdfDocument,
+    available_pdf_engines,
+    choose_pdf_engine,
+    pdf_reader_class,
+    probe_pdf,
+)
+from app.services.text_normalizer import strip_running_lines
 
 logger = logging.getLogger(__name__)
 
+DOCX_EXTRACTORS = ("python-docx", "streaming")
+
+# Raw bytes, or a seekable binary stream such as a spooled upload
+DocumentSource = Union[bytes, bytearray, BinaryIO]
+
+
+def _docx_document(stream: BinaryIO) -> Any:
+    """Open a DOCX with python-docx, importing it on first use"""
+    from docx import Document
+    return Document(stream)
+
+
+def _extract_page_range(content: bytes, start: int, end: int, engine_name: str = "pypdf") -> List[str]:
+    """
+    Extract text from a slice of PDF pages (runs in a worker process)
+
+    Args:
+        content: PDF file bytes
+        start: First page index (inclusive)
+        end: Last page index (exclusive)
+        engine_name: Registered engine supporting page-parallel extraction
+
+    Returns:
+        Extracted text per page, empty string for pages without text
+    """
+    engine = PDF_ENGINES[engine_name]
+    reader = pdf_reader_class()(io.BytesIO(content))
+    return [engine.extract_page(reader, index) for index in range(start, end)]
+
 
 class DocumentParser:
     """Service for parsing various document formats"""
 
-    def parse(self, content: bytes, filename: str) -> str:
+    def __init__(
+        self,
+        max_pdf_pages: Optional[int] = None,
+        max_pdf_chars: Optional[int] = None,
+        parallel_page_threshold: int = 8,
+        page_workers: int = 0,
+        pages_per_task: int = 4,
+        metrics: Optional[PipelineMetrics] = None,
+        docx_extractor: str = "python-docx",
+        pdf_engine: str = PDF_ENGINE_AUTO,
+        pdf_engine_fallback: bool = True,
+    ):
+        """
+        Initialize document parser
+
+        Args:
+            max_pdf_pages: Stop PDF extraction after this many pages (None for all)
+            max_pdf_chars: Stop PDF extraction once this many characters are collected
+            parallel_page_threshold: Minimum page count for page-parallel extraction
+            page_workers: Processes used for page-parallel extraction (0 disables it)
+            pages_per_task: Pages extracted per worker task
+            metrics: Optional metrics sink for extracted page counts
+            docx_extractor: "python-docx" (full object model) or "streaming"
+                (iterparse over word/document.xml, document order, low memory)
+            pdf_engine: Registered PDF engine name, or "auto" to choose one per
+                document from its fonts and a page 1 probe
+            pdf_engine_fallback: Try the other available engines when the
+                chosen one fails or finds no text
+        """
+        if docx_extractor not in DOCX_EXTRACTORS:
+            raise ValueError(f"Unknown DOCX extractor: {docx_extractor}")
+        if pdf_engine != PDF_ENGINE_AUTO and pdf_engine not in PDF_ENGINES:
+            raise ValueError(f"Unknown PDF engine: {pdf_engine}")
+        if pdf_engine != PDF_ENGINE_AUTO and not PDF_ENGINES[pdf_engine].available():
+            raise ValueError(f"PDF engine {pdf_engine} is not installed")
+
+        self.max_pdf_pages = max_pdf_pages
+        self.max_pdf_chars = max_pdf_chars
+        self.parallel_page_threshold = parallel_page_threshold
+        self.page_workers = page_workers
+        self.pages_per_task = pages_per_task
+        self.metrics = metrics
+        self.docx_extractor = docx_extractor
+        self.pdf_engine = pdf_engine
+        self.pdf_engine_fallback = pdf_engine_fallback
+        self.pdf_engines = available_pdf_engines()
+
+        self._page_executor: Optional[ProcessPoolExecutor] = None
+        self._page_executor_lock = threading.Lock()
+
+    def __getstate__(self):
+        # Parsers are pickled into parse-pool worker processes; the page pool
+        # and its lock are per-process and recreated lazily on first use.
+        state = self.__dict__.copy()
+        state["_page_executor"] = None
+        state["_page_executor_lock"] = None
+        # Counters in a worker process would never be exported
+        state["metrics"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._page_executor_lock = threading.Lock()
+
+    def shutdown(self) -> None:
+        """Stop the page-parallel worker processes, if any were started"""
+        if self._page_executor is not None:
+            self._page_executor.shutdown(wait=True, cancel_futures=True)
+            self._page_executor = None
+
+    def parse(self, content: DocumentSource, filename: str) -> str:
         """
         Parse document content based on file extension
 
         Args:
-            content: Raw file bytes
+            content: Raw file bytes or a seekable binary stream
             filename: Original filename with extension
 
         Returns:
@@ -54,27 +161,70 @@ class DocumentParser:
             logger.error(f"Error parsing {filename}: {str(e)}")
             raise
 
-    def _parse_pdf(self, content: bytes) -> str:
+    def _parse_pdf(self, content: DocumentSource) -> str:
         """
         Extract text from PDF file
 
         Args:
-            content: PDF file bytes
+            content: PDF file bytes or stream
 
         Returns:
             Extracted text
         """
         try:
-            pdf_file = io.BytesIO(content)
-            reader = PdfReader(pdf_file)
-
-            text_parts = []
-            for page in reader.pages:
-                text = page.extract_text()
-                if text:
-                    text_parts.append(text)
-
-            extracted_text = "\n\n".join(text_parts)
+            document = PdfDocument(self._open_stream(content))
+
+            total_pages = len(document.reader.pages)
+            page_count = total_pages
+            if self.max_pdf_pages is not None:
+                page_count = min(page_count, self.max_pdf_pages)
+
+            engine_name, reason = self._select_pdf_engine(document, page_count)
+            if self.metrics:
+                self.metrics.pdf_engine_selections.inc(engine=engine_name, reason=reason)
+
+            engine_names = [engine_name]
+            if self.pdf_engine_fallback:
+                engine_names += [name for name in self.pdf_engines if name != engine_name]
+
+            text_parts: List[str] = []
+            errors: List[Exception] = []
+            empty_families = set()
+            for name in engine_names:
+                family = PDF_ENGINES[name].family or name
+                if family in empty_families:
+                    continue
+                try:
+                    text_parts = self._run_pdf_engine(name, content, document, page_count)
+                except Exception as e:
+                    logger.warning(f"PDF engine {name} failed: {str(e)}")
+                    errors.append(e)
+                    continue
+                if text_parts:
+                    break
+                # Engines of the same family read the same text operators, so they
+                # would find nothing either; after an empty probe, nothing will
+                empty_families.add(family)
+                if document.probe_text is not None and not document.probe_text.strip():
+                    break
+
+            # Report the chosen engine's error rather than "no text" when every engine failed
+            if not text_parts and errors and not empty_families:
+                raise errors[0]
+
+            if self.metrics:
+                self.metrics.pages_extracted.inc(len(text_parts))
+
+            extracted_text = "\n\n".join(strip_running_lines(text_parts))
+
+            if self.max_pdf_chars is not None and len(extracted_text) > self.max_pdf_chars:
+                extracted_text = extracted_text[:self.max_pdf_chars]
+
+            if page_count < total_pages or self._budget_reached(text_parts):
+                logger.info(
+                    f"PDF extraction budget reached: kept {len(extracted_text)} chars "
+                    f"from {total_pages} pages"
+                )
 
             if not extracted_text.strip():
                 raise ValueError("No text could be extracted from PDF. The file may be image-based or corrupted.")
@@ -85,19 +235,142 @@ class DocumentParser:
             logger.error(f"PDF parsing error: {str(e)}")
             raise ValueError(f"Failed to parse PDF: {str(e)}")
 
-    def _parse_docx(self, content: bytes) -> str:
+    def _select_pdf_engine(self, document: PdfDocument, page_count: int) -> Tuple[str, str]:
+        """
+        Choose the engine for a document
+
+        Args:
+            document: Open document
+            page_count: Number of leading pages to extract
+
+        Returns:
+            Tuple of (engine name, selection reason)
+        """
+        if self.pdf_engine != PDF_ENGINE_AUTO:
+            return self.pdf_engine, "configured"
+        with self.metrics.stage("pdf_probe") if self.metrics else nullcontext():
+            probe = probe_pdf(document, page_count)
+        return choose_pdf_engine(probe, self.pdf_engines)
+
+    def _run_pdf_engine(
+        self, name: str, content: DocumentSource, document: PdfDocument, page_count: int
+    ) -> List[str]:
+        """
+        Extract pages with one engine, recording its time and text yield
+
+        Args:
+            name: Registered engine name
+            content: PDF file bytes or stream (for page-parallel extraction)
+            document: Open document
+            page_count: Number of leading pages to consider
+
+        Returns:
+            Non-empty page texts in page order (empty if the engine found no text)
+
+        Raises:
+            Exception: If the engine fails
+        """
+        engine = PDF_ENGINES[name]
+        outcome = "error"
+        text_parts: List[str] = []
+        started = time.perf_counter()
+        try:
+            if engine.parallel and self.page_workers > 0 and page_count >= self.parallel_page_threshold:
+                text_parts = self._extract_pages_parallel(content, page_count, name)
+            else:
+                text_parts = engine.extract_pages(document, page_count, self._budget_reached)
+            text_parts = [text for text in text_parts if text.strip()]
+            outcome = "text" if text_parts else "empty"
+            return text_parts
+        finally:
+            elapsed = time.perf_counter() - started
+            chars = sum(len(text) for text in text_parts)
+            logger.info(
+                f"PDF engine {name}: {chars} chars from {len(text_parts)} of {page_count} pages "
+                f"in {elapsed * 1000:.1f} ms ({outcome})"
+            )
+            if self.metrics:
+                self.metrics.pdf_engine_seconds.observe(elapsed, engine=name)
+                self.metrics.pdf_engine_chars.inc(chars, engine=name)
+                self.metrics.pdf_engine_documents.inc(engine=name, outcome=outcome)
+
+    def _extract_pages_parallel(self, content: DocumentSource, page_count: int, engine_name: str) -> List[str]:
+        """
+        Extract pages across worker processes until the character budget is reached
+
+        Page ranges are submitted in order through a sliding window of
+        page_workers tasks, so once the budget is met no further pages are
+        scheduled and queued ranges are cancelled.
+
+        Args:
+            content: PDF file bytes or stream
+            page_count: Number of leading pages to consider
+            engine_name: Registered engine supporting page-parallel extraction
+
+        Returns:
+            Non-empty page texts in page order
+        """
+        if not isinstance(content, (bytes, bytearray)):
+            content = self._open_stream(content).read()
+
+        executor = self._get_page_executor()
+        ranges = [
+            (start, min(start + self.pages_per_task, page_count))
+            for start in range(0, page_count, self.pages_per_task)
+        ]
+
+        text_parts: List[str] = []
+        in_flight = []
+        next_range = 0
+        try:
+            while next_range < len(ranges) or in_flight:
+                while next_range < len(ranges) and len(in_flight) < self.page_workers:
+                    start, end = ranges[next_range]
+                    in_flight.append(executor.submit(_extract_page_range, content, start, end, engine_name))
+                    next_range += 1
+
+                page_texts = in_flight.pop(0).result()
+                text_parts.extend(text for text in page_texts if text)
+                if self._budget_reached(text_parts):
+                    break
+        finally:
+            for future in in_flight:
+                future.cancel()
+
+        return text_parts
+
+    def _budget_reached(self, text_parts: List[str]) -> bool:
+        """Whether the collected page texts meet the character budget"""
+        if self.max_pdf_chars is None:
+            return False
+        # Account for the "\n\n" separators used when joining pages
+        return sum(len(text) for text in text_parts) + 2 * max(len(text_parts) - 1, 0) >= self.max_pdf_chars
+
+    def _get_page_executor(self) -> ProcessPoolExecutor:
+        """Create the page-parallel process pool on first use"""
+        with self._page_executor_lock:
+            if self._page_executor is None:
+                self._page_executor = ProcessPoolExecutor(max_workers=self.page_workers)
+            return self._page_executor
+
+    def _parse_docx(self, content: DocumentSource) -> str:
         """
         Extract text from DOCX file
 
         Args:
-            content: DOCX file bytes
+            content: DOCX file bytes or stream
 
         Returns:
             Extracted text
         """
         try:
-            docx_file = io.BytesIO(content)
-            doc = Document(docx_file)
+            if self.docx_extractor == "streaming":
+                extracted_text = extract_docx_text(self._open_stream(content))
+                if not extracted_text.strip():
+                    raise ValueError("No text could be extracted from DOCX file.")
+                return extracted_text.strip()
+
+            doc = _docx_document(self._open_stream(content))
 
             text_parts = []
 
@@ -129,17 +402,20 @@ class DocumentParser:
             logger.error(f"DOCX parsing error: {str(e)}")
             raise ValueError(f"Failed to parse DOCX: {str(e)}")
 
-    def _parse_txt(self, content: bytes) -> str:
+    def _parse_txt(self, content: DocumentSource) -> str:
         """
         Extract text from TXT file
 
         Args:
-            content: TXT file bytes
+            content: TXT file bytes or stream
 
         Returns:
             Decoded text
         """
         try:
+            if not isinstance(content, (bytes, bytearray)):
+                content = self._open_stream(content).read()
+
             # Try UTF-8 first
             try:
                 text = content.decode("utf-8")
@@ -155,3 +431,19 @@ class DocumentParser:
         except Exception as e:
             logger.error(f"TXT parsing error: {str(e)}")
             raise ValueError(f"Failed to parse text file: {str(e)}")
+
+    @staticmethod
+    def _open_stream(content: DocumentSource) -> BinaryIO:
+        """
+        Normalize parser input to a seekable stream positioned at the start
+
+        Args:
+            content: Raw bytes or an already-open binary stream
+
+        Returns:
+            Seekable binary stream
+        """
+        if isinstance(content, (bytes, bytearray)):
+            return io.BytesIO(content)
+        content.seek(0)
+        return content
@@ -0,0 +1,128 @@
+"""
+Streaming DOCX Extractor
+Extracts text from word/document.xml with iterparse, without building a document model
+"""
+
+import logging
+import zipfile
+from typing import BinaryIO, List, Optional
+from xml.etree.ElementTree import iterparse
+
+logger = logging.getLogger(__name__)
+
+DOCUMENT_PART = "word/document.xml"
+
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+BODY = _W + "body"
+PARAGRAPH = _W + "p"
+TABLE = _W + "tbl"
+ROW = _W + "tr"
+CELL = _W + "tc"
+TEXT = _W + "t"
+TAB = _W + "tab"
+BREAKS = (_W + "br", _W + "cr")
+NO_BREAK_HYPHEN = _W + "noBreakHyphen"
+VMERGE = _W + "vMerge"
+VAL = _W + "val"
+
+# Table rows are joined the same way as in the python-docx extractor
+CELL_SEPARATOR = " | "
+
+
+def extract_docx_text(stream: BinaryIO) -> str:
+    """
+    Extract paragraph and table text from a DOCX in document order
+
+    The main document part is decompressed and parsed as a stream, and XML
+    elements are discarded as soon as their text is collected, so apart from
+    the extracted text itself memory stays flat however long the document
+    is. No styles, numbering or relationship parts are loaded. Table rows are joined
+    with " | ". Merged cells are emitted once: a horizontally merged cell is a
+    single w:tc element, and the continuation cells of a vertical merge are
+    skipped. Paragraphs in nested tables and text boxes are included.
+
+    Args:
+        stream: Seekable binary stream of the .docx file
+
+    Returns:
+        Extracted text, one line per paragraph or table row
+
+    Raises:
+        zipfile.BadZipFile: If the file is not a zip archive
+        KeyError: If the archive has no word/document.xml
+    """
+    lines: List[str] = []
+
+    # Open paragraphs; text boxes nest a paragraph inside another one
+    paragraphs: List[List[str]] = []
+    # Cells and rows of the outermost open table
+    table_depth = 0
+    row: Optional[List[str]] = None
+    cell: Optional[List[str]] = None
+    skip_cell = False
+    depth = 0
+    body = None
+
+    with zipfile.ZipFile(stream) as archive, archive.open(DOCUMENT_PART) as part:
+        for event, element in iterparse(part, events=("start", "end")):
+            tag = element.tag
+
+            if event == "start":
+                depth += 1
+                if tag == PARAGRAPH:
+                    paragraphs.append([])
+                elif tag == TABLE:
+                    table_depth += 1
+                elif tag == ROW and table_depth == 1:
+                    row = []
+                elif tag == CELL and table_depth == 1:
+                    cell = []
+                    skip_cell = False
+                elif tag == BODY:
+                    body = element
+                continue
+
+            depth -= 1
+            if tag == TEXT:
+                if paragraphs and element.text:
+                    paragraphs[-1].append(element.text)
+            elif tag == TAB:
+                if paragraphs:
+                    paragraphs[-1].append("\t")
+            elif tag in BREAKS:
+                if paragraphs:
+                    paragraphs[-1].append("\n")
+            elif tag == NO_BREAK_HYPHEN:
+                if paragraphs:
+                    paragraphs[-1].append("-")
+            elif tag == VMERGE:
+                # <w:vMerge/> without val="restart" continues the cell above
+                if table_depth == 1 and cell is not None and element.get(VAL, "continue") == "continue":
+                    skip_cell = True
+            elif tag == PARAGRAPH:
+                text = "".join(paragraphs.pop()).strip()
+                if text:
+                    if cell is not None:
+                        cell.append(text)
+                    else:
+                        lines.append(text)
+            elif tag == CELL and table_depth == 1:
+                cell_text = "\n".join(cell).strip()
+                if cell_text and not skip_cell and row is not None:
+                    row.append(cell_text)
+                cell = None
+            elif tag == ROW and table_depth == 1:
+                if row:
+                    lines.append(CELL_SEPARATOR.join(row))
+                row = None
+            elif tag == TABLE:
+                table_depth -= 1
+
+            # Drop finished content so the tree never grows: paragraphs and
+            # rows are emptied as they close, top-level blocks removed outright
+            if tag in (PARAGRAPH, ROW):
+                element.clear()
+            if depth == 2 and body is not None:
+                body.clear()
+
+    return "\n".join(lines)
@@ -0,0 +1,104 @@
+"""
+Service Factory
+Builds the parsing and structuring services from environment variables
+
+The API (main.py) and the offline bulk importer (bulk_import.py) both call
+these, so a setting such as PDF_ENGINE or CLAUDE_MAX_TOKENS means the same
+thing, with the same default, in both.
+"""
+
+import os
+from typing import Any, Optional
+
+from app.services.ai_structurer import AIStructurer
+from app.services.document_parser import DocumentParser
+from app.services.metrics import PipelineMetrics
+from app.services.model_router import DEFAULT_MODEL, FAST_MODEL, ModelRouter
+from app.services.rule_structurer import RuleBasedStructurer
+from app.services.text_normalizer import TextNormalizer
+
+
+def env_flag(name: str, default: str) -> bool:
+    """Whether a "true"/"false" environment variable is set to true"""
+    return os.getenv(name, default).lower() == "true"
+
+
+def build_document_parser(metrics: Optional[PipelineMetrics] = None, page_parallel: bool = True) -> DocumentParser:
+    """
+    Create the DocumentParser (PDF_*, DOCX_EXTRACTOR)
+
+    Args:
+        metrics: Optional metrics sink
+        page_parallel: Honour PDF_PAGE_WORKERS; callers that already parse
+            in worker processes pass False
+
+    Returns:
+        DocumentParser
+    """
+    return DocumentParser(
+        max_pdf_pages=int(os.getenv("PDF_MAX_PAGES", "20")) or None,
+        max_pdf_chars=int(os.getenv("PDF_MAX_CHARS", "50000")) or None,
+        parallel_page_threshold=int(os.getenv("PDF_PARALLEL_PAGE_THRESHOLD", "8")),
+        page_workers=int(os.getenv("PDF_PAGE_WORKERS", "0")) if page_parallel else 0,
+        metrics=metrics,
+        docx_extractor=os.getenv("DOCX_EXTRACTOR", "python-docx"),
+        pdf_engine=os.getenv("PDF_ENGINE", "auto"),
+        pdf_engine_fallback=env_flag("PDF_ENGINE_FALLBACK", "true"),
+    )
+
+
+def build_rule_structurer() -> Optional[RuleBasedStructurer]:
+    """Create the rule-based structurer, or None when RULE_STRUCTURER_ENABLED=false"""
+    return RuleBasedStructurer() if env_flag("RULE_STRUCTURER_ENABLED", "true") else None
+
+
+def build_text_normalizer() -> Optional[TextNormalizer]:
+    """Create the prompt normalizer, or None when PROMPT_NORMALIZATION_ENABLED=false"""
+    return TextNormalizer() if env_flag("PROMPT_NORMALIZATION_ENABLED", "true") else None
+
+
+def build_model_router() -> ModelRouter:
+    """Create the ModelRouter (CLAUDE_*, MODEL_ROUTING_*)"""
+    return ModelRouter(
+        model=os.getenv("CLAUDE_MODEL", DEFAULT_MODEL),
+        fast_model=os.getenv("CLAUDE_FAST_MODEL", FAST_MODEL) if env_flag("MODEL_ROUTING_ENABLED", "false") else None,
+        fast_max_tokens=int(os.getenv("MODEL_ROUTING_FAST_MAX_TOKENS", "800")),
+        fast_max_lines=int(os.getenv("MODEL_ROUTING_FAST_MAX_LINES", "60")),
+        max_tokens=int(os.getenv("CLAUDE_MAX_TOKENS", "4096")),
+        min_max_tokens=int(os.getenv("CLAUDE_MIN_MAX_TOKENS", "1024")),
+        output_tokens_per_input_token=float(os.getenv("CLAUDE_OUTPUT_TOKENS_PER_INPUT_TOKEN", "0")),
+    )
+
+
+def build_ai_structurer(
+    client: Optional[Any],
+    prestructurer: Optional[RuleBasedStructurer],
+    normalizer: Optional[TextNormalizer],
+    router: ModelRouter,
+    metrics: Optional[PipelineMetrics] = None,
+) -> AIStructurer:
+    """
+    Create the AIStructurer (ANTHROPIC_API_KEY, SHARD*, PROMPT_CACHING_ENABLED)
+
+    Args:
+        client: Claude client the structurer calls
+        prestructurer: Optional rule-based stage
+        normalizer: Optional prompt normalizer
+        router: Model and max_tokens router
+        metrics: Optional metrics sink
+
+    Returns:
+        AIStructurer
+    """
+    return AIStructurer(
+        api_key=os.getenv("ANTHROPIC_API_KEY"),
+        prestructurer=prestructurer,
+        normalizer=normalizer,
+        client=client,
+        metrics=metrics,
+        sharded=env_flag("SHARDED_STRUCTURING_ENABLED", "false"),
+        shard_min_chars=int(os.getenv("SHARD_MIN_CHARS", "3000")),
+        shard_max_chars=int(os.getenv("SHARD_MAX_CHARS", "4000")),
+        router=router,
+        prompt_caching=env_flag("PROMPT_CACHING_ENABLED", "false"),
+    )
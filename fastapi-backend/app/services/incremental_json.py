@@ -0,0 +1,168 @@
+"""
+Incremental JSON Parser
+Emits top-level members of a streamed JSON object as soon as each one is complete
+"""
+
+import json
+import logging
+from typing import Any, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# (section name, array index or None for the whole member, decoded value)
+SectionEvent = Tuple[str, Optional[int], Any]
+
+# Returned by _decode for an undecodable element; JSON null decodes to None
+_UNDECODABLE = object()
+
+
+class IncrementalSectionParser:
+    """
+    Scans a JSON object delivered in arbitrary text chunks.
+
+    Every time a top-level member finishes, feed() returns it as
+    (key, None, value). Elements of top-level arrays are also returned as
+    (key, index, value) the moment each element closes, so long lists such as
+    work experience can be shown before the whole array is done. Text before
+    the opening brace and after the closing brace (markdown fences, prose) is
+    ignored.
+    """
+
+    def __init__(self):
+        self._buffer = ""
+        self._pos = 0
+        self._depth = 0
+        self._started = False
+        self._finished = False
+        self._in_string = False
+        self._escape = False
+
+        # Top-level member being scanned
+        self._key: Optional[str] = None
+        self._key_start: Optional[int] = None
+        self._value_start: Optional[int] = None
+        self._value_is_array = False
+
+        # Element of a top-level array being scanned
+        self._item_start: Optional[int] = None
+        self._item_index = 0
+
+    @property
+    def finished(self) -> bool:
+        """Whether the closing brace of the top-level object has been seen"""
+        return self._finished
+
+    def feed(self, chunk: str) -> List[SectionEvent]:
+        """
+        Consume the next chunk of model output
+
+        Args:
+            chunk: Newly received text
+
+        Returns:
+            Members and array elements completed by this chunk, in order
+        """
+        events: List[SectionEvent] = []
+        if self._finished:
+            return events
+
+        self._buffer += chunk
+        buffer = self._buffer
+
+        for pos in range(self._pos, len(buffer)):
+            char = buffer[pos]
+
+            if not self._started:
+                if char == "{":
+                    self._started = True
+                    self._depth = 1
+                continue
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._depth == 1 and self._key_start is not None and self._value_start is None:
+                        self._key = json.loads(buffer[self._key_start:pos + 1])
+                        self._key_start = None
+                continue
+
+            if char.isspace():
+                continue
+
+            # First character of a value directly inside a top-level array
+            if self._depth == 2 and self._value_is_array and self._item_start is None and char not in ",]":
+                self._item_start = pos
+
+            if char == '"':
+                self._in_string = True
+                if self._depth == 1 and self._value_start is None and self._key is None:
+                    self._key_start = pos
+                elif self._depth == 1 and self._value_start is None:
+                    self._value_start = pos
+            elif char == ":" and self._depth == 1:
+                continue
+            elif char in "{[":
+                if self._depth == 1 and self._value_start is None:
+                    self._value_start = pos
+                    self._value_is_array = char == "["
+                    self._item_index = 0
+                self._depth += 1
+            elif char in "}]":
+                if self._depth == 2 and self._value_is_array and char == "]":
+                    self._close_item(pos, events)
+                self._depth -= 1
+                if self._depth == 1:
+                    self._close_member(pos + 1, events)
+                elif self._depth == 0:
+                    self._close_member(pos, events)
+                    self._finished = True
+                    self._pos = pos + 1
+                    return events
+            elif char == ",":
+                if self._depth == 1:
+                    self._close_member(pos, events)
+                elif self._depth == 2 and self._value_is_array:
+                    self._close_item(pos, events)
+            elif self._depth == 1 and self._value_start is None:
+                # Bare literal value (number, true, false, null)
+                self._value_start = pos
+
+        self._pos = len(buffer)
+        return events
+
+    def _close_item(self, end: int, events: List[SectionEvent]) -> None:
+        """Emit the array element ending just before end"""
+        if self._item_start is None:
+            return
+        value = self._decode(self._buffer[self._item_start:end])
+        if value is not _UNDECODABLE:
+            events.append((self._key, self._item_index, value))
+        self._item_index += 1
+        self._item_start = None
+
+    def _close_member(self, end: int, events: List[SectionEvent]) -> None:
+        """Emit the top-level member whose value ends just before end"""
+        if self._key is not None and self._value_start is not None:
+            raw = self._buffer[self._value_start:end].strip()
+            try:
+                events.append((self._key, None, json.loads(raw)))
+            except json.JSONDecodeError:
+                logger.warning(f"Skipping undecodable section '{self._key}' in streamed JSON")
+
+        self._key = None
+        self._key_start = None
+        self._value_start = None
+        self._value_is_array = False
+        self._item_start = None
+
+    @staticmethod
+    def _decode(raw: str) -> Any:
+        try:
+            return json.loads(raw)
+        except json.JSONDecodeError:
+            logger.warning("Skipping undecodable array element in streamed JSON")
+            return _UNDECODABLE
@@ -0,0 +1,310 @@
+"""
+Job Service
+In-memory job store and background worker queue for asynchronous parsing
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATUSES = ("succeeded", "failed")
+
+
+class JobError(Exception):
+    """Raised by job handlers to fail a job with a client-facing reason"""
+
+    def __init__(self, detail: str, status_code: int = 500):
+        super().__init__(detail)
+        self.detail = detail
+        self.status_code = status_code
+
+
+class JobRetryError(Exception):
+    """Raised by job handlers when a temporary overload should be retried later"""
+
+    def __init__(self, detail: str, retry_after: float, status_code: int = 503):
+        super().__init__(detail)
+        self.detail = detail
+        self.retry_after = retry_after
+        self.status_code = status_code
+
+
+class JobQueueFullError(Exception):
+    """Raised when no more jobs can be accepted"""
+
+
+@dataclass
+class Job:
+    """State of one asynchronous parse job"""
+    id: str
+    filename: str
+    structure_with_ai: bool
+    status: str = "queued"
+    created_at: float = field(default_factory=time.time)
+    updated_at: float = field(default_factory=time.time)
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    status_code: Optional[int] = None
+    done: asyncio.Event = field(default_factory=asyncio.Event, repr=False)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in TERMINAL_STATUSES
+
+
+class JobStore:
+    """
+    Bounded in-memory job store
+
+    Finished jobs are kept for ttl_seconds after completion. When max_jobs is
+    reached the oldest finished jobs are dropped first; if every job is still
+    active, new jobs are refused.
+    """
+
+    def __init__(self, ttl_seconds: float = 3600, max_jobs: int = 1000):
+        """
+        Initialize the store
+
+        Args:
+            ttl_seconds: How long finished jobs and their results are kept
+            max_jobs: Maximum number of jobs held at once
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_jobs = max_jobs
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+
+    def create(self, filename: str, structure_with_ai: bool) -> Job:
+        """
+        Register a new queued job
+
+        Args:
+            filename: Original filename
+            structure_with_ai: Whether the job runs AI structuring
+
+        Returns:
+            The new Job
+
+        Raises:
+            JobQueueFullError: If the store is full of active jobs
+        """
+        self.purge_expired()
+        if len(self._jobs) >= self.max_jobs:
+            self._evict_finished()
+        if len(self._jobs) >= self.max_jobs:
+            raise JobQueueFullError("Job store is full")
+
+        job = Job(id=uuid.uuid4().hex, filename=filename, structure_with_ai=structure_with_ai)
+        self._jobs[job.id] = job
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """
+        Look up a job, treating expired ones as missing
+
+        Args:
+            job_id: Job identifier
+
+        Returns:
+            Job or None
+        """
+        job = self._jobs.get(job_id)
+        if job is not None and self._expired(job, time.time()):
+            del self._jobs[job_id]
+            return None
+        return job
+
+    def remove(self, job_id: str) -> None:
+        """Forget a job (e.g. one that could not be enqueued)"""
+        self._jobs.pop(job_id, None)
+
+    def mark_running(self, job: Job) -> None:
+        job.status = "running"
+        job.updated_at = time.time()
+
+    def complete(self, job: Job, result: Dict[str, Any]) -> None:
+        job.status = "succeeded"
+        job.result = result
+        job.updated_at = time.time()
+        job.done.set()
+
+    def fail(self, job: Job, error: str, status_code: int) -> None:
+        job.status = "failed"
+        job.error = error
+        job.status_code = status_code
+        job.updated_at = time.time()
+        job.done.set()
+
+    async def wait(self, job: Job, timeout: float) -> None:
+        """
+        Long-poll until the job finishes or the timeout passes
+
+        Args:
+            job: Job to wait for
+            timeout: Maximum wait in seconds
+        """
+        if job.finished or timeout <= 0:
+            return
+        try:
+            await asyncio.wait_for(job.done.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    def purge_expired(self) -> int:
+        """
+        Drop finished jobs older than the TTL
+
+        Returns:
+            Number of jobs removed
+        """
+        now = time.time()
+        expired = [job_id for job_id, job in self._jobs.items() if self._expired(job, now)]
+        for job_id in expired:
+            del self._jobs[job_id]
+        return len(expired)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return job counts by status
+
+        Returns:
+            Dictionary of store statistics
+        """
+        counts: Dict[str, int] = {"queued": 0, "running": 0, "succeeded": 0, "failed": 0}
+        for job in self._jobs.values():
+            counts[job.status] += 1
+        return {**counts, "total": len(self._jobs), "max_jobs": self.max_jobs}
+
+    def _expired(self, job: Job, now: float) -> bool:
+        return job.finished and now - job.updated_at > self.ttl_seconds
+
+    def _evict_finished(self) -> None:
+        for job_id in [job_id for job_id, job in self._jobs.items() if job.finished]:
+            del self._jobs[job_id]
+            if len(self._jobs) < self.max_jobs:
+                return
+
+
+JobHandler = Callable[[Job, Any], Awaitable[Dict[str, Any]]]
+
+
+class JobQueue:
+    """
+    Fixed pool of asyncio workers draining a bounded job queue
+
+    Jobs are bounded both in number and in payload bytes held in memory
+    (queued or running). A handler raising JobRetryError is run again by the
+    same worker after the suggested delay, up to max_retries times, so a
+    briefly saturated backend does not fail the job.
+    """
+
+    def __init__(
+        self,
+        store: JobStore,
+        handler: JobHandler,
+        workers: int = 4,
+        queue_size: int = 100,
+        max_payload_bytes: int = 0,
+        max_retries: int = 5,
+    ):
+        """
+        Initialize the queue
+
+        Args:
+            store: Store that tracks job state
+            handler: Coroutine run for each job; returns the job result
+            workers: Number of concurrent worker tasks
+            queue_size: Maximum jobs waiting for a worker
+            max_payload_bytes: Maximum payload bytes held by queued and
+                running jobs (0 disables the limit)
+            max_retries: How often a job raising JobRetryError is retried
+        """
+        self.store = store
+        self.handler = handler
+        self.workers = workers
+        self.max_payload_bytes = max_payload_bytes
+        self.max_retries = max_retries
+        self._queue: "asyncio.Queue" = asyncio.Queue(maxsize=queue_size)
+        self._tasks: List[asyncio.Task] = []
+        self._payload_bytes = 0
+        self._retries = 0
+
+    def submit(self, job: Job, payload: Any, size: int = 0) -> None:
+        """
+        Enqueue a job for the workers
+
+        Args:
+            job: Job created in the store
+            payload: Input handed to the handler (e.g. file bytes)
+            size: Payload size in bytes, counted against max_payload_bytes
+
+        Raises:
+            JobQueueFullError: If the queue or its byte budget is full
+        """
+        if self.max_payload_bytes and self._payload_bytes + size > self.max_payload_bytes:
+            raise JobQueueFullError("Job queue payload limit reached")
+        try:
+            self._queue.put_nowait((job, payload, size))
+        except asyncio.QueueFull:
+            raise JobQueueFullError("Job queue is full")
+        self._payload_bytes += size
+
+    def start(self) -> None:
+        """Start the worker tasks on the running event loop"""
+        self._tasks = [asyncio.create_task(self._worker(index)) for index in range(self.workers)]
+
+    async def stop(self) -> None:
+        """Cancel the worker tasks"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "queued": self._queue.qsize(),
+            "queue_size": self._queue.maxsize,
+            "payload_bytes": self._payload_bytes,
+            "max_payload_bytes": self.max_payload_bytes,
+            "retries": self._retries,
+        }
+
+    async def _worker(self, index: int) -> None:
+        while True:
+            job, payload, size = await self._queue.get()
+            try:
+                self.store.mark_running(job)
+                result = await self._run(job, payload)
+                self.store.complete(job, result)
+            except (JobError, JobRetryError) as e:
+                self.store.fail(job, e.detail, e.status_code)
+            except Exception as e:
+                logger.error(f"Job {job.id} failed: {str(e)}", exc_info=True)
+                self.store.fail(job, f"Failed to parse resume: {str(e)}", 500)
+            finally:
+                self._payload_bytes -= size
+                self._queue.task_done()
+
+    async def _run(self, job: Job, payload: Any) -> Dict[str, Any]:
+        """Run the handler, retrying JobRetryError after its delay"""
+        attempt = 0
+        while True:
+            try:
+                return await self.handler(job, payload)
+            except JobRetryError as e:
+                if attempt >= self.max_retries:
+                    raise
+                attempt += 1
+                self._retries += 1
+                logger.info(f"Job {job.id} retrying in {e.retry_after}s ({attempt}/{self.max_retries}): {e.detail}")
+                # The job waits as queued; holding the worker meanwhile keeps
+                # an overloaded backend from being fed even more work
+                job.status = "queued"
+                await asyncio.sleep(e.retry_after)
+                self.store.mark_running(job)
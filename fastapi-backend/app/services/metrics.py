@@ -0,0 +1,282 @@
+"""
+Metrics Service
+Minimal Prometheus-compatible counters and histograms for the parsing pipeline
+"""
+
+import logging
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Seconds; covers fast regex/validation stages up to slow Claude calls
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Counter:
+    """Monotonic counter with optional labels"""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[LabelValues, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def values(self) -> Dict[LabelValues, float]:
+        with self._lock:
+            return dict(self._values)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        for key, value in sorted(self.values().items()):
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+
+class Histogram:
+    """Cumulative-bucket histogram with optional labels"""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        # label values -> [bucket counts..., sum, count]
+        self._series: Dict[LabelValues, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0] * (len(self.buckets) + 2)
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[index] += 1
+                    break
+            series[-2] += value
+            series[-1] += 1
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        """Observe the duration of the with-block, including when it raises"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def series(self) -> Dict[LabelValues, List[float]]:
+        with self._lock:
+            return {key: list(values) for key, values in self._series.items()}
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        for key, values in sorted(self.series().items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, values):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(
+                    f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {_format_value(cumulative)}"
+                )
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(values[-2])}")
+            lines.append(f"{self.name}_count{labels} {_format_value(values[-1])}")
+        return lines
+
+    def quantile(self, key: LabelValues, fraction: float) -> float:
+        """Upper bound of the bucket holding the given quantile (inf if beyond the last bucket)"""
+        values = self.series().get(key)
+        if not values or not values[-1]:
+            return 0.0
+        target = values[-1] * fraction
+        cumulative = 0
+        for bound, count in zip(self.buckets, values):
+            cumulative += count
+            if cumulative >= target:
+                return bound
+        return math.inf
+
+
+class PipelineMetrics:
+    """
+    Per-stage latency histograms and counters for the resume pipeline
+
+    Stages are timed with stage(); document parsing is timed separately per
+    file type with parse(). render() produces the Prometheus text exposition
+    format served on /metrics, summary() a compact view for /health.
+    """
+
+    CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+    def __init__(self, namespace: str = "resume_parser"):
+        """
+        Initialize the metric families
+
+        Args:
+            namespace: Prefix for every metric name
+        """
+        self.stage_seconds = Histogram(
+            f"{namespace}_stage_duration_seconds",
+            "Duration of pipeline stages in seconds",
+            ["stage"],
+        )
+        self.parse_seconds = Histogram(
+            f"{namespace}_document_parse_duration_seconds",
+            "Duration of document text extraction in seconds",
+            ["file_type"],
+        )
+        self.ingested_bytes = Counter(
+            f"{namespace}_ingested_bytes_total", "Bytes of uploaded documents read", ["file_type"]
+        )
+        self.pages_extracted = Counter(
+            f"{namespace}_pdf_pages_extracted_total", "PDF pages text was extracted from"
+        )
+        self.tokens = Counter(
+            f"{namespace}_claude_tokens_total", "Claude tokens used, by direction", ["type"]
+        )
+        self.failures = Counter(
+            f"{namespace}_failures_total", "Pipeline failures by reason", ["reason"]
+        )
+        self.claude_seconds = Histogram(
+            f"{namespace}_claude_request_duration_seconds",
+            "Duration of Claude calls in seconds, by model route",
+            ["route", "model"],
+        )
+        self.claude_first_token_seconds = Histogram(
+            f"{namespace}_claude_time_to_first_token_seconds",
+            "Time to the first streamed Claude token in seconds, by model route",
+            ["route", "model"],
+        )
+        self.route_tokens = Counter(
+            f"{namespace}_claude_route_tokens_total",
+            "Claude tokens by model route and type (input, output, cache_read_input, cache_creation_input)",
+            ["route", "type"],
+        )
+        self.pdf_engine_seconds = Histogram(
+            f"{namespace}_pdf_engine_duration_seconds",
+            "Duration of PDF text extraction in seconds, by engine",
+            ["engine"],
+        )
+        self.pdf_engine_chars = Counter(
+            f"{namespace}_pdf_engine_chars_total", "Characters of text extracted, by PDF engine", ["engine"]
+        )
+        self.pdf_engine_documents = Counter(
+            f"{namespace}_pdf_engine_documents_total",
+            "PDF engine runs by engine and outcome (text, empty, error)",
+            ["engine", "outcome"],
+        )
+        self.pdf_engine_selections = Counter(
+            f"{namespace}_pdf_engine_selections_total",
+            "PDF engine choices by engine and reason",
+            ["engine", "reason"],
+        )
+        self._families = [
+            self.stage_seconds, self.parse_seconds, self.ingested_bytes,
+            self.pages_extracted, self.tokens, self.failures,
+            self.claude_seconds, self.claude_first_token_seconds, self.route_tokens,
+            self.pdf_engine_seconds, self.pdf_engine_chars, self.pdf_engine_documents,
+            self.pdf_engine_selections,
+        ]
+
+    def stage(self, name: str):
+        """Context manager timing one pipeline stage"""
+        return self.stage_seconds.time(stage=name)
+
+    def parse(self, file_type: str):
+        """Context manager timing document parsing for one file type"""
+        return self.parse_seconds.time(file_type=file_type)
+
+    def failure(self, reason: str) -> None:
+        self.failures.inc(reason=reason)
+
+    def render(self) -> str:
+        """
+        Render all metrics in the Prometheus text format
+
+        Returns:
+            Exposition text
+        """
+        lines: List[str] = []
+        for family in self._families:
+            lines.extend(family.render())
+        return "\n".join(lines) + "\n"
+
+    def summary(self) -> Dict[str, object]:
+        """
+        Summarize stage latencies and counters
+
+        Returns:
+            Dictionary with count, mean and approximate p99 (ms) per stage
+        """
+        def describe(histogram: Histogram) -> Dict[str, Dict[str, float]]:
+            stages = {}
+            for key, values in histogram.series().items():
+                count = values[-1]
+                p99 = histogram.quantile(key, 0.99)
+                stages["/".join(key)] = {
+                    "count": int(count),
+                    "mean_ms": round(values[-2] / count * 1000, 2) if count else 0.0,
+                    "p99_le_ms": None if p99 == math.inf else round(p99 * 1000, 2),
+                }
+            return stages
+
+        return {
+            "stages": describe(self.stage_seconds),
+            "document_parse": describe(self.parse_seconds),
+            "ingested_bytes": int(sum(self.ingested_bytes.values().values())),
+            "pdf_pages_extracted": int(sum(self.pages_extracted.values().values())),
+            "claude_tokens": {key[0]: int(value) for key, value in self.tokens.values().items()},
+            "failures": {key[0]: int(value) for key, value in self.failures.values().items()},
+            "claude_routes": {
+                "calls": describe(self.claude_seconds),
+                "first_token": describe(self.claude_first_token_seconds),
+                "tokens": {"/".join(key): int(value) for key, value in self.route_tokens.values().items()},
+            },
+            "pdf_engines": {
+                "runs": describe(self.pdf_engine_seconds),
+                "chars": {key[0]: int(value) for key, value in self.pdf_engine_chars.values().items()},
+                "outcomes": {"/".join(key): int(value) for key, value in self.pdf_engine_documents.values().items()},
+                "selections": {
+                    "/".join(key): int(value) for key, value in self.pdf_engine_selections.values().items()
+                },
+            },
+        }
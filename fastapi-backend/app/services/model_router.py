@@ -0,0 +1,123 @@
+"""
+Model Router Service
+Chooses the Claude model and max_tokens for a structuring call from the size of
+the text being structured
+"""
+
+import logging
+import math
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL = "claude-3-5-sonnet-20241022"
+FAST_MODEL = "claude-3-5-haiku-20241022"
+
+# Output tokens for the JSON skeleton (keys, nulls, empty arrays) on top of
+# what scales with the resume text
+JSON_OVERHEAD_TOKENS = 400
+
+
+@dataclass(frozen=True)
+class ModelRoute:
+    """Model and output budget for one Claude call"""
+    name: str
+    model: str
+    max_tokens: int
+
+
+class ModelRouter:
+    """
+    Routes structuring calls between a default and an optional fast model
+
+    Text of at most fast_max_tokens (estimated) and fast_max_lines goes to
+    fast_model; short resumes have few entries to disentangle, and a smaller
+    model answers them sooner and more cheaply. Everything else goes to the
+    default model.
+
+    max_tokens is sized to the input when output_tokens_per_input_token is
+    set: the structured JSON restates the resume, so its length follows the
+    text's. The budget is clamped to [min_max_tokens, max_tokens]. A lower
+    budget lets the API reserve less output capacity against rate limits,
+    and a runaway answer fails sooner.
+    """
+
+    def __init__(
+        self,
+        model: str = DEFAULT_MODEL,
+        fast_model: Optional[str] = None,
+        fast_max_tokens: int = 800,
+        fast_max_lines: int = 60,
+        max_tokens: int = 4096,
+        min_max_tokens: int = 1024,
+        output_tokens_per_input_token: float = 0.0
+    ):
+        """
+        Initialize the router
+
+        Args:
+            model: Model for everything not routed to the fast model
+            fast_model: Model for short, simple text (None disables routing)
+            fast_max_tokens: Largest estimated text size routed to fast_model
+            fast_max_lines: Most non-empty lines routed to fast_model
+            max_tokens: Upper bound (and fixed value when not sizing) for max_tokens
+            min_max_tokens: Lower bound for sized max_tokens
+            output_tokens_per_input_token: Expected output per token of text;
+                0 always uses max_tokens
+        """
+        self.model = model
+        self.fast_model = fast_model
+        self.fast_max_tokens = fast_max_tokens
+        self.fast_max_lines = fast_max_lines
+        self.max_tokens = max_tokens
+        self.min_max_tokens = min(min_max_tokens, max_tokens)
+        self.output_tokens_per_input_token = output_tokens_per_input_token
+
+    def route(self, text_tokens: int, lines: int) -> ModelRoute:
+        """
+        Choose the route for one call
+
+        Args:
+            text_tokens: Estimated tokens of the resume text in the prompt
+            lines: Non-empty lines of that text
+
+        Returns:
+            ModelRoute with the model and max_tokens to use
+        """
+        if self.fast_model and text_tokens <= self.fast_max_tokens and lines <= self.fast_max_lines:
+            name, model = "fast", self.fast_model
+        else:
+            name, model = "default", self.model
+        return ModelRoute(name, model, self.output_budget(text_tokens))
+
+    def output_budget(self, text_tokens: int) -> int:
+        """
+        Compute max_tokens for text of a given size
+
+        Args:
+            text_tokens: Estimated tokens of the resume text in the prompt
+
+        Returns:
+            max_tokens value
+        """
+        if self.output_tokens_per_input_token <= 0:
+            return self.max_tokens
+        budget = math.ceil(text_tokens * self.output_tokens_per_input_token) + JSON_OVERHEAD_TOKENS
+        return max(self.min_max_tokens, min(self.max_tokens, budget))
+
+    def describe(self) -> Dict[str, Any]:
+        """
+        Return the routing configuration
+
+        Returns:
+            Dictionary for /health
+        """
+        return {
+            "model": self.model,
+            "fast_model": self.fast_model,
+            "fast_max_tokens": self.fast_max_tokens if self.fast_model else None,
+            "fast_max_lines": self.fast_max_lines if self.fast_model else None,
+            "max_tokens": self.max_tokens,
+            "sized_max_tokens": self.output_tokens_per_input_token > 0,
+        }
@@ -0,0 +1,271 @@
+"""
+Near-Duplicate Index Service
+MinHash/LSH similarity index over resume text, so re-uploads with small edits
+can reuse an earlier structured result
+"""
+
+import logging
+import re
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set, Tuple
+
+from app.services.text_normalizer import TextNormalizer
+
+logger = logging.getLogger(__name__)
+
+WORD_RE = re.compile(r"\w+")
+HASH_MASK = (1 << 64) - 1
+# Marks a signature slot no shingle hashed into; larger than any real value
+EMPTY_SLOT = HASH_MASK
+
+
+@dataclass
+class NearDuplicateMatch:
+    """Best stored entry for a lookup"""
+    key: str
+    similarity: float
+    value: str
+
+
+@dataclass
+class _Entry:
+    signature: array
+    bands: List[int]
+    value: str
+    expires_at: float
+
+
+class NearDuplicateIndex:
+    """
+    Bounded in-memory index of resume texts by estimated Jaccard similarity
+
+    Texts are lower-cased into word shingles, so whitespace, bullets and
+    line breaks, which change when a resume is re-exported to another
+    format, do not affect similarity. Each text gets a one-permutation
+    MinHash signature: every shingle is hashed once and the minimum is kept
+    per slot. Signatures are split into bands for locality-sensitive hashing.
+    Only entries that share a band with the query are compared, and a match
+    needs an estimated similarity of at least the threshold.
+
+    Memory is bounded by max_entries (least recently used entries are
+    evicted first); an entry holds its signature (8 bytes per slot) and the
+    stored value. Shingles are hashed with Python's per-process hash, so
+    signatures are only meaningful within the process that built them.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.95,
+        max_entries: int = 2048,
+        ttl_seconds: float = 3600,
+        num_slots: int = 128,
+        bands: int = 16,
+        shingle_size: int = 5,
+        min_words: int = 50,
+        normalizer: Optional[TextNormalizer] = None,
+    ):
+        """
+        Initialize the index
+
+        Args:
+            threshold: Minimum estimated Jaccard similarity for a match (0-1)
+            max_entries: Maximum number of texts kept
+            ttl_seconds: Time-to-live for every entry, in seconds
+            num_slots: MinHash signature length
+            bands: LSH bands; num_slots must be divisible by it. More bands
+                find lower-similarity candidates at the cost of more comparisons
+            shingle_size: Words per shingle
+            min_words: Texts with fewer words are neither indexed nor matched
+            normalizer: Optional TextNormalizer applied before shingling
+        """
+        if not 0 < threshold <= 1:
+            raise ValueError(f"Similarity threshold must be in (0, 1]: {threshold}")
+        if num_slots % bands:
+            raise ValueError(f"num_slots ({num_slots}) must be divisible by bands ({bands})")
+
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.num_slots = num_slots
+        self.bands = bands
+        self.rows = num_slots // bands
+        self.shingle_size = shingle_size
+        self.min_words = min_words
+        self.normalizer = normalizer
+
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._buckets: Dict[int, Set[str]] = {}
+        self._lock = threading.Lock()
+        self._counters = {
+            "hits": 0,
+            "misses": 0,
+            "skipped": 0,
+            "candidates_compared": 0,
+            "evictions": 0,
+            "expirations": 0,
+        }
+
+    def signature(self, text: str) -> Optional[array]:
+        """
+        Compute the MinHash signature of a text
+
+        Args:
+            text: Resume text
+
+        Returns:
+            Signature array, or None if the text is shorter than min_words
+        """
+        if self.normalizer:
+            text = self.normalizer.normalize(text)
+        words = WORD_RE.findall(text.lower())
+        if len(words) < self.min_words:
+            return None
+
+        slots = self.num_slots
+        minimums = [EMPTY_SLOT] * slots
+        size = self.shingle_size
+        for start in range(len(words) - size + 1):
+            value = hash(tuple(words[start:start + size])) & HASH_MASK
+            slot = value % slots
+            value //= slots
+            if value < minimums[slot]:
+                minimums[slot] = value
+        return array("Q", minimums)
+
+    @staticmethod
+    def similarity(first: array, second: array) -> float:
+        """
+        Estimate Jaccard similarity from two signatures
+
+        Slots that are empty in both signatures carry no information and are
+        left out of the denominator.
+
+        Args:
+            first: Signature from signature()
+            second: Signature from signature()
+
+        Returns:
+            Estimated similarity between 0 and 1
+        """
+        matched = informative = 0
+        for a, b in zip(first, second):
+            if a == EMPTY_SLOT and b == EMPTY_SLOT:
+                continue
+            informative += 1
+            if a == b:
+                matched += 1
+        return matched / informative if informative else 0.0
+
+    def add(self, key: str, text: str, value: str) -> bool:
+        """
+        Index a text with the value to return for its near-duplicates
+
+        Args:
+            key: Identifier of the text (e.g. the upload's content key)
+            text: Resume text
+            value: Serialized value to store
+
+        Returns:
+            False if the text was too short to index
+        """
+        signature = self.signature(text)
+        if signature is None:
+            return False
+
+        entry = _Entry(signature, self._band_keys(signature), value, time.time() + self.ttl_seconds)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = entry
+            for band in entry.bands:
+                self._buckets.setdefault(band, set()).add(key)
+
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+                self._counters["evictions"] += 1
+        return True
+
+    def lookup(self, text: str) -> Optional[NearDuplicateMatch]:
+        """
+        Find the most similar indexed text at or above the threshold
+
+        Args:
+            text: Resume text
+
+        Returns:
+            NearDuplicateMatch, or None if nothing is similar enough
+        """
+        signature = self.signature(text)
+        if signature is None:
+            with self._lock:
+                self._counters["skipped"] += 1
+            return None
+
+        bands = self._band_keys(signature)
+        now = time.time()
+        best: Optional[NearDuplicateMatch] = None
+
+        with self._lock:
+            candidates: Set[str] = set()
+            for band in bands:
+                candidates.update(self._buckets.get(band, ()))
+
+            for key in candidates:
+                entry = self._entries[key]
+                if entry.expires_at <= now:
+                    self._remove(key)
+                    self._counters["expirations"] += 1
+                    continue
+                self._counters["candidates_compared"] += 1
+                score = self.similarity(signature, entry.signature)
+                if score >= self.threshold and (best is None or score > best.similarity):
+                    best = NearDuplicateMatch(key, round(score, 4), entry.value)
+
+            if best is None:
+                self._counters["misses"] += 1
+                return None
+            self._entries.move_to_end(best.key)
+            self._counters["hits"] += 1
+
+        logger.info(f"Near-duplicate of {best.key[:12]} found (similarity {best.similarity})")
+        return best
+
+    def stats(self) -> Dict[str, object]:
+        """
+        Return hit/miss counters and current occupancy
+
+        Returns:
+            Dictionary of index statistics
+        """
+        with self._lock:
+            lookups = self._counters["hits"] + self._counters["misses"]
+            return {
+                **self._counters,
+                "hit_rate": round(self._counters["hits"] / lookups, 4) if lookups else 0.0,
+                "entries": len(self._entries),
+                "threshold": self.threshold,
+            }
+
+    def _band_keys(self, signature: array) -> List[int]:
+        """Hash each band of a signature; all-empty bands are skipped"""
+        keys = []
+        for band in range(self.bands):
+            rows: Tuple[int, ...] = tuple(signature[band * self.rows:(band + 1) * self.rows])
+            if all(row == EMPTY_SLOT for row in rows):
+                continue
+            keys.append(hash((band, rows)))
+        return keys
+
+    def _remove(self, key: str) -> None:
+        """Drop an entry and its bucket memberships (lock held)"""
+        entry = self._entries.pop(key)
+        for band in entry.bands:
+            bucket = self._buckets.get(band)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._buckets[band]
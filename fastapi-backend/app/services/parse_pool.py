@@ -0,0 +1,139 @@
+"""
+Parse Pool Service
+Runs CPU-bound document parsing off the event loop in a bounded worker pool
+"""
+
+import asyncio
+import logging
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Dict
+
+from app.services.document_parser import DocumentParser, DocumentSource
+from app.services.profiler import current_profile, profile_call
+
+logger = logging.getLogger(__name__)
+
+
+class PoolSaturatedError(Exception):
+    """Raised when the parse pool has no free worker or queue slot"""
+
+    def __init__(self, retry_after: int):
+        super().__init__("Document parsing capacity exhausted")
+        self.retry_after = retry_after
+
+
+class ParsePool:
+    """
+    Bounded thread or process pool for DocumentParser.parse
+
+    At most max_workers documents are parsed at once and at most max_queue
+    more wait for a worker. Anything beyond that is rejected immediately with
+    PoolSaturatedError so callers can answer 503 instead of piling up work.
+    """
+
+    def __init__(
+        self,
+        parser: DocumentParser,
+        kind: str = "thread",
+        max_workers: int = 4,
+        max_queue: int = 16,
+        retry_after: int = 2,
+    ):
+        """
+        Initialize the pool
+
+        Args:
+            parser: DocumentParser used by every worker
+            kind: "thread" or "process"
+            max_workers: Number of concurrent parse workers
+            max_queue: Number of parses allowed to wait for a worker
+            retry_after: Seconds suggested to clients when saturated
+        """
+        if kind not in ("thread", "process"):
+            raise ValueError(f"Unsupported parse pool kind: {kind}")
+
+        self.parser = parser
+        self.kind = kind
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.retry_after = retry_after
+
+        self._executor: Executor
+        if kind == "process":
+            self._executor = ProcessPoolExecutor(max_workers=max_workers)
+        else:
+            self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="parse")
+
+        self._pending = 0
+        self._rejected = 0
+        self._completed = 0
+        self._lock = threading.Lock()
+
+    async def parse(self, content: DocumentSource, filename: str) -> str:
+        """
+        Parse a document in the pool
+
+        Args:
+            content: Raw file bytes or a seekable binary stream
+            filename: Original filename with extension
+
+        Returns:
+            Extracted text content
+
+        Raises:
+            PoolSaturatedError: If every worker and queue slot is taken
+        """
+        with self._lock:
+            if self._pending >= self.max_workers + self.max_queue:
+                self._rejected += 1
+                raise PoolSaturatedError(self.retry_after)
+            self._pending += 1
+
+        # Streams cannot be pickled, so process workers receive a bytes copy
+        if self.kind == "process" and not isinstance(content, (bytes, bytearray)):
+            content.seek(0)
+            content = content.read()
+
+        # Profiled requests are sampled inside the worker, where the parse runs
+        profile = current_profile.get()
+
+        # The slot is released when the work finishes, not when the caller
+        # stops waiting, so disconnected clients cannot oversubscribe the pool.
+        if profile:
+            future = self._executor.submit(profile_call, self.parser.parse, content, filename)
+        else:
+            future = self._executor.submit(self.parser.parse, content, filename)
+        future.add_done_callback(self._release)
+
+        result = await asyncio.wrap_future(future)
+        if profile:
+            result, sample = result
+            profile.add("document_parse", sample)
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return pool configuration and occupancy
+
+        Returns:
+            Dictionary of pool statistics
+        """
+        with self._lock:
+            return {
+                "kind": self.kind,
+                "workers": self.max_workers,
+                "queue_size": self.max_queue,
+                "in_flight": self._pending,
+                "completed": self._completed,
+                "rejected": self._rejected,
+            }
+
+    def shutdown(self) -> None:
+        """Stop accepting work and wait for running parses to finish"""
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def _release(self, _future) -> None:
+        with self._lock:
+            self._pending -= 1
+            self._completed += 1
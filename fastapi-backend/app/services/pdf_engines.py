@@ -0,0 +1,323 @@
+"""
+PDF Engines
+Registry of PDF text extraction backends and per-document engine selection
+"""
+
+import importlib.util
+import inspect
+import logging
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any, BinaryIO, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+PDF_ENGINE_AUTO = "auto"
+
+# Probe thresholds for automatic selection
+MIN_PROBE_CHARS = 20           # less text than this on page 1 counts as no text
+MAX_GARBLED_RATIO = 0.02       # share of (cid:x)/U+FFFD/control characters
+MIN_LONG_TOKEN_RATIO = 0.08    # share of 25+ character tokens (missing spaces)
+LONG_TOKEN_CHARS = 25
+SLOW_PAGE_SECONDS = 0.5        # plain pypdf time for page 1
+LAYOUT_MAX_PAGES = 10          # layout mode is several times slower per page
+FONT_SCAN_PAGES = 2
+
+BudgetCheck = Callable[[List[str]], bool]
+
+
+def pdf_reader_class() -> Any:
+    """
+    Import the PDF reader on first use
+
+    pypdf and python-docx are the slowest imports in the service; loading them
+    lazily keeps them off the cold-start path until a document needs them.
+    """
+    # PDF parsing
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        from PyPDF2 import PdfReader
+    return PdfReader
+
+
+class PdfDocument:
+    """A PDF opened once and shared by the probe and the engines"""
+
+    def __init__(self, stream: BinaryIO):
+        """
+        Open the document
+
+        Args:
+            stream: Seekable binary stream positioned anywhere
+        """
+        self.stream = stream
+        self.reader = pdf_reader_class()(stream)
+        # Page 1 text from plain pypdf, kept so the plain engine does not redo it
+        self.probe_text: Optional[str] = None
+
+    def rewind(self) -> BinaryIO:
+        """Return the stream positioned at the start"""
+        self.stream.seek(0)
+        return self.stream
+
+
+class PdfEngine(ABC):
+    """
+    Base class for PDF text extraction backends
+
+    Subclasses set name and implement extract_pages; one that does not
+    cannot be instantiated, so it fails at registration rather than on the
+    first PDF it is chosen for. Engines with
+    parallel=True also implement extract_page, which page-parallel
+    extraction calls in worker processes. Engines sharing a family read
+    text the same way: when one finds none, fallback skips the others.
+    """
+
+    name = ""
+    family = ""
+    parallel = False
+
+    def available(self) -> bool:
+        """Whether the engine's dependencies are installed"""
+        return True
+
+    @abstractmethod
+    def extract_pages(self, document: PdfDocument, page_count: int, budget_reached: BudgetCheck) -> List[str]:
+        """
+        Extract leading pages until the page or character budget is reached
+
+        Args:
+            document: Open document
+            page_count: Number of leading pages to consider
+            budget_reached: Called with the collected texts after each page
+
+        Returns:
+            Non-empty page texts in page order
+        """
+
+
+class PypdfEngine(PdfEngine):
+    """pypdf text extraction in plain (content stream order) or layout mode"""
+
+    family = "pypdf"
+    parallel = True
+
+    def __init__(self, name: str, layout: bool = False):
+        """
+        Initialize the engine
+
+        Args:
+            name: Registry name
+            layout: Use extraction_mode="layout", which places text by its
+                coordinates; slower, but keeps word spacing and columns
+        """
+        self.name = name
+        self.layout = layout
+
+    def available(self) -> bool:
+        if not self.layout:
+            return True
+        try:
+            from pypdf import PageObject
+        except ImportError:
+            return False
+        return "extraction_mode" in inspect.signature(PageObject.extract_text).parameters
+
+    def extract_pages(self, document: PdfDocument, page_count: int, budget_reached: BudgetCheck) -> List[str]:
+        text_parts = []
+        for index in range(page_count):
+            if index == 0 and not self.layout and document.probe_text is not None:
+                text = document.probe_text
+            else:
+                text = self.extract_page(document.reader, index)
+            if text:
+                text_parts.append(text)
+                if budget_reached(text_parts):
+                    break
+        return text_parts
+
+    def extract_page(self, reader: Any, index: int) -> str:
+        """
+        Extract one page
+
+        Args:
+            reader: Open PdfReader
+            index: Page index
+
+        Returns:
+            Page text, empty if the page has none
+        """
+        if not self.layout:
+            return reader.pages[index].extract_text() or ""
+        text = reader.pages[index].extract_text(extraction_mode="layout") or ""
+        # Layout mode pads lines to their x position; trailing padding is noise
+        return "\n".join(line.rstrip() for line in text.splitlines()).strip("\n")
+
+
+class PdfminerEngine(PdfEngine):
+    """
+    pdfminer.six text extraction (optional dependency)
+
+    Decodes CID and custom-encoded fonts through their CMaps and groups
+    characters into lines by geometry, which recovers text pypdf returns
+    garbled or empty for.
+    """
+
+    name = "pdfminer"
+    family = "pdfminer"
+
+    def available(self) -> bool:
+        return importlib.util.find_spec("pdfminer") is not None
+
+    def extract_pages(self, document: PdfDocument, page_count: int, budget_reached: BudgetCheck) -> List[str]:
+        from pdfminer.high_level import extract_pages
+        from pdfminer.layout import LTTextContainer
+
+        text_parts = []
+        for page_layout in extract_pages(document.rewind(), maxpages=page_count):
+            text = "".join(
+                element.get_text() for element in page_layout if isinstance(element, LTTextContainer)
+            ).strip()
+            if text:
+                text_parts.append(text)
+                if budget_reached(text_parts):
+                    break
+        return text_parts
+
+
+# Engines by name, in fallback order
+PDF_ENGINES: Dict[str, PdfEngine] = {}
+
+
+def register_pdf_engine(engine: PdfEngine) -> None:
+    """
+    Add an engine to the registry (replacing one of the same name)
+
+    Args:
+        engine: Engine instance
+    """
+    PDF_ENGINES[engine.name] = engine
+
+
+def available_pdf_engines() -> List[str]:
+    """Names of registered engines whose dependencies are installed"""
+    return [name for name, engine in PDF_ENGINES.items() if engine.available()]
+
+
+register_pdf_engine(PypdfEngine("pypdf"))
+register_pdf_engine(PypdfEngine("pypdf-layout", layout=True))
+register_pdf_engine(PdfminerEngine())
+
+
+@dataclass
+class PdfProbe:
+    """What automatic selection looks at"""
+    pages: int
+    complex_fonts: int
+    chars: int
+    seconds: float
+    garbled_ratio: float
+    long_token_ratio: float
+
+
+def probe_pdf(document: PdfDocument, page_count: int) -> PdfProbe:
+    """
+    Inspect fonts and extract page 1 with plain pypdf
+
+    Args:
+        document: Open document; probe_text is set as a side effect
+        page_count: Pages that will be extracted
+
+    Returns:
+        PdfProbe
+    """
+    started = time.perf_counter()
+    try:
+        text = (document.reader.pages[0].extract_text() or "") if page_count else ""
+    except Exception as e:
+        logger.warning(f"PDF probe extraction failed: {str(e)}")
+        text = ""
+    else:
+        document.probe_text = text
+    seconds = time.perf_counter() - started
+
+    stripped = text.strip()
+    garbled = stripped.count("(cid:") + stripped.count("\ufffd") + sum(
+        1 for char in stripped if ord(char) < 32 and char not in "\n\r\t"
+    )
+    tokens = stripped.split()
+    return PdfProbe(
+        pages=page_count,
+        complex_fonts=_count_complex_fonts(document.reader, min(page_count, FONT_SCAN_PAGES)),
+        chars=len(stripped),
+        seconds=seconds,
+        garbled_ratio=garbled / len(stripped) if stripped else 0.0,
+        long_token_ratio=(
+            sum(1 for token in tokens if len(token) >= LONG_TOKEN_CHARS) / len(tokens) if tokens else 0.0
+        ),
+    )
+
+
+def choose_pdf_engine(probe: PdfProbe, candidates: List[str]) -> Tuple[str, str]:
+    """
+    Pick the engine for a document
+
+    Text that plain pypdf cannot decode (no text, garbled characters, Type3
+    or CID fonts without a ToUnicode map) goes to pdfminer, as does a page 1
+    that takes plain pypdf unusually long. Run-together words on short
+    documents go to layout mode. Everything else, including every long
+    document, stays on plain pypdf.
+
+    Args:
+        probe: Result of probe_pdf
+        candidates: Available engine names
+
+    Returns:
+        Tuple of (engine name, reason)
+    """
+    if "pdfminer" in candidates:
+        if probe.chars < MIN_PROBE_CHARS:
+            return "pdfminer", "no_text"
+        if probe.garbled_ratio > MAX_GARBLED_RATIO:
+            return "pdfminer", "garbled_text"
+        if probe.complex_fonts:
+            return "pdfminer", "complex_fonts"
+        if probe.seconds > SLOW_PAGE_SECONDS:
+            return "pdfminer", "slow_pypdf"
+    if (
+        "pypdf-layout" in candidates
+        and probe.pages <= LAYOUT_MAX_PAGES
+        and probe.long_token_ratio > MIN_LONG_TOKEN_RATIO
+    ):
+        return "pypdf-layout", "missing_spaces"
+    return "pypdf", "default"
+
+
+def _count_complex_fonts(reader: Any, pages: int) -> int:
+    """
+    Count fonts plain pypdf is likely to decode badly
+
+    These are Type3 fonts, and composite (Type0) or custom-encoded fonts
+    without a ToUnicode map.
+    """
+    count = 0
+    for index in range(pages):
+        try:
+            resources = reader.pages[index].get("/Resources")
+            fonts = resources.get_object().get("/Font") if resources else None
+            if not fonts:
+                continue
+            for reference in fonts.get_object().values():
+                font = reference.get_object()
+                if "/ToUnicode" in font:
+                    continue
+                encoding = font.get("/Encoding")
+                encoding = encoding.get_object() if encoding is not None else None
+                custom_encoding = isinstance(encoding, dict) and "/Differences" in encoding
+                if font.get("/Subtype") in ("/Type3", "/Type0") or custom_encoding:
+                    count += 1
+        except Exception as e:
+            logger.debug(f"Could not inspect PDF fonts on page {index + 1}: {str(e)}")
+    return count
@@ -0,0 +1,415 @@
+"""
+Profiler Service
+Opt-in per-request call profiles and allocation statistics, kept in a bounded
+on-disk ring buffer
+"""
+
+import asyncio
+import cProfile
+import gc
+import hmac
+import json
+import logging
+import marshal
+import os
+import pstats
+import re
+import threading
+import time
+import tracemalloc
+import uuid
+from contextlib import asynccontextmanager, contextmanager, nullcontext
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Functions kept per stage in the JSON summary (the .prof files have all of them)
+TOP_FUNCTIONS = 40
+TOP_CALLERS = 3
+TOP_ALLOCATION_SITES = 20
+PROFILE_ID_RE = re.compile(r"^[0-9a-f]{32}$")
+
+# Profile of the request being handled, if it asked for one
+current_profile: ContextVar[Optional["RequestProfile"]] = ContextVar("current_profile", default=None)
+
+
+def _allocation_summary(before: tracemalloc.Snapshot, after: tracemalloc.Snapshot,
+                        peak: int, collections: int) -> Dict[str, Any]:
+    """Net allocations between two snapshots, by source line"""
+    differences = after.compare_to(before, "lineno")
+    top = sorted(differences, key=lambda stat: stat.size_diff, reverse=True)[:TOP_ALLOCATION_SITES]
+    return {
+        "peak_kb": round(peak / 1024, 1),
+        "net_kb": round(sum(stat.size_diff for stat in differences) / 1024, 1),
+        "net_blocks": sum(stat.count_diff for stat in differences),
+        "gc_collections": collections,
+        "top_sites": [
+            {
+                "site": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+                "net_kb": round(stat.size_diff / 1024, 1),
+                "net_blocks": stat.count_diff,
+            }
+            for stat in top if stat.size_diff > 0
+        ],
+    }
+
+
+@contextmanager
+def _sampled(result: Dict[str, Any]) -> Iterator[None]:
+    """Run a block under cProfile and tracemalloc, storing stats, allocations and wall time in result"""
+    started_tracing = not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    before = tracemalloc.take_snapshot()
+    collections = sum(stat["collections"] for stat in gc.get_stats())
+    profiler = cProfile.Profile()
+    started = time.perf_counter()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        result["wall_ms"] = round((time.perf_counter() - started) * 1000, 2)
+        _, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+        if started_tracing:
+            tracemalloc.stop()
+        profiler.create_stats()
+        # Same format as Profile.dump_stats, so the bytes load with pstats
+        result["stats"] = marshal.dumps(profiler.stats)
+        result["allocations"] = _allocation_summary(
+            before, after, peak, sum(stat["collections"] for stat in gc.get_stats()) - collections
+        )
+
+
+def profile_call(func: Callable[..., Any], *args: Any) -> Tuple[Any, Dict[str, Any]]:
+    """
+    Call a function under the profiler
+
+    Module-level so it can be submitted to process pools. In a thread pool,
+    allocations of other threads running at the same time are counted too.
+
+    Args:
+        func: Function to call
+        *args: Positional arguments
+
+    Returns:
+        Tuple of (function result, sample with stats, allocations and wall_ms)
+    """
+    sample: Dict[str, Any] = {}
+    with _sampled(sample):
+        result = func(*args)
+    return result, sample
+
+
+def profile_stage(name: str):
+    """
+    Profile a synchronous block as a stage of the current request's profile
+
+    Must not contain awaits: other requests' work would be sampled too.
+    A no-op unless the request asked for a profile.
+
+    Args:
+        name: Stage name
+    """
+    profile = current_profile.get()
+    return profile.stage(name) if profile else nullcontext()
+
+
+class RequestProfile:
+    """Stages sampled for one request"""
+
+    def __init__(self, label: str):
+        """
+        Initialize an empty profile
+
+        Args:
+            label: Description of the request (method and path)
+        """
+        self.id = uuid.uuid4().hex
+        self.label = label
+        self.created_at = time.time()
+        self.stages: List[Tuple[str, Dict[str, Any]]] = []
+        self.details: Dict[str, Any] = {}
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Sample a synchronous block in this thread"""
+        sample: Dict[str, Any] = {}
+        try:
+            with _sampled(sample):
+                yield
+        finally:
+            self.add(name, sample)
+
+    def add(self, name: str, sample: Dict[str, Any]) -> None:
+        """
+        Record a sample taken elsewhere (e.g. by profile_call in a worker)
+
+        Args:
+            name: Stage name; repeats get a numeric suffix
+            sample: Output of profile_call
+        """
+        taken = sum(1 for stage, _ in self.stages if stage == name or stage.startswith(f"{name}."))
+        self.stages.append((f"{name}.{taken}" if taken else name, sample))
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Build the JSON summary: per stage, the slowest functions by cumulative
+        time with their main callers, and the allocation statistics
+
+        Returns:
+            Profile summary dictionary
+        """
+        stages = {}
+        for name, sample in self.stages:
+            stats = pstats.Stats(_MarshalledStats(sample["stats"]))
+            ranked = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)[:TOP_FUNCTIONS]
+            stages[name] = {
+                "wall_ms": sample["wall_ms"],
+                "functions": [
+                    {
+                        "function": pstats.func_std_string(function),
+                        "calls": calls,
+                        "self_ms": round(self_time * 1000, 3),
+                        "cumulative_ms": round(cumulative * 1000, 3),
+                        "callers": [
+                            pstats.func_std_string(caller)
+                            for caller, timing in sorted(
+                                callers.items(), key=lambda item: item[1][3], reverse=True
+                            )[:TOP_CALLERS]
+                        ],
+                    }
+                    for function, (_, calls, self_time, cumulative, callers) in ranked
+                ],
+                "allocations": sample["allocations"],
+            }
+        return {
+            "id": self.id,
+            "label": self.label,
+            "created_at": self.created_at,
+            **self.details,
+            "stages": stages,
+        }
+
+
+class _MarshalledStats:
+    """Adapter letting pstats.Stats load stats marshalled by another process"""
+
+    def __init__(self, data: bytes):
+        self.stats = marshal.loads(data)
+
+    def create_stats(self) -> None:
+        pass
+
+
+class ProfileStore:
+    """
+    Bounded directory of saved profiles
+
+    Each profile is a JSON summary plus one .prof file per stage (loadable
+    with pstats or snakeviz). Once more than max_profiles are stored, the
+    oldest are deleted.
+    """
+
+    def __init__(self, directory: str, max_profiles: int = 50):
+        """
+        Initialize the store, creating the directory if needed
+
+        Args:
+            directory: Directory for profile files
+            max_profiles: Profiles kept before the oldest are deleted
+        """
+        self.directory = directory
+        self.max_profiles = max_profiles
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def save(self, profile: RequestProfile) -> Dict[str, Any]:
+        """
+        Write a profile and evict the oldest beyond max_profiles
+
+        Args:
+            profile: Finished request profile
+
+        Returns:
+            The saved summary
+        """
+        summary = profile.summary()
+        with self._lock:
+            for name, sample in profile.stages:
+                with open(self._path(profile.id, f"{name}.prof"), "wb") as f:
+                    f.write(sample["stats"])
+            with open(self._path(profile.id, "json"), "w", encoding="utf-8") as f:
+                json.dump(summary, f)
+            self._evict()
+        return summary
+
+    def load(self, profile_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Read a saved summary
+
+        Args:
+            profile_id: Profile ID
+
+        Returns:
+            Summary, or None if unknown or evicted
+        """
+        if not PROFILE_ID_RE.match(profile_id):
+            return None
+        try:
+            with open(self._path(profile_id, "json"), encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def stats_path(self, profile_id: str, stage: str) -> Optional[str]:
+        """
+        Path of a stage's .prof file
+
+        Args:
+            profile_id: Profile ID
+            stage: Stage name from the summary
+
+        Returns:
+            File path, or None if it does not exist
+        """
+        if not PROFILE_ID_RE.match(profile_id) or not re.match(r"^[a-z_]+(\.\d+)?$", stage):
+            return None
+        path = self._path(profile_id, f"{stage}.prof")
+        return path if os.path.exists(path) else None
+
+    def list(self) -> List[Dict[str, Any]]:
+        """
+        List saved profiles, newest first
+
+        Returns:
+            ID, label and creation time of each profile
+        """
+        profiles = []
+        for profile_id in self._ids_oldest_first()[::-1]:
+            summary = self.load(profile_id)
+            if summary:
+                profiles.append({key: summary.get(key) for key in ("id", "label", "created_at", "status_code",
+                                                                   "wall_ms")})
+        return profiles
+
+    def _path(self, profile_id: str, suffix: str) -> str:
+        return os.path.join(self.directory, f"{profile_id}.{suffix}")
+
+    def _ids_oldest_first(self) -> List[str]:
+        entries = []
+        for filename in os.listdir(self.directory):
+            profile_id, _, extension = filename.partition(".")
+            if extension == "json" and PROFILE_ID_RE.match(profile_id):
+                try:
+                    entries.append((os.path.getmtime(os.path.join(self.directory, filename)), profile_id))
+                except FileNotFoundError:
+                    continue
+        return [profile_id for _, profile_id in sorted(entries)]
+
+    def _evict(self) -> None:
+        """Delete the oldest profiles beyond max_profiles (lock held)"""
+        ids = self._ids_oldest_first()
+        for profile_id in ids[:max(0, len(ids) - self.max_profiles)]:
+            for filename in os.listdir(self.directory):
+                if filename.startswith(f"{profile_id}."):
+                    try:
+                        os.remove(os.path.join(self.directory, filename))
+                    except FileNotFoundError:
+                        pass
+
+
+class Profiler:
+    """
+    Decides which requests are profiled and runs one profile at a time
+
+    A request is profiled when its X-Profile header equals the token, which
+    also guards reading saved profiles. The token is never read from the
+    query string, where it would end up in access logs and browser history.
+    tracemalloc is process-wide, so while one request is profiled the
+    others run unprofiled.
+    """
+
+    HEADER = b"x-profile"
+
+    def __init__(self, store: ProfileStore, token: str):
+        """
+        Initialize the profiler
+
+        Args:
+            store: Where finished profiles are written
+            token: Value requests must send to be profiled or to read profiles
+
+        Raises:
+            ValueError: If the token is empty
+        """
+        if not token:
+            raise ValueError("A profiling token is required")
+        self.store = store
+        self.token = token
+        self._busy = threading.Lock()
+        self._counters = {"profiled": 0, "skipped_busy": 0}
+
+    def requested(self, header_value: Optional[str]) -> bool:
+        """
+        Whether a request asks for (and may have) a profile
+
+        Args:
+            header_value: X-Profile header, if sent
+
+        Returns:
+            True if the request should be profiled
+        """
+        return self.authorized(header_value)
+
+    def authorized(self, value: Optional[str]) -> bool:
+        """Whether an X-Profile header value matches the token"""
+        return value is not None and hmac.compare_digest(value.encode(), self.token.encode())
+
+    @asynccontextmanager
+    async def begin(self, label: str) -> AsyncIterator[Optional[RequestProfile]]:
+        """
+        Profile the block's request, or yield None if another profile is running
+
+        The profile is saved in a worker thread: summarising the stats and
+        writing the files would otherwise block the event loop.
+
+        Args:
+            label: Description of the request
+
+        Yields:
+            The RequestProfile (also set as current_profile), or None
+        """
+        if not self._busy.acquire(blocking=False):
+            self._counters["skipped_busy"] += 1
+            yield None
+            return
+
+        profile = RequestProfile(label)
+        token = current_profile.set(profile)
+        try:
+            yield profile
+        finally:
+            current_profile.reset(token)
+            self._busy.release()
+            self._counters["profiled"] += 1
+            try:
+                await asyncio.to_thread(self.store.save, profile)
+            except OSError as e:
+                logger.warning(f"Could not save profile {profile.id}: {str(e)}")
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return profiling counters
+
+        Returns:
+            Dictionary of profiler statistics
+        """
+        return {
+            **self._counters,
+            "directory": self.store.directory,
+            "max_profiles": self.store.max_profiles,
+        }
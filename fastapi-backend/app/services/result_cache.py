@@ -0,0 +1,266 @@
+"""
+Result Cache Service
+Content-addressed cache for parsed text and structured resume data
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class ResultCache:
+    """
+    Two-tier cache keyed by a hash of the uploaded bytes.
+
+    The in-process tier is an LRU bounded by entry count and total size.
+    The optional on-disk tier stores one JSON file per entry and is pruned
+    oldest-first once it grows past its size limit. Both tiers honour the TTL.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttl_seconds: float = 3600,
+        disk_dir: Optional[str] = None,
+        disk_max_bytes: int = 512 * 1024 * 1024,
+    ):
+        """
+        Initialize the cache
+
+        Args:
+            max_entries: Maximum number of entries kept in memory
+            max_bytes: Maximum total size of values kept in memory
+            ttl_seconds: Time-to-live for every entry, in seconds
+            disk_dir: Directory for the on-disk tier (disabled when None)
+            disk_max_bytes: Maximum total size of the on-disk tier
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.disk_dir = disk_dir
+        self.disk_max_bytes = disk_max_bytes
+
+        self._entries: "OrderedDict[str, Tuple[float, str, int]]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self._counters = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "expirations": 0,
+        }
+
+        self._disk_size = 0
+        if self.disk_dir:
+            os.makedirs(self.disk_dir, exist_ok=True)
+            self._disk_size = sum(size for _, size, _ in self._disk_files())
+
+    @staticmethod
+    def content_key(content: bytes) -> str:
+        """
+        Compute the cache key for uploaded file bytes
+
+        Args:
+            content: Raw file bytes
+
+        Returns:
+            Hex digest identifying the content
+        """
+        return hashlib.sha256(content).hexdigest()
+
+    def get(self, namespace: str, key: str) -> Optional[str]:
+        """
+        Look up a cached value, promoting disk hits into memory
+
+        Args:
+            namespace: Kind of value (e.g. "parse", "structure")
+            key: Content key from content_key()
+
+        Returns:
+            Cached value or None on miss
+        """
+        entry_key = f"{namespace}:{key}"
+        now = time.time()
+
+        with self._lock:
+            entry = self._entries.get(entry_key)
+            if entry is not None:
+                expires_at, value, _ = entry
+                if expires_at > now:
+                    self._entries.move_to_end(entry_key)
+                    self._counters["memory_hits"] += 1
+                    return value
+                self._remove(entry_key)
+                self._counters["expirations"] += 1
+
+        disk_entry = self._disk_get(namespace, key, now)
+        with self._lock:
+            if disk_entry is None:
+                self._counters["misses"] += 1
+                return None
+            self._counters["disk_hits"] += 1
+            expires_at, value = disk_entry
+            self._store(entry_key, value, expires_at)
+            return value
+
+    def set(self, namespace: str, key: str, value: str) -> None:
+        """
+        Store a value in memory and, when enabled, on disk
+
+        Args:
+            namespace: Kind of value (e.g. "parse", "structure")
+            key: Content key from content_key()
+            value: Serialized value to cache
+        """
+        expires_at = time.time() + self.ttl_seconds
+        with self._lock:
+            self._store(f"{namespace}:{key}", value, expires_at)
+        self._disk_set(namespace, key, value, expires_at)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return hit/miss counters and current occupancy
+
+        Returns:
+            Dictionary of cache statistics
+        """
+        with self._lock:
+            hits = self._counters["memory_hits"] + self._counters["disk_hits"]
+            lookups = hits + self._counters["misses"]
+            return {
+                **self._counters,
+                "hits": hits,
+                "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+                "entries": len(self._entries),
+                "bytes": self._size,
+                "disk_enabled": bool(self.disk_dir),
+                "disk_bytes": self._disk_size,
+            }
+
+    def _store(self, entry_key: str, value: str, expires_at: float) -> None:
+        """Insert into the memory tier and evict down to the limits (lock held)"""
+        size = len(value.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+
+        if entry_key in self._entries:
+            self._remove(entry_key)
+
+        self._entries[entry_key] = (expires_at, value, size)
+        self._size += size
+
+        while len(self._entries) > self.max_entries or self._size > self.max_bytes:
+            oldest_key = next(iter(self._entries))
+            self._remove(oldest_key)
+            self._counters["evictions"] += 1
+
+    def _remove(self, entry_key: str) -> None:
+        """Drop an entry from the memory tier (lock held)"""
+        _, _, size = self._entries.pop(entry_key)
+        self._size -= size
+
+    def _disk_path(self, namespace: str, key: str) -> str:
+        return os.path.join(self.disk_dir, namespace, key[:2], f"{key}.json")
+
+    def _disk_get(self, namespace: str, key: str, now: float) -> Optional[Tuple[float, str]]:
+        """Read an entry from the on-disk tier, deleting it if expired"""
+        if not self.disk_dir:
+            return None
+
+        path = self._disk_path(namespace, key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                payload = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Discarding unreadable cache file {path}: {str(e)}")
+            self._disk_unlink(path)
+            return None
+
+        if payload.get("expires_at", 0) <= now:
+            self._disk_unlink(path)
+            with self._lock:
+                self._counters["expirations"] += 1
+            return None
+
+        return payload["expires_at"], payload["value"]
+
+    def _disk_set(self, namespace: str, key: str, value: str, expires_at: float) -> None:
+        """Write an entry to the on-disk tier atomically"""
+        if not self.disk_dir:
+            return
+
+        path = self._disk_path(namespace, key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"expires_at": expires_at, "value": value}, f)
+            written = os.path.getsize(tmp_path)
+            replaced = os.path.getsize(path) if os.path.exists(path) else 0
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Failed to write cache file {path}: {str(e)}")
+            self._disk_unlink(tmp_path)
+            return
+
+        with self._lock:
+            self._disk_size += written - replaced
+            over_limit = self._disk_size > self.disk_max_bytes
+
+        if over_limit:
+            self._disk_prune()
+
+    def _disk_files(self):
+        """Yield (mtime, size, path) for every entry file in the on-disk tier"""
+        for root, _, names in os.walk(self.disk_dir):
+            for name in names:
+                if not name.endswith(".json"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                yield st.st_mtime, st.st_size, path
+
+    def _disk_prune(self) -> None:
+        """Delete the oldest files until the on-disk tier is under its size limit"""
+        now = time.time()
+        files = sorted(self._disk_files())
+        total = sum(size for _, size, _ in files)
+
+        for mtime, size, path in files:
+            if total <= self.disk_max_bytes:
+                break
+            self._disk_unlink(path)
+            total -= size
+            with self._lock:
+                if mtime + self.ttl_seconds <= now:
+                    self._counters["expirations"] += 1
+                else:
+                    self._counters["evictions"] += 1
+
+        with self._lock:
+            self._disk_size = total
+
+    def _disk_unlink(self, path: str) -> None:
+        """Remove a cache file, keeping the disk size counter in step"""
+        try:
+            size = os.path.getsize(path)
+            os.remove(path)
+        except OSError:
+            return
+        if path.endswith(".json"):
+            with self._lock:
+                self._disk_size -= size
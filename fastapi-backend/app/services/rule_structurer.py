@@ -0,0 +1,268 @@
+"""
+Rule-Based Structurer Service
+Deterministic extraction of contact fields and section boundaries from resume text
+"""
+
+import logging
+import re
+from typing import Dict, List, Optional
+
+from app.models.schemas import PersonalInfo, StructuredResumeData
+
+logger = logging.getLogger(__name__)
+
+EMAIL_RE = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
+PHONE_RE = re.compile(r"(?<![\w/])(?:\+?\d{1,3}[\s.-]?)?(?:\(\d{2,4}\)|\d{2,4})[\s.-]?\d{3,4}[\s.-]?\d{3,4}(?![\w/])")
+LINKEDIN_RE = re.compile(r"(?:https?://)?(?:[a-z]{2,3}\.)?linkedin\.com/(?:in|pub)/[A-Za-z0-9_%-]+/?", re.IGNORECASE)
+GITHUB_RE = re.compile(r"(?:https?://)?(?:www\.)?github\.com/[A-Za-z0-9_-]+(?![A-Za-z0-9_/-])", re.IGNORECASE)
+_DOMAIN = r"[A-Za-z0-9-]+(?:\.[A-Za-z0-9-]+)*\.(?:dev|io|com|me|net|org|app|co|site|tech|xyz)(?![A-Za-z0-9-])"
+# Words like "ASP.NET" or "Acme.io" look like domains, so a URL needs a
+# scheme, "www." or a path; a bare domain only counts as a contact entry of
+# its own (alone on its line or between separators such as "|" or ",")
+URL_RE = re.compile(
+    r"(?:https?://|www\.)(?:www\.)?" + _DOMAIN + r"(?:/[^\s|,;]*)?"
+    r"|" + _DOMAIN + r"/[^\s|,;]*"
+    r"|(?:^|(?<=[|•·,;]))[ \t]*" + _DOMAIN + r"[ \t]*(?=$|[|•·,;])",
+    re.IGNORECASE | re.MULTILINE,
+)
+LOCATION_RE = re.compile(r"\b([A-Z][a-zA-Z.]+(?:\s[A-Z][a-zA-Z.]+)*,\s(?:[A-Z]{2}|[A-Z][a-z]+(?:\s[A-Z][a-z]+)*))\b")
+NAME_RE = re.compile(r"^[A-Z][A-Za-z'.-]+(?:\s+[A-Z][A-Za-z'.-]+){1,3}$")
+CONTACT_SEPARATORS_RE = re.compile(r"^[\s|•·,;:/-]*$")
+INLINE_SEPARATORS_RE = re.compile(r"\s*[|•·](?:\s*[|•·])*\s*")
+LIST_SPLIT_RE = re.compile(r"\s*(?:,|;|\||•|·|\n|\t|\s-\s)\s*")
+BULLET_RE = re.compile(r"^\s*(?:[-*•·▪●◦]|\d+[.)])\s*")
+
+# Canonical section name -> headings that introduce it
+SECTION_HEADINGS: Dict[str, List[str]] = {
+    "summary": ["summary", "professional summary", "profile", "professional profile", "objective",
+                "career objective", "about", "about me"],
+    "experience": ["experience", "work experience", "professional experience", "employment",
+                   "employment history", "work history", "career history"],
+    "education": ["education", "academic background", "education and training", "academics"],
+    "skills": ["skills", "technical skills", "core competencies", "competencies", "key skills",
+               "skills and technologies", "technologies"],
+    "certifications": ["certifications", "certificates", "licenses and certifications",
+                       "licenses & certifications", "certifications and licenses"],
+    "projects": ["projects", "personal projects", "selected projects", "key projects"],
+    "languages": ["languages", "spoken languages"],
+    "volunteer": ["volunteer", "volunteer work", "volunteer experience", "volunteering",
+                  "community involvement"],
+    "awards": ["awards", "honors", "honors and awards", "achievements"],
+}
+
+_HEADING_LOOKUP = {
+    heading: section for section, headings in SECTION_HEADINGS.items() for heading in headings
+}
+HEADING_RE = re.compile(
+    r"^\s*(" + "|".join(sorted((re.escape(h) for h in _HEADING_LOOKUP), key=len, reverse=True)) + r")\s*:?\s*$",
+    re.IGNORECASE,
+)
+
+
+class RuleBasedStructurer:
+    """
+    Fast, deterministic pre-structuring stage
+
+    Pulls contact details out of the resume header with compiled regexes and
+    splits the text into labelled sections by heading detection. The result
+    is a partially filled StructuredResumeData that is available in
+    milliseconds, and a smaller text for the AI prompt.
+    """
+
+    def split_sections(self, raw_text: str) -> Dict[str, str]:
+        """
+        Split resume text into labelled sections
+
+        Text before the first recognised heading is returned as "header".
+        Repeated headings are concatenated under the same label.
+
+        Args:
+            raw_text: Raw extracted text from resume
+
+        Returns:
+            Mapping of section label to section text, in document order
+        """
+        sections: Dict[str, List[str]] = {"header": []}
+        current = "header"
+
+        for line in raw_text.splitlines():
+            match = HEADING_RE.match(line)
+            if match:
+                current = _HEADING_LOOKUP[match.group(1).lower()]
+                sections.setdefault(current, [])
+                continue
+            sections[current].append(line)
+
+        return {
+            label: "\n".join(lines).strip()
+            for label, lines in sections.items()
+            if any(line.strip() for line in lines)
+        }
+
+    def extract_personal_info(self, raw_text: str, header: Optional[str] = None) -> PersonalInfo:
+        """
+        Extract contact fields from the resume header
+
+        Args:
+            raw_text: Raw extracted text from resume
+            header: Pre-split header section (derived from raw_text when None)
+
+        Returns:
+            PersonalInfo with the fields that could be found
+        """
+        if header is None:
+            header = self.split_sections(raw_text).get("header", "")
+
+        # Contacts usually sit in the header but fall back to the whole text
+        search_text = header or raw_text
+
+        linkedin = self._first(LINKEDIN_RE, search_text) or self._first(LINKEDIN_RE, raw_text)
+        github = self._first(GITHUB_RE, search_text) or self._first(GITHUB_RE, raw_text)
+        email = self._first(EMAIL_RE, search_text) or self._first(EMAIL_RE, raw_text)
+
+        return PersonalInfo(
+            full_name=self._find_name(header),
+            email=email,
+            phone=self._first(PHONE_RE, search_text),
+            location=self._first(LOCATION_RE, header),
+            linkedin=self._strip_scheme(linkedin),
+            github=self._strip_scheme(github),
+            portfolio=self._find_portfolio(search_text, email),
+        )
+
+    def structure(self, raw_text: str) -> StructuredResumeData:
+        """
+        Build a partially filled StructuredResumeData without calling an LLM
+
+        Args:
+            raw_text: Raw extracted text from resume
+
+        Returns:
+            StructuredResumeData with personal info, summary and list sections
+        """
+        sections = self.split_sections(raw_text)
+
+        summary = sections.get("summary")
+        return StructuredResumeData(
+            personal_info=self.extract_personal_info(raw_text, sections.get("header", "")),
+            professional_summary=" ".join(summary.split()) if summary else None,
+            skills=self._split_list(sections.get("skills", ""), strip_labels=True),
+            certifications=self._split_lines(sections.get("certifications", "")),
+            languages=self._split_list(sections.get("languages", "")),
+        )
+
+    def strip_contact_lines(self, raw_text: str) -> str:
+        """
+        Remove contact details from the resume header
+
+        Those fields are filled deterministically, so sending them to Claude
+        only costs prompt tokens. Lines holding nothing but contacts are
+        dropped; inline contact lists keep their other entries (e.g. location).
+
+        Args:
+            raw_text: Raw extracted text from resume
+
+        Returns:
+            Text without contact details in the header
+        """
+        sections = self.split_sections(raw_text)
+        header_lines = set(sections.get("header", "").splitlines())
+
+        kept = []
+        for line in raw_text.splitlines():
+            if line not in header_lines or not line.strip():
+                kept.append(line)
+                continue
+
+            remainder = line
+            for pattern in (EMAIL_RE, LINKEDIN_RE, GITHUB_RE, URL_RE, PHONE_RE):
+                remainder = pattern.sub("", remainder)
+
+            if remainder == line:
+                kept.append(line)
+            elif not CONTACT_SEPARATORS_RE.match(remainder):
+                kept.append(INLINE_SEPARATORS_RE.sub(" | ", remainder).strip(" |•·"))
+        return "\n".join(kept)
+
+    def merge_personal_info(self, ai_info: Optional[PersonalInfo], rule_info: PersonalInfo) -> PersonalInfo:
+        """
+        Combine AI and rule-based personal info
+
+        Regex matches are exact for contact fields, so they win; the AI result
+        is preferred for name and location, which need judgement.
+
+        Args:
+            ai_info: Personal info returned by Claude (may be None)
+            rule_info: Personal info extracted by rules
+
+        Returns:
+            Merged PersonalInfo
+        """
+        ai_data = ai_info.model_dump() if ai_info else {}
+        merged = {}
+        for field, rule_value in rule_info.model_dump().items():
+            ai_value = ai_data.get(field)
+            if field in ("full_name", "location"):
+                merged[field] = ai_value or rule_value
+            else:
+                merged[field] = rule_value or ai_value
+        return PersonalInfo(**merged)
+
+    @staticmethod
+    def _first(pattern: re.Pattern, text: str) -> Optional[str]:
+        match = pattern.search(text)
+        return match.group(0).strip().rstrip("/") if match else None
+
+    @staticmethod
+    def _strip_scheme(url: Optional[str]) -> Optional[str]:
+        if not url:
+            return None
+        return re.sub(r"^(?:https?://)?(?:www\.)?", "", url)
+
+    def _find_name(self, header: str) -> Optional[str]:
+        """Take the first short, capitalised header line without contact details"""
+        for line in header.splitlines()[:5]:
+            candidate = line.strip()
+            if not candidate or "@" in candidate or any(ch.isdigit() for ch in candidate):
+                continue
+            if NAME_RE.match(candidate):
+                return candidate
+        return None
+
+    def _find_portfolio(self, text: str, email: Optional[str]) -> Optional[str]:
+        """First URL that is neither LinkedIn, GitHub nor the email domain"""
+        email_domain = email.split("@", 1)[1].lower() if email else None
+        for match in URL_RE.finditer(text):
+            url = match.group(0).strip().rstrip("/.,")
+            lowered = url.lower()
+            if "linkedin.com" in lowered or "github.com" in lowered:
+                continue
+            # Skip the domain part of an email address
+            if match.start() > 0 and text[match.start() - 1] == "@":
+                continue
+            if email_domain and lowered == email_domain:
+                continue
+            return self._strip_scheme(url)
+        return None
+
+    @staticmethod
+    def _split_list(section: str, strip_labels: bool = False) -> List[str]:
+        """Split a comma/bullet/line separated section into unique items"""
+        items: List[str] = []
+        seen = set()
+        for line in section.splitlines():
+            line = BULLET_RE.sub("", line)
+            # "Frontend: React, Vue" -> "React, Vue"
+            if strip_labels and ":" in line:
+                line = line.split(":", 1)[1]
+            for item in LIST_SPLIT_RE.split(line):
+                item = item.strip(" .")
+                if item and item.lower() not in seen:
+                    seen.add(item.lower())
+                    items.append(item)
+        return items
+
+    @staticmethod
+    def _split_lines(section: str) -> List[str]:
+        """One item per non-empty line, with bullets removed"""
+        return [BULLET_RE.sub("", line).strip() for line in section.splitlines() if line.strip()]
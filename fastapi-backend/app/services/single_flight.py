@@ -0,0 +1,97 @@
+"""
+Single-Flight Service
+Coalesces concurrent identical calls into one shared task
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Hashable, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+@dataclass
+class _Flight:
+    task: asyncio.Task
+    waiters: int = 0
+
+
+class SingleFlight:
+    """
+    Runs at most one task per key; concurrent callers with that key share it
+
+    The first caller starts the task and later callers await the same one,
+    so a double-clicked upload or a retry storm costs a single Claude call.
+    Every caller awaits the task through asyncio.shield: one caller being
+    cancelled (e.g. its client disconnected) leaves the task running for
+    the others. When the last caller is cancelled the task is cancelled too,
+    since nobody is left to use its result. A key is forgotten as soon as
+    its task finishes; results are not cached here.
+    """
+
+    def __init__(self):
+        """Initialize with no flights in progress"""
+        self._flights: Dict[Hashable, _Flight] = {}
+        self._counters = {
+            "started": 0,
+            "coalesced": 0,
+            "cancelled": 0,
+        }
+
+    async def run(self, key: Hashable, factory: Callable[[], Awaitable[T]]) -> T:
+        """
+        Await the shared task for a key, starting it if none is in flight
+
+        Args:
+            key: Identity of the work (e.g. content hash and options)
+            factory: Zero-argument callable returning the awaitable to run;
+                only called when no task for the key is in flight
+
+        Returns:
+            The task's result (the same object for every caller)
+
+        Raises:
+            Whatever the shared task raises
+        """
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = _Flight(asyncio.ensure_future(factory()))
+            self._flights[key] = flight
+            flight.task.add_done_callback(lambda _task: self._forget(key, flight))
+            self._counters["started"] += 1
+        else:
+            self._counters["coalesced"] += 1
+            logger.info(f"Joined in-flight task for {key!r} ({flight.waiters} waiting)")
+
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                # Every caller gave up: stop the work and let a new caller start afresh
+                self._forget(key, flight)
+                flight.task.cancel()
+                self._counters["cancelled"] += 1
+                logger.info(f"Cancelled in-flight task for {key!r}: no callers left")
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return coalescing counters and current flights
+
+        Returns:
+            Dictionary of single-flight statistics
+        """
+        return {
+            **self._counters,
+            "in_flight": len(self._flights),
+            "waiters": sum(flight.waiters for flight in self._flights.values()),
+        }
+
+    def _forget(self, key: Hashable, flight: _Flight) -> None:
+        """Drop a key if it still maps to the given flight"""
+        if self._flights.get(key) is flight:
+            del self._flights[key]
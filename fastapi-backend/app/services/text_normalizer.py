@@ -0,0 +1,120 @@
+"""
+Text Normalizer Service
+Removes extraction noise from resume text before it is sent to Claude
+"""
+
+import logging
+import re
+from collections import Counter
+from typing import List
+
+logger = logging.getLogger(__name__)
+
+# Characters that carry no content for the model
+INVISIBLE_RE = re.compile("[\u00ad\u200b\u200c\u200d\u2060\ufeff]")
+LIGATURES = str.maketrans({
+    "\ufb00": "ff", "\ufb01": "fi", "\ufb02": "fl", "\ufb03": "ffi", "\ufb04": "ffl",
+    "\u00a0": " ", "\u2002": " ", "\u2003": " ", "\u2009": " ", "\u202f": " ",
+})
+HYPHEN_BREAK_RE = re.compile(r"([a-z])-\n[ \t]*([a-z])")
+HORIZONTAL_SPACE_RE = re.compile(r"[ \t\r\f\v]+")
+BLANK_LINES_RE = re.compile(r"\n{3,}")
+PAGE_NUMBER_RE = re.compile(r"^\s*(?:page\s+)?\d{1,3}\s*(?:(?:of|/)\s*\d{1,3})?\s*$", re.IGNORECASE)
+DIGITS_RE = re.compile(r"\d+")
+TABLE_SEPARATOR = " | "
+
+
+class TextNormalizer:
+    """
+    Prompt-side cleanup of extracted resume text
+
+    Fixes ligatures and invisible characters, rejoins words hyphenated across
+    line breaks, drops bare page-number lines, de-duplicates the repeated
+    cells that merged DOCX table cells produce in " | " joined rows, and
+    collapses runs of whitespace. The output is only used for the prompt.
+    The raw text returned to clients does not go through it, but it has
+    already lost running PDF headers and footers: strip_running_lines needs
+    page boundaries, so DocumentParser applies it during extraction.
+    """
+
+    def normalize(self, text: str) -> str:
+        """
+        Normalize resume text for the prompt
+
+        Args:
+            text: Raw extracted text
+
+        Returns:
+            Cleaned text
+        """
+        text = INVISIBLE_RE.sub("", text.translate(LIGATURES))
+        text = HYPHEN_BREAK_RE.sub(r"\1\2", text)
+
+        lines = []
+        for line in text.split("\n"):
+            line = HORIZONTAL_SPACE_RE.sub(" ", line).strip()
+            if PAGE_NUMBER_RE.match(line):
+                continue
+            if TABLE_SEPARATOR in line:
+                line = self._dedupe_cells(line)
+            lines.append(line)
+
+        return BLANK_LINES_RE.sub("\n\n", "\n".join(lines)).strip()
+
+    @staticmethod
+    def _dedupe_cells(line: str) -> str:
+        """Collapse consecutive identical cells of a table row"""
+        cells: List[str] = []
+        for cell in line.split(TABLE_SEPARATOR):
+            if not cells or cells[-1] != cell:
+                cells.append(cell)
+        return TABLE_SEPARATOR.join(cells)
+
+
+def strip_running_lines(pages: List[str], min_pages: int = 3, edge_lines: int = 2) -> List[str]:
+    """
+    Remove page headers and footers that repeat across PDF pages
+
+    A line counts as a running header/footer when it is among the first or
+    last edge_lines non-empty lines of at least 60% of the pages. Digits are
+    ignored when comparing, so "Page 2 of 4" matches "Page 3 of 4". The first
+    page is left intact because its header is usually the candidate's name.
+    Called by the PDF extractor, so the change shows in the raw text too.
+
+    Args:
+        pages: Extracted text per page
+        min_pages: Documents with fewer pages are returned unchanged
+        edge_lines: Lines inspected at the top and bottom of each page
+
+    Returns:
+        Page texts with running lines removed
+    """
+    if len(pages) < min_pages:
+        return pages
+
+    def key(line: str) -> str:
+        return DIGITS_RE.sub("#", HORIZONTAL_SPACE_RE.sub(" ", line).strip().lower())
+
+    counts: Counter = Counter()
+    for page in pages:
+        lines = [line for line in page.splitlines() if line.strip()]
+        edges = set(key(line) for line in lines[:edge_lines] + lines[-edge_lines:])
+        counts.update(edges)
+
+    threshold = max(2, int(len(pages) * 0.6 + 0.5))
+    running = {line for line, count in counts.items() if count >= threshold}
+    if not running:
+        return pages
+
+    logger.info(f"Removing {len(running)} running header/footer line(s) from {len(pages)} pages")
+
+    cleaned = [pages[0]]
+    for page in pages[1:]:
+        lines = page.splitlines()
+        non_empty = [index for index, line in enumerate(lines) if line.strip()]
+        edge_indexes = set(non_empty[:edge_lines] + non_empty[-edge_lines:])
+        cleaned.append("\n".join(
+            line for index, line in enumerate(lines)
+            if index not in edge_indexes or key(line) not in running
+        ))
+    return cleaned
@@ -0,0 +1,125 @@
+"""
+Upload Reader Service
+Streams uploaded files in chunks and exposes them to parsers without extra copies
+"""
+
+import hashlib
+import logging
+from typing import BinaryIO, Optional
+
+from fastapi import UploadFile
+from starlette.formparsers import MultiPartParser
+
+logger = logging.getLogger(__name__)
+
+
+class UploadTooLargeError(Exception):
+    """Raised as soon as an upload grows past the configured limit"""
+
+    def __init__(self, max_bytes: int):
+        super().__init__(f"File size exceeds {max_bytes // (1024 * 1024)}MB limit")
+        self.max_bytes = max_bytes
+
+
+class SpooledUpload:
+    """
+    Uploaded file held in Starlette's spool (memory below the spool
+    threshold, an anonymous temp file above it), plus its size and digest.
+
+    open() hands parsers the spool itself, so the upload is never duplicated
+    into a BytesIO.
+    """
+
+    def __init__(self, spool: BinaryIO, size: int, sha256: str, spool_threshold: int):
+        """
+        Wrap a spooled upload
+
+        Args:
+            spool: The upload's file (a SpooledTemporaryFile)
+            size: Bytes read from it
+            sha256: Hex digest of its content
+            spool_threshold: Size above which the spool is (or is made) a temp file
+        """
+        self._spool = spool
+        self.size = size
+        self.sha256 = sha256
+        self.spool_threshold = spool_threshold
+
+    @property
+    def on_disk(self) -> bool:
+        """Whether the upload is large enough to live in a temp file"""
+        return self.size > self.spool_threshold
+
+    def open(self) -> BinaryIO:
+        """
+        Return a seekable view of the upload positioned at the start
+
+        Returns:
+            The spool, rolled over to its temp file when above the threshold
+        """
+        # Starlette rolls over at its own limit; make sure a large upload
+        # is on disk even if that limit is higher than ours
+        if self.on_disk and hasattr(self._spool, "rollover"):
+            self._spool.rollover()
+        self._spool.seek(0)
+        return self._spool
+
+    def read_bytes(self) -> bytes:
+        """
+        Copy the upload into a bytes object (needed to cross a process boundary)
+
+        Returns:
+            Raw file bytes
+        """
+        stream = self.open()
+        data = stream.read()
+        stream.seek(0)
+        return data
+
+
+async def spool_upload(
+    upload: UploadFile,
+    max_bytes: int,
+    chunk_size: int = 256 * 1024,
+    spool_threshold: Optional[int] = None,
+) -> SpooledUpload:
+    """
+    Stream an upload in chunks, hashing it and enforcing the size limit
+
+    Args:
+        upload: FastAPI upload
+        max_bytes: Maximum accepted size in bytes
+        chunk_size: Bytes read per iteration
+        spool_threshold: Size above which the upload is read from a temp
+            file. Starlette's multipart parser has already written anything
+            above its own spool size (MultiPartParser.max_file_size, 1 MB)
+            to disk, so larger thresholds are capped to it (default: that size)
+
+    Returns:
+        SpooledUpload over the upload's spool
+
+    Raises:
+        UploadTooLargeError: As soon as more than max_bytes have been read
+    """
+    if upload.size is not None and upload.size > max_bytes:
+        raise UploadTooLargeError(max_bytes)
+
+    digest = hashlib.sha256()
+    size = 0
+
+    await upload.seek(0)
+    while True:
+        chunk = await upload.read(chunk_size)
+        if not chunk:
+            break
+        size += len(chunk)
+        if size > max_bytes:
+            raise UploadTooLargeError(max_bytes)
+        digest.update(chunk)
+
+    await upload.seek(0)
+    # Read, never assigned: the parser's class attribute is shared by every app in the process
+    if spool_threshold is None or spool_threshold > MultiPartParser.max_file_size:
+        spool_threshold = MultiPartParser.max_file_size
+    return SpooledUpload(upload.file, size, digest.hexdigest(), spool_threshold)
+
@@ -0,0 +1,130 @@
+"""
+Startup Warm-Up Service
+Pre-parses tiny embedded documents and opens the Claude connection pool so the
+first real request does not pay for lazy imports and connection setup
+"""
+
+import asyncio
+import io
+import logging
+import time
+import zipfile
+from typing import Dict, Optional
+
+from app.services.anthropic_client import ResilientAnthropicClient
+from app.services.parse_pool import ParsePool
+
+logger = logging.getLogger(__name__)
+
+# One-page PDF with a Helvetica text stream (same writer as benchmarks/corpus.py)
+WARMUP_PDF = (
+    b"%PDF-1.4\n1 0 obj\n<< /Type /Catalog /Pages 2 0 R >>\nendobj\n"
+    b"2 0 obj\n<< /Type /Pages /Kids [3 0 R] /Count 1 >>\nendobj\n"
+    b"3 0 obj\n<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+    b"/Resources << /Font << /F1 5 0 R >> >> /Contents 4 0 R >>\nendobj\n"
+    b"4 0 obj\n<< /Length 91 >>\nstream\n"
+    b"BT /F1 10 Tf 50 760 Td 13 TL (Warm-up Resume) ' (Jane Doe) ' (Skills: Python, FastAPI) ' ET\n"
+    b"endstream\nendobj\n"
+    b"5 0 obj\n<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>\nendobj\n"
+    b"xref\n0 6\n0000000000 65535 f \n0000000009 00000 n \n0000000058 00000 n \n"
+    b"0000000115 00000 n \n0000000241 00000 n \n0000000382 00000 n \n"
+    b"trailer\n<< /Size 6 /Root 1 0 R >>\nstartxref\n452\n%%EOF\n"
+)
+
+# Smallest package python-docx accepts: content types, root relationship and
+# a document part with one paragraph and a one-row table
+_DOCX_PARTS = {
+    "[Content_Types].xml": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/word/document.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+        '</Types>'
+    ),
+    "_rels/.rels": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+        'Target="word/document.xml"/>'
+        '</Relationships>'
+    ),
+    "word/document.xml": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"><w:body>'
+        '<w:p><w:r><w:t>Warm-up Resume</w:t></w:r></w:p>'
+        '<w:tbl><w:tr>'
+        '<w:tc><w:p><w:r><w:t>Skills</w:t></w:r></w:p></w:tc>'
+        '<w:tc><w:p><w:r><w:t>Python</w:t></w:r></w:p></w:tc>'
+        '</w:tr></w:tbl>'
+        '</w:body></w:document>'
+    ),
+}
+
+
+def warmup_docx() -> bytes:
+    """Build the embedded warm-up DOCX"""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for name, xml in _DOCX_PARTS.items():
+            archive.writestr(name, xml)
+    return buffer.getvalue()
+
+
+class StartupWarmup:
+    """
+    Exercises the cold paths of the pipeline once, before traffic arrives
+
+    Parsing the embedded PDF and DOCX imports pypdf and python-docx and
+    fills their internal caches in every pool worker; warming the Claude
+    client imports the SDK and opens a pooled connection. Failures are
+    logged and never raised: a failed warm-up only means the first request
+    is slower.
+    """
+
+    def __init__(self, parse_pool: ParsePool, anthropic_client: Optional[ResilientAnthropicClient] = None):
+        """
+        Initialize the warm-up
+
+        Args:
+            parse_pool: Pool whose workers should be warmed
+            anthropic_client: Optional Claude client whose connection pool is opened
+        """
+        self.parse_pool = parse_pool
+        self.anthropic_client = anthropic_client
+        self.timings: Dict[str, float] = {}
+
+    async def run(self) -> Dict[str, float]:
+        """
+        Run every warm-up step
+
+        Returns:
+            Step name -> duration in milliseconds
+        """
+        started = time.perf_counter()
+        docx = warmup_docx()
+
+        # Process workers are spawned per submission, so one sample per
+        # worker warms each of them; a thread pool shares one interpreter
+        copies = self.parse_pool.max_workers if self.parse_pool.kind == "process" else 1
+        for step, content, filename in (("pdf", WARMUP_PDF, "warmup.pdf"), ("docx", docx, "warmup.docx")):
+            await self._timed(step, asyncio.gather(*(
+                self.parse_pool.parse(content, filename) for _ in range(copies)
+            )))
+
+        if self.anthropic_client is not None:
+            await self._timed("anthropic", self.anthropic_client.warm_up())
+
+        self.timings["total"] = round((time.perf_counter() - started) * 1000, 2)
+        logger.info(f"Warm-up finished: {self.timings}")
+        return dict(self.timings)
+
+    async def _timed(self, step: str, awaitable) -> None:
+        started = time.perf_counter()
+        try:
+            await awaitable
+        except Exception as e:
+            logger.warning(f"Warm-up step {step} failed: {str(e)}")
+        self.timings[step] = round((time.perf_counter() - started) * 1000, 2)
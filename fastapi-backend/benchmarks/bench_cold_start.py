@@ -0,0 +1,180 @@
+"""
+Cold Start Benchmark
+Measures, in fresh interpreters, how long `import main`, application startup
+and the first and second /api/parse-resume requests take, plus peak RSS
+
+Each run is a new subprocess so import caches never carry over. Claude calls
+go to a local fake Anthropic server (tools/fake_anthropic.py, zero latency),
+so the first request includes the SDK import and connection setup. Every
+WARMUP_MODE under test is run --runs times; medians and maxima are compared
+against a JSON baseline like the pipeline benchmark.
+
+Usage:
+    python -m benchmarks.bench_cold_start [--runs N] [--modes off startup]
+        [--update-baseline] [--fail-on-regression]
+"""
+
+import argparse
+import json
+import os
+import platform
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List
+
+from benchmarks.harness import compare, load_baseline, save_baseline
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "cold_start_baseline.json")
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PHASES = ("import_ms", "startup_ms", "first_request_ms", "second_request_ms")
+
+# Runs in the child interpreter; prints one JSON line of timings
+CHILD = r"""
+import json, logging, resource, time
+logging.disable(logging.WARNING)
+
+started = time.perf_counter()
+import main
+imported = time.perf_counter()
+
+from fastapi.testclient import TestClient
+from benchmarks.corpus import generate_corpus
+
+document = next(d for d in generate_corpus(["small"]) if d.filename.endswith(".pdf"))
+timings = {"import_ms": (imported - started) * 1000}
+
+startup_started = time.perf_counter()
+with TestClient(main.app) as client:
+    timings["startup_ms"] = (time.perf_counter() - startup_started) * 1000
+    for phase in ("first_request_ms", "second_request_ms"):
+        request_started = time.perf_counter()
+        response = client.post(
+            "/api/parse-resume",
+            files={"file": (document.filename, document.content, "application/pdf")},
+        )
+        timings[phase] = (time.perf_counter() - request_started) * 1000
+        if response.status_code != 200:
+            raise SystemExit(f"HTTP {response.status_code}: {response.text[:200]}")
+
+timings["max_rss_kb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps(timings))
+"""
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _start_fake_anthropic(port: int) -> subprocess.Popen:
+    """Start the fake Claude server and wait until it accepts connections"""
+    process = subprocess.Popen(
+        [sys.executable, "-m", "tools.fake_anthropic", "--port", str(port), "--latency-ms", "0"],
+        cwd=ROOT,
+    )
+    deadline = time.monotonic() + 15
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+            return process
+        except OSError:
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError("Fake Anthropic server did not start")
+
+
+def run_once(mode: str, base_url: str) -> Dict[str, float]:
+    """
+    Time one cold start in a fresh interpreter
+
+    Args:
+        mode: WARMUP_MODE for the child
+        base_url: Fake Anthropic server URL
+
+    Returns:
+        Phase name -> milliseconds, plus max_rss_kb
+    """
+    env = {
+        **os.environ,
+        "PYTHONPATH": ROOT,
+        "ANTHROPIC_API_KEY": "fake",
+        "ANTHROPIC_BASE_URL": base_url,
+        "WARMUP_MODE": mode,
+        # Keep the second request honest: no cached result
+        "RESULT_CACHE_ENABLED": "false",
+    }
+    completed = subprocess.run(
+        [sys.executable, "-c", CHILD], cwd=ROOT, env=env, capture_output=True, text=True, timeout=120,
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"Cold start run failed ({mode}): {completed.stderr.strip()[-500:]}")
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def summarize(runs: List[Dict[str, float]]) -> Dict[str, Dict[str, float]]:
+    """
+    Reduce runs to harness-style metrics per phase
+
+    The median is reported as latency_ms_p50 and the slowest run as
+    latency_ms_p99, so harness.compare can check them against a baseline.
+    """
+    summary = {}
+    for phase in PHASES:
+        values = [run[phase] for run in runs]
+        summary[phase] = {
+            "latency_ms_p50": round(statistics.median(values), 2),
+            "latency_ms_p99": round(max(values), 2),
+        }
+    summary["process"] = {"peak_memory_kb": max(run["max_rss_kb"] for run in runs)}
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per mode")
+    parser.add_argument("--modes", nargs="+", choices=["off", "startup", "background"],
+                        default=["off", "startup"], help="WARMUP_MODE values to measure")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline JSON file")
+    parser.add_argument("--update-baseline", action="store_true", help="Write results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative regression")
+    parser.add_argument("--fail-on-regression", action="store_true", help="Exit 1 if anything regressed")
+    args = parser.parse_args()
+
+    port = _free_port()
+    fake = _start_fake_anthropic(port)
+    results: Dict[str, Dict[str, float]] = {}
+    try:
+        for mode in args.modes:
+            runs = [run_once(mode, f"http://127.0.0.1:{port}") for _ in range(args.runs)]
+            for phase, metrics in summarize(runs).items():
+                results[f"cold_start.{mode}.{phase}"] = metrics
+                print(f"{mode:10s} {phase:18s} {metrics}", file=sys.stderr)
+    finally:
+        fake.terminate()
+        fake.wait()
+
+    report: Dict[str, Any] = {"results": results}
+    baseline = load_baseline(args.baseline)
+    if baseline and not args.update_baseline:
+        report["regressions"] = compare(results, baseline, args.tolerance)
+
+    if args.update_baseline or baseline is None:
+        save_baseline(args.baseline, results, {
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "runs": args.runs,
+        })
+        report["baseline_written"] = args.baseline
+
+    print(json.dumps(report, indent=2))
+    if args.fail_on_regression and report.get("regressions"):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
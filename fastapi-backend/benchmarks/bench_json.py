@@ -0,0 +1,128 @@
+"""
+JSON Hot-Path Benchmark
+Compares the previous multi-pass JSON extraction with the single-pass extractor,
+the two Pydantic validation routes, and json with orjson response rendering
+
+Usage:
+    python -m benchmarks.bench_json [--iterations N]
+"""
+
+import argparse
+import json
+import logging
+from typing import Any, Dict, Optional
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, ORJSONResponse
+
+from app.models.schemas import ParsedResumeResponse, StructuredResumeData
+from app.services.ai_structurer import AIStructurer
+from benchmarks.corpus import SIZES, render_text, resume_sections
+from benchmarks.fixtures import dummy_resume
+from benchmarks.harness import measure
+
+
+def legacy_extract_json(text: str) -> Optional[Dict[str, Any]]:
+    """The extractor before the single-pass rewrite, kept for comparison"""
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        if "```json" in text:
+            json_start = text.find("```json") + 7
+            json_end = text.find("```", json_start)
+            try:
+                return json.loads(text[json_start:json_end].strip())
+            except json.JSONDecodeError:
+                pass
+        if "{" in text and "}" in text:
+            try:
+                return json.loads(text[text.find("{"):text.rfind("}") + 1])
+            except json.JSONDecodeError:
+                pass
+        return None
+
+
+def _large_resume() -> StructuredResumeData:
+    """Dummy resume padded with many work experience entries"""
+    data = dummy_resume()
+    job = data.work_experience[0]
+    data.work_experience = [job.model_copy(update={"company": f"Company {i}"}) for i in range(SIZES["large"])]
+    return data
+
+
+def run(iterations: int) -> Dict[str, Dict[str, float]]:
+    """
+    Time extraction+validation and response rendering variants
+
+    Args:
+        iterations: Timed runs per case
+
+    Returns:
+        Case name -> metrics
+    """
+    results: Dict[str, Dict[str, float]] = {}
+
+    for size, data in (("small", dummy_resume()), ("large", _large_resume())):
+        payload = data.model_dump_json(indent=2)
+        responses = {
+            "bare": payload,
+            "fenced": f"Here is the structured resume:\n```json\n{payload}\n```",
+            "trailing_prose": f"{payload}\n\nNote: I left {{placeholders}} empty where unknown.",
+        }
+        for shape, text in responses.items():
+            if legacy_extract_json(text) is None:
+                # Braces in trailing prose defeat the find/rfind heuristic
+                results[f"extract_validate.legacy.{size}.{shape}"] = {"extracted": False}
+            else:
+                results[f"extract_validate.legacy.{size}.{shape}"] = measure(
+                    lambda text=text: StructuredResumeData(**legacy_extract_json(text)), iterations
+                )
+            results[f"extract_validate.single_pass.{size}.{shape}"] = measure(
+                lambda text=text: StructuredResumeData.model_validate(AIStructurer._extract_json(text)),
+                iterations,
+            )
+
+        # Validation route: stdlib decode + model_validate vs pydantic-core JSON parsing
+        parsed = json.loads(payload)
+        results[f"validate.model_validate.{size}"] = measure(
+            lambda: StructuredResumeData.model_validate(json.loads(payload)), iterations
+        )
+        results[f"validate.model_validate_json.{size}"] = measure(
+            lambda: StructuredResumeData.model_validate_json(payload), iterations
+        )
+        results[f"validate.dict_only.{size}"] = measure(
+            lambda: StructuredResumeData.model_validate(parsed), iterations
+        )
+
+        response = ParsedResumeResponse(
+            success=True,
+            filename="resume.pdf",
+            raw_text=render_text(resume_sections(SIZES[size])),
+            structured_data=data,
+            message="Resume parsed successfully",
+        )
+        # FastAPI hands the response class the jsonable form of the response model
+        content = jsonable_encoder(response)
+        results[f"render.json.{size}"] = measure(lambda: JSONResponse(content), iterations)
+        results[f"render.orjson.{size}"] = measure(lambda: ORJSONResponse(content), iterations)
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=500, help="Timed runs per case")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    results = run(args.iterations)
+    for name, metrics in results.items():
+        if "latency_ms_p50" not in metrics:
+            print(f"{name:50s} failed to extract")
+            continue
+        print(f"{name:50s} p50={metrics['latency_ms_p50']:.4f}ms p99={metrics['latency_ms_p99']:.4f}ms")
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Near-Duplicate Index Benchmark
+Checks match quality of the MinHash/LSH index on edited, re-flowed and unrelated
+resumes, and times signature and lookup against a filled index
+
+Usage:
+    python -m benchmarks.bench_near_duplicate [--entries 2000] [--threshold 0.95]
+"""
+
+import argparse
+import json
+import logging
+import re
+from typing import Any, Dict, List, Tuple
+
+from app.services.near_duplicate import NearDuplicateIndex
+from app.services.text_normalizer import TextNormalizer
+from benchmarks.corpus import render_text, resume_sections
+from benchmarks.harness import measure
+
+WORD_RE = re.compile(r"\w+")
+
+
+def _exact_jaccard(first: str, second: str, size: int) -> float:
+    """Jaccard similarity of the word shingle sets, for comparison with the estimate"""
+    def shingles(text: str):
+        words = WORD_RE.findall(text.lower())
+        return {tuple(words[i:i + size]) for i in range(len(words) - size + 1)}
+    a, b = shingles(first), shingles(second)
+    return len(a & b) / len(a | b) if a | b else 0.0
+
+
+def variants(text: str, other: str) -> List[Tuple[str, str, bool]]:
+    """
+    Build (name, text, should_match) cases from a base resume
+
+    Args:
+        text: Base resume text
+        other: A different resume of the same shape
+
+    Returns:
+        Cases covering typical re-upload edits and a true negative
+    """
+    lines = text.splitlines()
+    return [
+        ("reflowed", " ".join(text.split()), True),
+        ("contact_changed", text.replace("john.doe@email.com", "jdoe@example.org"), True),
+        ("one_line_edited", "\n".join(lines[:8] + ["• Led the platform migration to a new cloud region"] + lines[9:]),
+         True),
+        ("line_added", text + "\nVolunteer mentor at a local coding bootcamp", True),
+        ("different_resume", other, False),
+    ]
+
+
+def run(entries: int, threshold: float, iterations: int) -> Dict[str, Any]:
+    """
+    Run quality checks and timings
+
+    Args:
+        entries: Number of unrelated resumes loaded into the index
+        threshold: Similarity threshold under test
+        iterations: Timed runs per timing case
+
+    Returns:
+        Quality cases and latency metrics
+    """
+    index = NearDuplicateIndex(threshold=threshold, max_entries=entries + 10, normalizer=TextNormalizer())
+    report: Dict[str, Any] = {"quality": {}, "timings": {}}
+
+    for jobs in (2, 8, 30):
+        base = render_text(resume_sections(jobs, seed=0))
+        index.add(f"base.{jobs}", base, "{}")
+        for name, text, should_match in variants(base, render_text(resume_sections(jobs, seed=1))):
+            match = index.lookup(text)
+            report["quality"][f"{jobs}_jobs.{name}"] = {
+                "exact_jaccard": round(_exact_jaccard(base, text, index.shingle_size), 4),
+                "estimated": round(index.similarity(index.signature(base), index.signature(text)), 4),
+                "matched": match is not None and match.key == f"base.{jobs}",
+                "expected": should_match,
+            }
+
+    # Fill the index with unrelated resumes to time lookups at capacity
+    for seed in range(2, entries + 2):
+        index.add(f"filler.{seed}", render_text(resume_sections(2 + seed % 10, seed=seed)), "{}")
+
+    for jobs in (2, 8, 30):
+        query = render_text(resume_sections(jobs, seed=0)) + "\nOne more line"
+        report["timings"][f"signature.{jobs}_jobs"] = measure(lambda: index.signature(query), iterations)
+        report["timings"][f"lookup.{jobs}_jobs"] = measure(lambda: index.lookup(query), iterations)
+    report["stats"] = index.stats()
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entries", type=int, default=2000, help="Unrelated resumes in the index")
+    parser.add_argument("--threshold", type=float, default=0.95, help="Similarity threshold")
+    parser.add_argument("--iterations", type=int, default=50, help="Timed runs per timing case")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    report = run(args.entries, args.threshold, args.iterations)
+    for name, case in report["quality"].items():
+        status = "ok" if case["matched"] == case["expected"] else "unexpected"
+        print(f"{name:28s} jaccard={case['exact_jaccard']:.3f} estimate={case['estimated']:.3f} "
+              f"matched={case['matched']} {status}")
+    for name, metrics in report["timings"].items():
+        print(f"{name:28s} p50={metrics['latency_ms_p50']:.3f}ms p99={metrics['latency_ms_p99']:.3f}ms")
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
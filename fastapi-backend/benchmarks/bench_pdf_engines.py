@@ -0,0 +1,79 @@
+"""
+PDF Engine Benchmark
+Compares the registered PDF engines for latency, peak memory and text yield
+across document sizes, and shows which engine automatic selection picks
+
+Usage:
+    python -m benchmarks.bench_pdf_engines [--iterations N] [--jobs 2 30 120]
+"""
+
+import argparse
+import io
+import json
+import logging
+from typing import Any, Dict, List
+
+from app.services.document_parser import DocumentParser
+from app.services.pdf_engines import PdfDocument, available_pdf_engines, choose_pdf_engine, probe_pdf
+from benchmarks.corpus import make_pdf, render_text, resume_sections
+from benchmarks.harness import measure
+
+
+def run(iterations: int, jobs: List[int]) -> Dict[str, Dict[str, Any]]:
+    """
+    Benchmark every available engine on generated resumes
+
+    Args:
+        iterations: Timed runs per engine and document
+        jobs: Work experience entries per generated document
+
+    Returns:
+        Case name -> automatic choice and per-engine metrics
+    """
+    engines = available_pdf_engines()
+    parsers = {
+        name: DocumentParser(pdf_engine=name, pdf_engine_fallback=False, max_pdf_pages=None, max_pdf_chars=None)
+        for name in engines
+    }
+    results: Dict[str, Dict[str, Any]] = {}
+
+    for count in jobs:
+        content = make_pdf(render_text(resume_sections(count)))
+        document = PdfDocument(io.BytesIO(content))
+        probe = probe_pdf(document, len(document.reader.pages))
+        name = f"{count}_jobs"
+        results[name] = {
+            "bytes": len(content),
+            "pages": probe.pages,
+            "auto": "/".join(choose_pdf_engine(probe, engines)),
+        }
+        for engine, parser in parsers.items():
+            text = parser._parse_pdf(content)
+            results[name][engine] = {
+                "chars": len(text),
+                "words": len(text.split()),
+                **measure(lambda: parser._parse_pdf(content), iterations),
+            }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=10, help="Timed runs per engine and document")
+    parser.add_argument("--jobs", type=int, nargs="+", default=[2, 30, 120], help="Experience entries per document")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    results = run(args.iterations, args.jobs)
+    for name, result in results.items():
+        engines = " | ".join(
+            f"{engine} p50={result[engine]['latency_ms_p50']:.2f}ms "
+            f"peak={result[engine]['peak_memory_kb']:.0f}KiB words={result[engine]['words']}"
+            for engine in available_pdf_engines()
+        )
+        print(f"{name:10s} pages={result['pages']:<3d} auto={result['auto']:22s} {engines}")
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+"""
+Pipeline Benchmark
+Microbenchmarks for parsing, JSON extraction and validation, plus an end-to-end
+/api/parse-resume benchmark with a mocked Anthropic client
+
+Results (throughput, p50/p99 latency, peak memory) are compared against a JSON
+baseline; metrics that got worse by more than --tolerance are flagged.
+
+Usage:
+    python -m benchmarks.bench_pipeline [--iterations N] [--update-baseline]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import sys
+import time
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Tuple
+
+from app.models.schemas import StructuredResumeData
+from app.services.ai_structurer import AIStructurer
+from app.services.document_parser import DocumentParser
+from benchmarks.corpus import SIZES, generate_corpus
+from benchmarks.fixtures import dummy_resume
+from benchmarks.harness import compare, load_baseline, measure, save_baseline
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+PARSE_METHODS = {
+    ".pdf": "_parse_pdf",
+    ".docx": "_parse_docx",
+    ".txt": "_parse_txt",
+}
+
+
+class MockAnthropicClient:
+    """Stands in for the Claude client; returns a fixed structured resume"""
+
+    def __init__(self, latency_ms: float = 0):
+        self.latency = latency_ms / 1000
+        self.response_text = (
+            "Here is the structured resume:\n```json\n"
+            + dummy_resume().model_dump_json(indent=2)
+            + "\n```"
+        )
+        self.messages = SimpleNamespace(create=self._create)
+
+    async def _create(self, **kwargs) -> Any:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        prompt = kwargs["messages"][0]["content"]
+        return SimpleNamespace(
+            content=[SimpleNamespace(text=self.response_text)],
+            usage=SimpleNamespace(input_tokens=len(prompt) // 4, output_tokens=len(self.response_text) // 4),
+        )
+
+
+def micro_benchmarks(sizes: List[str]) -> List[Tuple[str, Callable[[], Any]]]:
+    """
+    Build the microbenchmark cases
+
+    Args:
+        sizes: Corpus size classes to include
+
+    Returns:
+        List of (benchmark name, zero-argument callable)
+    """
+    parser = DocumentParser()
+    cases: List[Tuple[str, Callable[[], Any]]] = []
+
+    for document in generate_corpus(sizes):
+        method = getattr(parser, PARSE_METHODS[os.path.splitext(document.filename)[1]])
+        cases.append((f"{method.__name__.lstrip('_')}.{document.name}",
+                      lambda method=method, content=document.content: method(content)))
+
+    structurer = AIStructurer(api_key=None)
+    response_text = MockAnthropicClient().response_text
+    resume_json = json.loads(dummy_resume().model_dump_json())
+
+    cases.append(("extract_json.fenced", lambda: structurer._extract_json(response_text)))
+    cases.append(("validate.structured_resume", lambda: StructuredResumeData.model_validate(resume_json)))
+    return cases
+
+
+def e2e_benchmarks(sizes: List[str], latency_ms: float) -> List[Tuple[str, Callable[[], Any]]]:
+    """
+    Build end-to-end /api/parse-resume cases against the real app
+
+    The result cache is disabled so every call parses and structures.
+
+    Args:
+        sizes: Corpus size classes to include
+        latency_ms: Simulated Claude latency
+
+    Returns:
+        List of (benchmark name, zero-argument callable)
+    """
+    os.environ["ANTHROPIC_API_KEY"] = ""
+    os.environ["RESULT_CACHE_ENABLED"] = "false"
+
+    from fastapi.testclient import TestClient
+    import main
+
+    main.ai_structurer.client = MockAnthropicClient(latency_ms)
+    client = TestClient(main.app)
+
+    def post(document) -> None:
+        response = client.post(
+            "/api/parse-resume",
+            files={"file": (document.filename, document.content, "application/octet-stream")},
+        )
+        if response.status_code != 200:
+            raise RuntimeError(f"{document.name}: HTTP {response.status_code} {response.text[:200]}")
+
+    return [
+        (f"e2e.parse_resume.{document.name}", lambda document=document: post(document))
+        for document in generate_corpus(sizes)
+    ]
+
+
+def run(iterations: int, sizes: List[str], include_e2e: bool, latency_ms: float) -> Dict[str, Dict[str, float]]:
+    """
+    Run all benchmarks
+
+    Args:
+        iterations: Timed runs per benchmark
+        sizes: Corpus size classes to include
+        include_e2e: Whether to run the end-to-end benchmarks
+        latency_ms: Simulated Claude latency for end-to-end runs
+
+    Returns:
+        Benchmark name -> metrics
+    """
+    cases = micro_benchmarks(sizes)
+    if include_e2e:
+        cases += e2e_benchmarks(sizes, latency_ms)
+
+    results = {}
+    for name, func in cases:
+        results[name] = measure(func, iterations)
+        print(f"{name:45s} p50={results[name]['latency_ms_p50']:.3f}ms "
+              f"p99={results[name]['latency_ms_p99']:.3f}ms "
+              f"peak={results[name]['peak_memory_kb']:.0f}KiB", file=sys.stderr)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=50, help="Timed runs per benchmark")
+    parser.add_argument("--sizes", nargs="+", choices=list(SIZES), default=list(SIZES), help="Corpus sizes")
+    parser.add_argument("--no-e2e", action="store_true", help="Skip the end-to-end benchmarks")
+    parser.add_argument("--mock-latency-ms", type=float, default=0, help="Simulated Claude latency")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline JSON file")
+    parser.add_argument("--update-baseline", action="store_true", help="Write results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative regression")
+    parser.add_argument("--fail-on-regression", action="store_true", help="Exit 1 if anything regressed")
+    args = parser.parse_args()
+
+    # Keep per-request service logs out of the timings and the output
+    logging.disable(logging.INFO)
+
+    results = run(args.iterations, args.sizes, not args.no_e2e, args.mock_latency_ms)
+    report: Dict[str, Any] = {"results": results}
+
+    baseline = load_baseline(args.baseline)
+    if baseline and not args.update_baseline:
+        report["regressions"] = compare(results, baseline, args.tolerance)
+
+    if args.update_baseline or baseline is None:
+        save_baseline(args.baseline, results, {
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "iterations": args.iterations,
+        })
+        report["baseline_written"] = args.baseline
+
+    print(json.dumps(report, indent=2))
+    if args.fail_on_regression and report.get("regressions"):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
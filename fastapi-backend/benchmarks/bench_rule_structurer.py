@@ -0,0 +1,97 @@
+"""
+Rule-Based Structurer Benchmark
+Measures field accuracy and latency of RuleBasedStructurer on the dummy-data fixtures
+
+Usage:
+    python -m benchmarks.bench_rule_structurer [--iterations N]
+"""
+
+import argparse
+import json
+import statistics
+import time
+from typing import Any, Dict, List
+
+from app.services.rule_structurer import RuleBasedStructurer
+from benchmarks.fixtures import HEADLINE, text_fixtures
+
+PERSONAL_FIELDS = ["full_name", "email", "phone", "location", "linkedin", "github", "portfolio"]
+EXPECTED_SECTIONS = {"header", "summary", "experience", "education", "skills", "certifications",
+                     "projects", "languages"}
+
+
+def _list_f1(predicted: List[str], expected: List[str]) -> float:
+    predicted_set = {item.lower() for item in predicted}
+    expected_set = {item.lower() for item in expected}
+    if not predicted_set and not expected_set:
+        return 1.0
+    true_positives = len(predicted_set & expected_set)
+    if not true_positives:
+        return 0.0
+    precision = true_positives / len(predicted_set)
+    recall = true_positives / len(expected_set)
+    return 2 * precision * recall / (precision + recall)
+
+
+def run(iterations: int) -> Dict[str, Any]:
+    """
+    Score accuracy once per fixture and time structure() over many iterations
+
+    Args:
+        iterations: Timed runs per fixture
+
+    Returns:
+        Report dictionary
+    """
+    structurer = RuleBasedStructurer()
+    report: Dict[str, Any] = {"fixtures": {}}
+
+    for name, text, expected in text_fixtures():
+        result = structurer.structure(text)
+        sections = set(structurer.split_sections(text))
+
+        field_hits = {
+            field: getattr(result.personal_info, field) == getattr(expected.personal_info, field)
+            for field in PERSONAL_FIELDS
+        }
+
+        timings = []
+        for _ in range(iterations):
+            start = time.perf_counter()
+            structurer.structure(text)
+            timings.append((time.perf_counter() - start) * 1000)
+        timings.sort()
+
+        report["fixtures"][name] = {
+            "personal_info_accuracy": sum(field_hits.values()) / len(field_hits),
+            "personal_info_misses": [field for field, hit in field_hits.items() if not hit],
+            "section_recall": len(sections & EXPECTED_SECTIONS) / len(EXPECTED_SECTIONS),
+            "summary_exact": result.professional_summary == expected.professional_summary,
+            # Stripping contacts must leave ordinary header lines intact
+            "headline_kept": HEADLINE not in text or HEADLINE in structurer.strip_contact_lines(text),
+            "skills_f1": round(_list_f1(result.skills, expected.skills), 4),
+            "certifications_f1": round(_list_f1(result.certifications, expected.certifications), 4),
+            "languages_f1": round(_list_f1(result.languages, expected.languages), 4),
+            "latency_ms_p50": round(statistics.median(timings), 4),
+            "latency_ms_p99": round(timings[min(len(timings) - 1, int(len(timings) * 0.99))], 4),
+        }
+
+    fixtures = report["fixtures"].values()
+    report["mean_personal_info_accuracy"] = round(
+        statistics.mean(f["personal_info_accuracy"] for f in fixtures), 4
+    )
+    report["mean_section_recall"] = round(statistics.mean(f["section_recall"] for f in fixtures), 4)
+    report["max_latency_ms_p99"] = max(f["latency_ms_p99"] for f in fixtures)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=500, help="Timed runs per fixture")
+    args = parser.parse_args()
+
+    print(json.dumps(run(args.iterations), indent=2))
+
+
+if __name__ == "__main__":
+    main()
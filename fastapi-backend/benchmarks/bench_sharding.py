@@ -0,0 +1,109 @@
+"""
+Sharded Structuring Benchmark
+Compares single-prompt and section-sharded structuring wall-clock time with a
+mocked Claude client whose latency grows with the amount of text it structures
+
+Claude's latency is dominated by output tokens, and the JSON it writes is
+roughly proportional to the resume text in the prompt. The mock therefore
+sleeps for a fixed base latency plus --ms-per-output-token for an output
+estimate based on the text length.
+
+Usage:
+    python -m benchmarks.bench_sharding [--jobs 2 8 30] [--ms-per-output-token 10]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import time
+from typing import Any, Dict, List
+
+from app.services.ai_structurer import CHARS_PER_TOKEN, AIStructurer
+from app.services.rule_structurer import RuleBasedStructurer
+from app.services.text_normalizer import TextNormalizer
+from benchmarks.bench_pipeline import MockAnthropicClient
+from benchmarks.corpus import render_text, resume_sections
+
+# JSON output is somewhat longer than the text it was extracted from
+OUTPUT_TOKENS_PER_TEXT_TOKEN = 1.2
+
+
+class LatencyModelClient(MockAnthropicClient):
+    """Mock client whose latency scales with the resume text in the prompt"""
+
+    def __init__(self, base_ms: float, ms_per_output_token: float):
+        super().__init__()
+        self.base_ms = base_ms
+        self.ms_per_output_token = ms_per_output_token
+        self.calls = 0
+
+    async def _create(self, **kwargs) -> Any:
+        self.calls += 1
+        prompt = kwargs["messages"][0]["content"]
+        text = prompt.split("Resume Text:\n", 1)[1].split("\n\nExtract the following", 1)[0]
+        output_tokens = len(text) / CHARS_PER_TOKEN * OUTPUT_TOKENS_PER_TEXT_TOKEN
+        await asyncio.sleep((self.base_ms + output_tokens * self.ms_per_output_token) / 1000)
+        return await super()._create(**kwargs)
+
+
+async def _time_structuring(structurer: AIStructurer, text: str) -> float:
+    started = time.perf_counter()
+    result = await structurer.structure_resume(text)
+    if result is None:
+        raise RuntimeError("Structuring failed")
+    return (time.perf_counter() - started) * 1000
+
+
+def run(jobs: List[int], base_ms: float, ms_per_output_token: float, shard_max_chars: int) -> Dict[str, Dict[str, Any]]:
+    """
+    Time both modes per resume size
+
+    Args:
+        jobs: Work experience entries per generated resume
+        base_ms: Fixed latency per Claude call
+        ms_per_output_token: Simulated generation speed
+        shard_max_chars: Chunk size for experience and education shards
+
+    Returns:
+        Resume name -> per-mode latency and call counts
+    """
+    results: Dict[str, Dict[str, Any]] = {}
+    for count in jobs:
+        text = render_text(resume_sections(count))
+        results[f"{count}_jobs"] = {"chars": len(text)}
+        for mode, sharded in (("single", False), ("sharded", True)):
+            client = LatencyModelClient(base_ms, ms_per_output_token)
+            structurer = AIStructurer(
+                api_key="benchmark",
+                prestructurer=RuleBasedStructurer(),
+                normalizer=TextNormalizer(),
+                client=client,
+                sharded=sharded,
+                shard_max_chars=shard_max_chars,
+            )
+            elapsed = asyncio.run(_time_structuring(structurer, text))
+            results[f"{count}_jobs"][mode] = {"latency_ms": round(elapsed, 1), "claude_calls": client.calls}
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, nargs="+", default=[2, 8, 30], help="Experience entries per resume")
+    parser.add_argument("--base-ms", type=float, default=400, help="Fixed latency per Claude call")
+    parser.add_argument("--ms-per-output-token", type=float, default=10, help="Simulated generation speed")
+    parser.add_argument("--shard-max-chars", type=int, default=4000, help="Experience/education chunk size")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    results = run(args.jobs, args.base_ms, args.ms_per_output_token, args.shard_max_chars)
+    for name, result in results.items():
+        single, sharded = result["single"], result["sharded"]
+        print(f"{name:8s} chars={result['chars']:6d} single={single['latency_ms']:8.1f}ms "
+              f"sharded={sharded['latency_ms']:8.1f}ms ({sharded['claude_calls']} calls) "
+              f"x{single['latency_ms'] / sharded['latency_ms']:.2f}")
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
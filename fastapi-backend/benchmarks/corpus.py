@@ -0,0 +1,239 @@
+"""
+Synthetic Resume Corpus
+Generates PDF, DOCX and TXT resumes of varying size for the pipeline benchmarks
+
+Usage:
+    python -m benchmarks.corpus --out /tmp/resume-corpus
+"""
+
+import argparse
+import io
+import os
+import random
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+
+from docx import Document
+
+# Number of work experience entries per size class
+SIZES: Dict[str, int] = {"small": 2, "medium": 8, "large": 30}
+
+LINES_PER_PDF_PAGE = 55
+
+_COMPANIES = ["Tech Corp", "Startup Inc", "DataWorks", "Cloudline", "Northwind", "Globex", "Initech"]
+_POSITIONS = ["Software Engineer", "Senior Engineer", "Tech Lead", "Backend Developer", "Data Engineer"]
+_CITIES = ["San Francisco, CA", "Austin, TX", "New York, NY", "Seattle, WA", "Remote"]
+_VERBS = ["Built", "Led", "Designed", "Migrated", "Optimized", "Automated", "Shipped", "Scaled"]
+_OBJECTS = ["payment APIs", "data pipelines", "CI/CD workflows", "React dashboards", "search indexing",
+            "microservices", "observability tooling", "PostgreSQL schemas"]
+_SKILLS = ["Python", "TypeScript", "React", "FastAPI", "PostgreSQL", "Docker", "Kubernetes", "AWS",
+           "Redis", "GraphQL", "Terraform", "Go"]
+
+
+@dataclass
+class CorpusDocument:
+    """One generated resume file"""
+    name: str
+    filename: str
+    content: bytes
+    size_class: str
+    pages: int = 1
+
+
+def resume_sections(jobs: int, seed: int = 0) -> Dict[str, List[str]]:
+    """
+    Build resume content as heading -> lines
+
+    Args:
+        jobs: Number of work experience entries
+        seed: Random seed, so the corpus is identical between runs
+
+    Returns:
+        Ordered mapping of section heading to its lines ("" is the header)
+    """
+    rng = random.Random(seed)
+    experience: List[str] = []
+    for index in range(jobs):
+        start_year = 2023 - 2 * index
+        experience.append(f"{rng.choice(_POSITIONS)} - {rng.choice(_COMPANIES)}, {rng.choice(_CITIES)}")
+        experience.append(f"{start_year - 2}-01 - {start_year}-06")
+        for _ in range(rng.randint(3, 6)):
+            experience.append(
+                f"• {rng.choice(_VERBS)} {rng.choice(_OBJECTS)} serving {rng.randint(2, 900)}k users "
+                f"with {rng.randint(10, 90)}% lower latency"
+            )
+        experience.append("")
+
+    return {
+        "": ["John Doe", "john.doe@email.com", "+1 (555) 123-4567", "San Francisco, CA",
+             "linkedin.com/in/johndoe", "github.com/johndoe"],
+        "Professional Summary": [
+            "Experienced software engineer with a track record of shipping reliable backend "
+            "and frontend systems across startups and large teams."
+        ],
+        "Work Experience": experience,
+        "Education": ["Bachelor of Science in Computer Science, University of California",
+                      "2015-09 - 2019-06, GPA 3.8"],
+        "Skills": [", ".join(rng.sample(_SKILLS, 8))],
+        "Certifications": ["- AWS Certified Solutions Architect", "- Google Cloud Professional"],
+        "Languages": ["English, Spanish"],
+    }
+
+
+def render_text(sections: Dict[str, List[str]]) -> str:
+    """Render sections as plain resume text"""
+    lines: List[str] = []
+    for heading, body in sections.items():
+        if heading:
+            lines.append(heading)
+        lines.extend(body)
+        lines.append("")
+    return "\n".join(lines).strip() + "\n"
+
+
+def make_pdf(text: str, lines_per_page: int = LINES_PER_PDF_PAGE) -> bytes:
+    """
+    Write a minimal text-only PDF (Helvetica, one text object per page)
+
+    Args:
+        text: Text to lay out, one PDF line per text line
+        lines_per_page: Lines before starting a new page
+
+    Returns:
+        PDF file bytes
+    """
+    lines = [line.replace("•", "-") for line in text.splitlines()]
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[]]
+    font_id = 3 + 2 * len(pages)
+
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        "<< /Type /Pages /Kids [{}] /Count {} >>".format(
+            " ".join(f"{3 + 2 * i} 0 R" for i in range(len(pages))), len(pages)
+        ),
+    ]
+    for index, page_lines in enumerate(pages):
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 {font_id} 0 R >> >> /Contents {4 + 2 * index} 0 R >>"
+        )
+        shown = " ".join(
+            "(" + line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)") + ") '"
+            for line in page_lines
+        )
+        body = f"BT /F1 10 Tf 50 760 Td 13 TL {shown} ET"
+        objects.append(f"<< /Length {len(body.encode('latin-1', 'replace'))} >>\nstream\n{body}\nendstream")
+    objects.append("<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, obj in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(f"{number} 0 obj\n{obj}\nendobj\n".encode("latin-1", "replace"))
+    xref = out.tell()
+    out.write(f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode())
+    out.write("".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode())
+    out.write(f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode())
+    return out.getvalue()
+
+
+def make_docx(sections: Dict[str, List[str]], tables: int = 0) -> bytes:
+    """
+    Write a DOCX resume, optionally laying experience out in tables
+
+    With tables > 0 the experience entries are split across that many
+    three-column tables, and the first row of each merges its cells the way
+    resume templates do for a company banner.
+
+    Args:
+        sections: Output of resume_sections()
+        tables: Number of experience tables (0 for paragraphs only)
+
+    Returns:
+        DOCX file bytes
+    """
+    document = Document()
+    for heading, body in sections.items():
+        if heading:
+            document.add_heading(heading, level=2)
+        if heading == "Work Experience" and tables:
+            _add_experience_tables(document, body, tables)
+            continue
+        for line in body:
+            if line:
+                document.add_paragraph(line)
+
+    out = io.BytesIO()
+    document.save(out)
+    return out.getvalue()
+
+
+def _add_experience_tables(document, lines: List[str], tables: int) -> None:
+    entries: List[List[str]] = [[]]
+    for line in lines:
+        if line:
+            entries[-1].append(line)
+        elif entries[-1]:
+            entries.append([])
+    entries = [entry for entry in entries if entry]
+
+    per_table = max(1, -(-len(entries) // tables))
+    for start in range(0, len(entries), per_table):
+        chunk = entries[start:start + per_table]
+        table = document.add_table(rows=1 + len(chunk), cols=3)
+        banner = table.rows[0].cells[0].merge(table.rows[0].cells[2])
+        banner.text = "Experience"
+        for row, entry in zip(table.rows[1:], chunk):
+            row.cells[0].text = entry[0]
+            row.cells[1].text = entry[1] if len(entry) > 1 else ""
+            row.cells[2].text = "\n".join(entry[2:])
+
+
+def generate_corpus(sizes: Optional[Sequence[str]] = None, seed: int = 0) -> List[CorpusDocument]:
+    """
+    Generate the benchmark corpus
+
+    Every size class yields a TXT, a PDF, a paragraph DOCX and a multi-table DOCX.
+
+    Args:
+        sizes: Size classes to include (defaults to all of SIZES)
+        seed: Random seed
+
+    Returns:
+        Generated documents
+    """
+    documents: List[CorpusDocument] = []
+    for size_class in sizes or SIZES:
+        sections = resume_sections(SIZES[size_class], seed=seed)
+        text = render_text(sections)
+        pages = -(-len(text.splitlines()) // LINES_PER_PDF_PAGE)
+
+        documents += [
+            CorpusDocument(f"{size_class}_txt", f"{size_class}.txt", text.encode("utf-8"), size_class),
+            CorpusDocument(f"{size_class}_pdf", f"{size_class}.pdf", make_pdf(text), size_class, pages),
+            CorpusDocument(f"{size_class}_docx", f"{size_class}.docx", make_docx(sections), size_class),
+            CorpusDocument(
+                f"{size_class}_docx_tables", f"{size_class}_tables.docx",
+                make_docx(sections, tables=3), size_class
+            ),
+        ]
+    return documents
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--out", required=True, help="Directory to write the corpus to")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    args = parser.parse_args()
+
+    os.makedirs(args.out, exist_ok=True)
+    for document in generate_corpus(seed=args.seed):
+        path = os.path.join(args.out, document.filename)
+        with open(path, "wb") as f:
+            f.write(document.content)
+        print(f"{path}: {len(document.content)} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Benchmark Fixtures
+Renders the dummy structured resume into plain-text resumes with known answers
+"""
+
+from typing import Callable, Dict, List, Tuple
+
+from app.models.schemas import StructuredResumeData
+from app.services.ai_structurer import AIStructurer
+
+
+def dummy_resume() -> StructuredResumeData:
+    """The sample resume returned when AI structuring is not configured"""
+    return AIStructurer(api_key=None)._get_dummy_structured_data()
+
+
+def _contact_lines(data: StructuredResumeData, inline: bool) -> List[str]:
+    info = data.personal_info
+    contacts = [info.email, info.phone, info.location, info.linkedin, info.github, info.portfolio]
+    if inline:
+        return [" | ".join(contacts)]
+    return contacts
+
+
+# Header line with dotted words that are not domains (regression for URL matching)
+HEADLINE = "Senior ASP.NET Developer at Acme.io"
+
+
+def _render(data: StructuredResumeData, upper: bool, inline_contacts: bool, colon: bool,
+            headline: bool = False) -> str:
+    def heading(title: str) -> str:
+        title = title.upper() if upper else title
+        return f"{title}:" if colon else title
+
+    lines = [data.personal_info.full_name, *([HEADLINE] if headline else []),
+             *_contact_lines(data, inline_contacts), ""]
+
+    lines += [heading("Professional Summary"), data.professional_summary, ""]
+
+    lines.append(heading("Work Experience"))
+    for job in data.work_experience:
+        lines.append(f"{job.position} - {job.company}, {job.location}")
+        lines.append(f"{job.start_date} - {job.end_date}")
+        lines += [f"• {item}" for item in job.responsibilities]
+        lines.append("")
+
+    lines.append(heading("Education"))
+    for school in data.education:
+        lines.append(f"{school.degree} in {school.field_of_study}, {school.institution}")
+        lines.append(f"{school.start_date} - {school.end_date}, GPA {school.gpa}")
+    lines.append("")
+
+    lines += [heading("Skills"), ", ".join(data.skills), ""]
+    lines += [heading("Certifications"), *[f"- {c}" for c in data.certifications], ""]
+
+    lines.append(heading("Projects"))
+    for project in data.projects:
+        lines.append(f"{project['name']}: {project['description']} ({', '.join(project['technologies'])})")
+    lines.append("")
+
+    lines += [heading("Languages"), ", ".join(data.languages)]
+    return "\n".join(lines)
+
+
+# name -> renderer; each variant exercises a different heading/contact layout
+VARIANTS: Dict[str, Callable[[StructuredResumeData], str]] = {
+    "title_case": lambda d: _render(d, upper=False, inline_contacts=False, colon=False),
+    "upper_case": lambda d: _render(d, upper=True, inline_contacts=False, colon=False),
+    "inline_contacts": lambda d: _render(d, upper=False, inline_contacts=True, colon=True),
+    "upper_inline": lambda d: _render(d, upper=True, inline_contacts=True, colon=True),
+    "headline": lambda d: _render(d, upper=False, inline_contacts=True, colon=False, headline=True),
+}
+
+
+def text_fixtures() -> List[Tuple[str, str, StructuredResumeData]]:
+    """
+    Build the text fixtures
+
+    Returns:
+        List of (variant name, resume text, expected structured data)
+    """
+    expected = dummy_resume()
+    return [(name, render(expected), expected) for name, render in VARIANTS.items()]
@@ -0,0 +1,137 @@
+"""
+Benchmark Harness
+Timing, peak-memory measurement and baseline comparison shared by the benchmarks
+"""
+
+import gc
+import json
+import os
+import statistics
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional
+
+# Metrics where a larger value is a regression
+LOWER_IS_BETTER = ("latency_ms_p50", "latency_ms_p99", "peak_memory_kb")
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+def measure(
+    func: Callable[[], Any],
+    iterations: int,
+    warmup: int = 3,
+    memory_iterations: int = 3,
+) -> Dict[str, float]:
+    """
+    Time a callable and record its peak Python memory allocation
+
+    Timing and memory are measured in separate passes because tracemalloc
+    slows allocation-heavy code down considerably.
+
+    Args:
+        func: Zero-argument callable to benchmark
+        iterations: Timed calls
+        warmup: Untimed calls made first
+        memory_iterations: Calls made under tracemalloc
+
+    Returns:
+        Throughput (calls/s), p50/p99 latency (ms) and peak memory (KiB)
+    """
+    for _ in range(warmup):
+        func()
+
+    timings = []
+    gc.collect()
+    total_start = time.perf_counter()
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    total = time.perf_counter() - total_start
+    timings.sort()
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        for _ in range(memory_iterations):
+            func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "iterations": iterations,
+        "throughput_per_s": round(iterations / total, 2),
+        "latency_ms_p50": round(statistics.median(timings), 4),
+        "latency_ms_p99": round(percentile(timings, 0.99), 4),
+        "peak_memory_kb": round(peak / 1024, 1),
+    }
+
+
+def load_baseline(path: str) -> Optional[Dict[str, Any]]:
+    """Read a baseline file, or None if it does not exist"""
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_baseline(path: str, results: Dict[str, Dict[str, float]], meta: Dict[str, Any]) -> None:
+    """Write results as the new baseline"""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump({"meta": meta, "results": results}, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def compare(
+    results: Dict[str, Dict[str, float]],
+    baseline: Dict[str, Any],
+    tolerance: float,
+) -> List[Dict[str, Any]]:
+    """
+    Flag metrics that got worse than the baseline by more than tolerance
+
+    Args:
+        results: Current results, benchmark name -> metrics
+        baseline: Loaded baseline file
+        tolerance: Allowed relative slowdown (0.25 = 25%)
+
+    Returns:
+        One entry per regressed metric
+    """
+    regressions = []
+    previous_results = baseline.get("results", {})
+    for name, metrics in results.items():
+        previous = previous_results.get(name)
+        if not previous:
+            continue
+        for metric in LOWER_IS_BETTER:
+            old, new = previous.get(metric), metrics.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            if change > tolerance:
+                regressions.append({
+                    "benchmark": name,
+                    "metric": metric,
+                    "baseline": old,
+                    "current": new,
+                    "change_pct": round(change * 100, 1),
+                })
+        old_throughput = previous.get("throughput_per_s")
+        if old_throughput and metrics.get("throughput_per_s") is not None:
+            change = (old_throughput - metrics["throughput_per_s"]) / old_throughput
+            if change > tolerance:
+                regressions.append({
+                    "benchmark": name,
+                    "metric": "throughput_per_s",
+                    "baseline": old_throughput,
+                    "current": metrics["throughput_per_s"],
+                    "change_pct": round(-change * 100, 1),
+                })
+    return regressions
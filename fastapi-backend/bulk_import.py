@@ -0,0 +1,389 @@
+"""
+Bulk Resume Import
+Offline backfill of a directory of resumes through the Anthropic Message Batches API
+
+Every PDF, DOCX and TXT file under the input directory is parsed with
+DocumentParser in a process pool, structured by Claude in message batches
+(half the price of interactive calls, no per-request rate limiting), validated
+into StructuredResumeData and written to a JSONL file, one line per file:
+
+    {"file": "2019/jane.pdf", "status": "succeeded", "structured_data": {...}, ...}
+    {"file": "2019/scan.pdf", "status": "insufficient_text", "error": "..."}
+
+The run can be stopped and restarted at any time. Files already in the
+output are skipped, and submitted batches are recorded in the checkpoint
+file so a restart polls them instead of paying for them twice. A later line
+for a file supersedes earlier ones (see --retry-failed).
+
+Parsing and prompts follow the same environment variables as the API
+(PDF_MAX_PAGES, DOCX_EXTRACTOR, CLAUDE_MODEL, MODEL_ROUTING_ENABLED, ...).
+
+Usage:
+    python bulk_import.py /archive/resumes --out resumes.jsonl
+        [--checkpoint resumes.jsonl.checkpoint] [--batch-size 500]
+        [--parse-workers 4] [--poll-interval 60] [--retry-failed]
+
+Against the local fake server:
+    python -m tools.fake_anthropic --port 8081 --batch-seconds 5
+    ANTHROPIC_API_KEY=fake ANTHROPIC_BASE_URL=http://127.0.0.1:8081 python bulk_import.py ...
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from pydantic import ValidationError
+
+from app.services.ai_structurer import AIStructurer
+from app.services.document_parser import DocumentParser
+from app.services.factory import (
+    build_ai_structurer,
+    build_document_parser,
+    build_model_router,
+    build_rule_structurer,
+    build_text_normalizer,
+)
+
+logger = logging.getLogger("bulk_import")
+
+SUPPORTED_EXTENSIONS = (".pdf", ".docx", ".txt")
+# Same threshold as the API's 422 for unreadable documents
+MIN_TEXT_CHARS = 50
+# Message Batches limit per batch
+MAX_BATCH_REQUESTS = 100_000
+
+# Set in each parse worker process by _init_worker
+_worker_parser: Optional[DocumentParser] = None
+
+
+def _init_worker(parser: DocumentParser) -> None:
+    global _worker_parser
+    _worker_parser = parser
+
+
+def _parse_file(path: str) -> Tuple[Optional[str], Optional[str]]:
+    """Parse one file in a worker process; returns (text, error)"""
+    try:
+        with open(path, "rb") as f:
+            return _worker_parser.parse(f.read(), path), None
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}"
+
+
+def find_resumes(root: str) -> Iterator[str]:
+    """
+    Walk a directory for supported resume files
+
+    Args:
+        root: Directory to search
+
+    Yields:
+        Paths relative to root, in sorted order
+    """
+    for directory, subdirectories, filenames in os.walk(root):
+        subdirectories.sort()
+        for filename in sorted(filenames):
+            if os.path.splitext(filename)[1].lower() in SUPPORTED_EXTENSIONS:
+                yield os.path.relpath(os.path.join(directory, filename), root)
+
+
+def custom_id(relative_path: str) -> str:
+    """Stable Message Batches custom_id (64 hex characters) for a file"""
+    return hashlib.sha256(relative_path.encode("utf-8")).hexdigest()
+
+
+class Checkpoint:
+    """
+    Submitted batches that have not been written to the output yet
+
+    Each pending batch maps custom_id -> {"file", "raw_text", "max_tokens"},
+    which is everything needed to validate its results after a restart.
+    Saved atomically (write to a temp file, then rename).
+    """
+
+    def __init__(self, path: str):
+        """
+        Load the checkpoint, or start empty if the file does not exist
+
+        Args:
+            path: Checkpoint file path
+        """
+        self.path = path
+        self.pending: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                self.pending = json.load(f)["pending_batches"]
+
+    def pending_files(self) -> Set[str]:
+        """Files in batches that are still pending"""
+        return {item["file"] for items in self.pending.values() for item in items.values()}
+
+    def add(self, batch_id: str, items: Dict[str, Dict[str, Any]]) -> None:
+        self.pending[batch_id] = items
+        self.save()
+
+    def remove(self, batch_id: str) -> None:
+        self.pending.pop(batch_id, None)
+        self.save()
+
+    def save(self) -> None:
+        temporary = f"{self.path}.tmp"
+        with open(temporary, "w", encoding="utf-8") as f:
+            json.dump({"version": 1, "pending_batches": self.pending}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporary, self.path)
+
+
+class BulkImporter:
+    """Parses, batch-structures and records a directory of resumes"""
+
+    def __init__(
+        self,
+        client: Any,
+        parser: DocumentParser,
+        structurer: AIStructurer,
+        output_path: str,
+        checkpoint: Checkpoint,
+        batch_size: int = 500,
+        parse_workers: int = 4,
+        poll_interval: float = 60,
+        retry_failed: bool = False
+    ):
+        """
+        Initialize the importer
+
+        Args:
+            client: AsyncAnthropic client (for beta.messages.batches)
+            parser: Document parser, copied into every parse worker
+            structurer: Builds the prompts and validates the answers
+            output_path: JSONL file results are appended to
+            checkpoint: Pending batch state
+            batch_size: Resumes per message batch
+            parse_workers: Parse worker processes
+            poll_interval: Seconds between batch status checks
+            retry_failed: Only skip files that already succeeded
+        """
+        self.client = client
+        self.parser = parser
+        self.structurer = structurer
+        self.output_path = output_path
+        self.checkpoint = checkpoint
+        self.batch_size = min(batch_size, MAX_BATCH_REQUESTS)
+        self.parse_workers = parse_workers
+        self.poll_interval = poll_interval
+        self.retry_failed = retry_failed
+        self.counts: Dict[str, int] = {}
+        self._output = None
+
+    async def run(self, root: str) -> Dict[str, int]:
+        """
+        Import every resume under a directory
+
+        Args:
+            root: Input directory
+
+        Returns:
+            Number of files written per status
+        """
+        done = self._completed_files()
+        pending = self.checkpoint.pending_files()
+        files = [path for path in find_resumes(root) if path not in done and path not in pending]
+        logger.info(
+            f"{len(files)} files to import ({len(done)} already done, "
+            f"{len(pending)} in {len(self.checkpoint.pending)} pending batches)"
+        )
+
+        self._output = open(self.output_path, "a", encoding="utf-8")
+        try:
+            # Batches submitted by an earlier run are polled alongside new ones
+            pollers = [asyncio.create_task(self._collect(batch_id)) for batch_id in list(self.checkpoint.pending)]
+            loop = asyncio.get_running_loop()
+            with ProcessPoolExecutor(self.parse_workers, initializer=_init_worker,
+                                     initargs=(self.parser,)) as executor:
+                for start in range(0, len(files), self.batch_size):
+                    chunk = files[start:start + self.batch_size]
+                    parsed = await asyncio.gather(*(
+                        loop.run_in_executor(executor, _parse_file, os.path.join(root, path)) for path in chunk
+                    ))
+                    items = self._prepare(chunk, parsed)
+                    if items:
+                        pollers.append(asyncio.create_task(self._collect(await self._submit(items))))
+            await asyncio.gather(*pollers)
+        finally:
+            self._output.close()
+        return self.counts
+
+    def _completed_files(self) -> Set[str]:
+        """Files already in the output (only successful ones with retry_failed)"""
+        done: Set[str] = set()
+        if not os.path.exists(self.output_path):
+            return done
+        with open(self.output_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # A line cut off by a crash; the file is imported again
+                    continue
+                if record["status"] == "succeeded" or not self.retry_failed:
+                    done.add(record["file"])
+                else:
+                    done.discard(record["file"])
+        return done
+
+    def _prepare(
+        self, paths: List[str], parsed: List[Tuple[Optional[str], Optional[str]]]
+    ) -> Dict[str, Dict[str, Any]]:
+        """Record parse failures and return batch items for the rest"""
+        items = {}
+        for path, (text, error) in zip(paths, parsed):
+            if error:
+                self._write({"file": path, "status": "parse_error", "error": error})
+            elif not text or len(text.strip()) < MIN_TEXT_CHARS:
+                self._write({"file": path, "status": "insufficient_text",
+                             "error": "Could not extract sufficient text from document"})
+            else:
+                items[custom_id(path)] = {"file": path, "raw_text": text, "max_tokens": None}
+        self._flush()
+        return items
+
+    async def _submit(self, items: Dict[str, Dict[str, Any]]) -> str:
+        """Create a message batch and checkpoint it before anything else happens"""
+        requests = []
+        for key, item in items.items():
+            params = self.structurer.build_message_request(item["raw_text"], item["max_tokens"])
+            # Record the budget actually sent, so truncated answers are only
+            # resubmitted when a larger one is available
+            item["max_tokens"] = params["max_tokens"]
+            requests.append({"custom_id": key, "params": params})
+        batch = await self.client.beta.messages.batches.create(requests=requests)
+        self.checkpoint.add(batch.id, items)
+        logger.info(f"Submitted batch {batch.id} with {len(requests)} resumes")
+        return batch.id
+
+    async def _collect(self, batch_id: str) -> None:
+        """Wait for a batch to end, write its results and resubmit truncated answers"""
+        while True:
+            batch = await self.client.beta.messages.batches.retrieve(batch_id)
+            if batch.processing_status == "ended":
+                break
+            counts = batch.request_counts
+            logger.info(f"Batch {batch_id}: {counts.processing} processing, {counts.succeeded} succeeded")
+            await asyncio.sleep(self.poll_interval)
+
+        items = self.checkpoint.pending[batch_id]
+        retries: Dict[str, Dict[str, Any]] = {}
+        async for entry in await self.client.beta.messages.batches.results(batch_id):
+            item = items.get(entry.custom_id)
+            if item is None:
+                continue
+            full_budget = self.structurer.router.max_tokens
+            message = getattr(entry.result, "message", None)
+            # Items checkpointed without their budget are assumed to have had the full one
+            if (message is not None and message.stop_reason == "max_tokens"
+                    and (item["max_tokens"] or full_budget) < full_budget):
+                retries[entry.custom_id] = {**item, "max_tokens": full_budget}
+                continue
+            self._write(self._record(item, entry.result))
+
+        # Results are on disk before the batch leaves the checkpoint
+        self._flush()
+        if retries:
+            logger.info(f"Resubmitting {len(retries)} answers cut off at max_tokens")
+            retry_batch = await self._submit(retries)
+        self.checkpoint.remove(batch_id)
+        if retries:
+            await self._collect(retry_batch)
+
+    def _record(self, item: Dict[str, Any], result: Any) -> Dict[str, Any]:
+        """Turn one batch result into an output record"""
+        record: Dict[str, Any] = {"file": item["file"]}
+        if result.type != "succeeded":
+            # Errored results carry the API error; canceled and expired ones carry nothing
+            error = getattr(getattr(result, "error", None), "error", None)
+            detail = f"{error.type}: {error.message}" if error else f"Request {result.type}"
+            return {**record, "status": result.type, "error": detail}
+
+        message = result.message
+        try:
+            structured_data = self.structurer.parse_message_text(item["raw_text"], message.content[0].text)
+        except ValidationError as e:
+            return {**record, "status": "validation", "error": str(e)}
+        except ValueError as e:
+            return {**record, "status": "json_extraction", "error": str(e)}
+        return {
+            **record,
+            "status": "succeeded",
+            "model": message.model,
+            "usage": message.usage.model_dump(exclude_none=True),
+            "structured_data": structured_data.model_dump(mode="json"),
+        }
+
+    def _write(self, record: Dict[str, Any]) -> None:
+        self._output.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self.counts[record["status"]] = self.counts.get(record["status"], 0) + 1
+
+    def _flush(self) -> None:
+        self._output.flush()
+        os.fsync(self._output.fileno())
+
+
+def build_importer(args: argparse.Namespace) -> BulkImporter:
+    """Create the importer's services from the command line and environment"""
+    from anthropic import AsyncAnthropic
+
+    api_key = os.getenv("ANTHROPIC_API_KEY")
+    if not api_key:
+        raise SystemExit("ANTHROPIC_API_KEY is required for bulk import")
+
+    client = AsyncAnthropic(
+        api_key=api_key,
+        base_url=os.getenv("ANTHROPIC_BASE_URL") or None,
+        max_retries=int(os.getenv("ANTHROPIC_MAX_RETRIES", "3")),
+    )
+    structurer = build_ai_structurer(client, build_rule_structurer(), build_text_normalizer(), build_model_router())
+    # Files are already parsed in worker processes, so no page-parallel pool
+    parser = build_document_parser(page_parallel=False)
+    return BulkImporter(
+        client=client,
+        parser=parser,
+        structurer=structurer,
+        output_path=args.out,
+        checkpoint=Checkpoint(args.checkpoint or f"{args.out}.checkpoint"),
+        batch_size=args.batch_size,
+        parse_workers=args.parse_workers,
+        poll_interval=args.poll_interval,
+        retry_failed=args.retry_failed,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("input_dir", help="Directory of PDF, DOCX and TXT resumes (searched recursively)")
+    parser.add_argument("--out", required=True, help="JSONL output file (appended to)")
+    parser.add_argument("--checkpoint", help="Checkpoint file (default: <out>.checkpoint)")
+    parser.add_argument("--batch-size", type=int, default=500, help="Resumes per message batch")
+    parser.add_argument("--parse-workers", type=int, default=os.cpu_count() or 1, help="Parse worker processes")
+    parser.add_argument("--poll-interval", type=float, default=60, help="Seconds between batch status checks")
+    parser.add_argument("--retry-failed", action="store_true",
+                        help="Import files whose latest output line is a failure again")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    if not os.path.isdir(args.input_dir):
+        raise SystemExit(f"Not a directory: {args.input_dir}")
+
+    counts = asyncio.run(build_importer(args).run(args.input_dir))
+    print(json.dumps(counts, sort_keys=True))
+    sys.exit(0 if set(counts) <= {"succeeded"} else 1)
+
+
+if __name__ == "__main__":
+    main()
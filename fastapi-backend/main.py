@@ -3,26 +3,143 @@ FastAPI Backend for Resume Document Parsing
 Handles PDF, DOCX, and TXT resume parsing with Claude AI structuring
 """
 
-from fastapi import FastAPI, File, UploadFile, HTTPException
+from fastapi import FastAPI, File, UploadFile, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import FileResponse, JSONResponse, ORJSONResponse, PlainTextResponse, StreamingResponse
+import asyncio
+import json
 import os
-from typing import Optional
+import tempfile
+from urllib.parse import parse_qs
+from contextlib import asynccontextmanager, nullcontext
+from typing import Optional, List, Dict, Any, Awaitable, Tuple, TypeVar
 import logging
 
-from app.services.document_parser import DocumentParser
-from app.services.ai_structurer import AIStructurer
-from app.models.schemas import ParsedResumeResponse, HealthResponse
+# Optional fast JSON serialization for responses
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from app.services.document_parser import DocumentSource
+from app.services.factory import (
+    build_ai_structurer,
+    build_document_parser,
+    build_model_router,
+    build_rule_structurer,
+    build_text_normalizer,
+)
+from app.services.admission import AdmissionController, LaneLimits
+from app.services.anthropic_client import ResilientAnthropicClient
+from app.services.metrics import PipelineMetrics
+from app.services.near_duplicate import NearDuplicateIndex
+from app.services.jobs import Job, JobError, JobQueue, JobQueueFullError, JobRetryError, JobStore
+from app.services.result_cache import ResultCache
+from app.services.single_flight import SingleFlight
+from app.services.parse_pool import ParsePool, PoolSaturatedError
+from app.services.profiler import ProfileStore, Profiler, current_profile
+from app.services.upload_reader import spool_upload, SpooledUpload, UploadTooLargeError
+from app.services.warmup import StartupWarmup
+from app.middleware.admission import AdmissionMiddleware
+from app.middleware.compression import CompressionMiddleware
+from app.middleware.etag import ETagMiddleware
+from app.middleware.profiling import ProfilingMiddleware
+from app.middleware.upload_limit import UploadLimitMiddleware
+from app.models.schemas import (
+    ParsedResumeResponse,
+    BatchParseResponse,
+    JobResponse,
+    ResponseFields,
+    HealthResponse,
+    StructuredResumeData,
+)
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Accepted upload types
+ALLOWED_CONTENT_TYPES = [
+    "application/pdf",
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    "text/plain",
+]
+ALLOWED_EXTENSIONS = [".pdf", ".docx", ".txt"]
+
+# Upload limits
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_MB", "10")) * 1024 * 1024
+MAX_BATCH_UPLOAD_BYTES = int(os.getenv("MAX_BATCH_UPLOAD_MB", "100")) * 1024 * 1024
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+# Asynchronous job mode
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "4"))
+JOB_QUEUE_SIZE = int(os.getenv("JOB_QUEUE_SIZE", "100"))
+JOB_RESULT_TTL_SECONDS = float(os.getenv("JOB_RESULT_TTL_SECONDS", "3600"))
+JOB_MAX_JOBS = int(os.getenv("JOB_MAX_JOBS", "1000"))
+JOB_MAX_WAIT_SECONDS = float(os.getenv("JOB_MAX_WAIT_SECONDS", "30"))
+JOB_MAX_QUEUED_BYTES = int(os.getenv("JOB_MAX_QUEUED_BYTES", str(200 * 1024 * 1024)))
+JOB_SATURATED_RETRIES = int(os.getenv("JOB_SATURATED_RETRIES", "5"))
+
+FALLBACK_MESSAGE = "Resume parsed; AI structuring unavailable, returned rule-based fields"
+NEAR_DUPLICATE_MESSAGE = (
+    "Resume parsed; structured data reused from a near-identical earlier upload, "
+    "edits to its content may not be reflected"
+)
+STRUCTURE_MESSAGES = {"fallback": FALLBACK_MESSAGE, "near_duplicate": NEAR_DUPLICATE_MESSAGE}
+
+# Batch import pipeline
+MAX_BATCH_FILES = int(os.getenv("MAX_BATCH_FILES", "50"))
+BATCH_PARSE_CONCURRENCY = int(os.getenv("BATCH_PARSE_CONCURRENCY", "2"))
+BATCH_STRUCTURE_CONCURRENCY = int(os.getenv("BATCH_STRUCTURE_CONCURRENCY", "4"))
+
+# Uploads above this size are read from a temp file instead of held in memory
+# (capped at Starlette's own multipart spool size, see spool_upload)
+UPLOAD_SPOOL_THRESHOLD = int(os.getenv("UPLOAD_SPOOL_THRESHOLD_KB", "1024")) * 1024
+
+# Warm-up before serving: "off", "startup" (blocks startup) or "background"
+WARMUP_MODE = os.getenv("WARMUP_MODE", "off").lower()
+if WARMUP_MODE not in ("off", "startup", "background"):
+    raise ValueError(f"Unsupported WARMUP_MODE: {WARMUP_MODE}")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start and stop background resources"""
+    job_queue.start()
+    warmup_task = None
+    if WARMUP_MODE == "startup":
+        await startup_warmup.run()
+    elif WARMUP_MODE == "background":
+        warmup_task = asyncio.create_task(startup_warmup.run())
+    yield
+    if warmup_task is not None and not warmup_task.done():
+        warmup_task.cancel()
+    await job_queue.stop()
+    parse_pool.shutdown()
+    document_parser.shutdown()
+    if anthropic_client:
+        await anthropic_client.aclose()
+
+
+# orjson renders large structured resumes several times faster than json
+USE_ORJSON = orjson is not None and os.getenv("ORJSON_RESPONSES_ENABLED", "true").lower() == "true"
+
+
+def _encode_json_line(data: Any) -> bytes:
+    """Serialize one NDJSON event"""
+    if USE_ORJSON:
+        return orjson.dumps(jsonable_encoder(data)) + b"\n"
+    return (json.dumps(jsonable_encoder(data)) + "\n").encode("utf-8")
+
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Resume Parser API",
     description="API for parsing and structuring resume documents",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse if USE_ORJSON else JSONResponse
 )
 
 # CORS configuration - will be restricted to Next.js origin
@@ -32,11 +149,232 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["POST", "GET"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Profile-Id"],
 )
 
+# Abort oversized uploads while they stream in, before they are spooled
+app.add_middleware(
+    UploadLimitMiddleware,
+    limits={
+        "/api/parse-resume": MAX_UPLOAD_BYTES + MULTIPART_OVERHEAD_BYTES,
+        "/api/parse-resume/stream": MAX_UPLOAD_BYTES + MULTIPART_OVERHEAD_BYTES,
+        "/api/parse-resumes": MAX_BATCH_UPLOAD_BYTES + MULTIPART_OVERHEAD_BYTES,
+        "/api/jobs": MAX_UPLOAD_BYTES + MULTIPART_OVERHEAD_BYTES,
+    },
+)
+
+# Opt-in call-tree and allocation profiles of parse requests (X-Profile
+# header), written to a bounded directory
+profiler = None
+if os.getenv("PROFILING_ENABLED", "false").lower() == "true":
+    # Profiles expose code paths and timings, so they are never open to anyone
+    if not os.getenv("PROFILING_TOKEN"):
+        raise ValueError("PROFILING_TOKEN is required when PROFILING_ENABLED=true")
+    profiler = Profiler(
+        ProfileStore(
+            directory=os.getenv("PROFILING_DIR") or os.path.join(tempfile.gettempdir(), "resume-parser-profiles"),
+            max_profiles=int(os.getenv("PROFILING_MAX_PROFILES", "50")),
+        ),
+        token=os.getenv("PROFILING_TOKEN"),
+    )
+    app.add_middleware(
+        ProfilingMiddleware,
+        profiler=profiler,
+        should_profile=lambda scope: scope["path"] in ("/api/parse-resume", "/api/parse-resume/stream"),
+    )
+
+# Parse-only requests get their own lane ahead of AI-structured ones, and both
+# shed load (429/503) instead of queueing past their wait budget
+admission = None
+if os.getenv("ADMISSION_CONTROL_ENABLED", "true").lower() == "true":
+    admission = AdmissionController(
+        lanes={
+            "cheap": LaneLimits(
+                concurrency=int(os.getenv("ADMISSION_CHEAP_CONCURRENCY", "32")),
+                queue_size=int(os.getenv("ADMISSION_CHEAP_QUEUE_SIZE", "64")),
+                max_wait_seconds=float(os.getenv("ADMISSION_CHEAP_MAX_WAIT_SECONDS", "2")),
+            ),
+            "ai": LaneLimits(
+                concurrency=int(os.getenv("ADMISSION_AI_CONCURRENCY", "16")),
+                queue_size=int(os.getenv("ADMISSION_AI_QUEUE_SIZE", "64")),
+                max_wait_seconds=float(os.getenv("ADMISSION_AI_MAX_WAIT_SECONDS", "30")),
+            ),
+        },
+        total_concurrency=int(os.getenv("ADMISSION_TOTAL_CONCURRENCY", "0")) or None,
+    )
+
+
+def _admission_lane(scope: dict) -> Optional[str]:
+    """Lane for a request: "cheap" when it cannot reach Claude, otherwise "ai"."""
+    if scope["path"] not in ("/api/parse-resume", "/api/parse-resume/stream"):
+        return None
+    query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+    structure_with_ai = query.get("structure_with_ai", ["true"])[-1].lower()
+    if structure_with_ai in ("false", "0", "off", "no", "f", "n") or query.get("fields", [""])[-1] == "raw":
+        return "cheap"
+    return "ai"
+
+
+if admission:
+    app.add_middleware(
+        AdmissionMiddleware,
+        controller=admission,
+        classify=_admission_lane,
+        on_reject=lambda error: _record_failure("admission_shed"),
+    )
+
+# Content-hash ETags; GET requests with a matching If-None-Match get a 304
+if os.getenv("ETAG_ENABLED", "true").lower() == "true":
+    app.add_middleware(ETagMiddleware)
+
+# Compress complete responses (streams pass through); added last so it runs outermost
+if os.getenv("RESPONSE_COMPRESSION_ENABLED", "true").lower() == "true":
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=int(os.getenv("RESPONSE_COMPRESSION_MIN_BYTES", "1024")),
+    )
+
 # Initialize services
-document_parser = DocumentParser()
-ai_structurer = AIStructurer(api_key=os.getenv("ANTHROPIC_API_KEY"))
+# Per-stage latency histograms and pipeline counters, served on /metrics
+metrics = None
+if os.getenv("METRICS_ENABLED", "true").lower() == "true":
+    metrics = PipelineMetrics()
+
+# Parser, structurers and router are built by app.services.factory, shared
+# with bulk_import.py so both read the same settings
+document_parser = build_document_parser(metrics)
+
+# Deterministic fast path: partial results without AI, smaller prompts with it
+rule_structurer = build_rule_structurer()
+
+# Prompt-side cleanup of extraction noise
+text_normalizer = build_text_normalizer()
+
+# Shared, rate-limited and circuit-broken Claude client
+anthropic_client = None
+if os.getenv("ANTHROPIC_API_KEY"):
+    anthropic_client = ResilientAnthropicClient(
+        api_key=os.getenv("ANTHROPIC_API_KEY"),
+        base_url=os.getenv("ANTHROPIC_BASE_URL") or None,
+        max_concurrency=int(os.getenv("ANTHROPIC_MAX_CONCURRENCY", "8")),
+        requests_per_second=float(os.getenv("ANTHROPIC_RATE_LIMIT_RPS", "0")),
+        burst=int(os.getenv("ANTHROPIC_RATE_LIMIT_BURST", "10")),
+        max_retries=int(os.getenv("ANTHROPIC_MAX_RETRIES", "3")),
+        timeout=float(os.getenv("ANTHROPIC_TIMEOUT_SECONDS", "60")),
+        max_connections=int(os.getenv("ANTHROPIC_MAX_CONNECTIONS", "20")),
+        failure_threshold=int(os.getenv("ANTHROPIC_CIRCUIT_FAILURE_THRESHOLD", "5")),
+        recovery_timeout=float(os.getenv("ANTHROPIC_CIRCUIT_RECOVERY_SECONDS", "30")),
+    )
+
+# Model and max_tokens per Claude call; short, simple resumes can go to a faster model
+model_router = build_model_router()
+
+ai_structurer = build_ai_structurer(anthropic_client, rule_structurer, text_normalizer, model_router, metrics)
+
+# Bounded pool so CPU-bound parsing never blocks the event loop
+parse_pool = ParsePool(
+    document_parser,
+    kind=os.getenv("PARSE_POOL_KIND", "thread"),
+    max_workers=int(os.getenv("PARSE_POOL_WORKERS", "4")),
+    max_queue=int(os.getenv("PARSE_POOL_QUEUE_SIZE", "16")),
+    retry_after=int(os.getenv("PARSE_POOL_RETRY_AFTER_SECONDS", "2")),
+)
+
+# Content-addressed cache for repeat uploads of the same file
+result_cache = None
+if os.getenv("RESULT_CACHE_ENABLED", "true").lower() == "true":
+    result_cache = ResultCache(
+        max_entries=int(os.getenv("RESULT_CACHE_MAX_ENTRIES", "256")),
+        max_bytes=int(os.getenv("RESULT_CACHE_MAX_MB", "64")) * 1024 * 1024,
+        ttl_seconds=float(os.getenv("RESULT_CACHE_TTL_SECONDS", "3600")),
+        disk_dir=os.getenv("RESULT_CACHE_DIR") or None,
+        disk_max_bytes=int(os.getenv("RESULT_CACHE_DISK_MAX_MB", "512")) * 1024 * 1024,
+    )
+# Similarity index so lightly edited re-uploads reuse an earlier structuring
+near_duplicate_index = None
+if os.getenv("NEAR_DUPLICATE_ENABLED", "true").lower() == "true":
+    near_duplicate_index = NearDuplicateIndex(
+        threshold=float(os.getenv("NEAR_DUPLICATE_THRESHOLD", "0.95")),
+        max_entries=int(os.getenv("NEAR_DUPLICATE_MAX_ENTRIES", "2048")),
+        ttl_seconds=float(os.getenv("NEAR_DUPLICATE_TTL_SECONDS", "3600")),
+        normalizer=text_normalizer,
+    )
+
+# Concurrent structurings of the same upload share one Claude call
+single_flight = None
+if os.getenv("SINGLE_FLIGHT_ENABLED", "true").lower() == "true":
+    single_flight = SingleFlight()
+
+# Optional pre-parse of embedded samples and Claude connection setup (WARMUP_MODE)
+startup_warmup = StartupWarmup(parse_pool, anthropic_client)
+
+
+async def _run_parse_job(job: Job, payload: Tuple[bytes, str]) -> Dict[str, Any]:
+    """
+    Parse and structure one queued upload (runs on a job worker)
+
+    Args:
+        job: Job being processed
+        payload: Tuple of (file bytes, content key)
+
+    Returns:
+        ParsedResumeResponse-shaped result
+
+    Raises:
+        JobError: With the 4xx status the synchronous endpoint would have used
+        JobRetryError: When the parse pool is saturated; the queue retries
+            the job after Retry-After instead of failing it
+    """
+    content, cache_key = payload
+    try:
+        raw_text, cached = await _parse_source(content, job.filename, cache_key)
+
+        structured_data = None
+        source = None
+        if job.structure_with_ai:
+            structured_data, source = await _structure_text(raw_text, cache_key)
+            cached = cached and source == "cache"
+        elif rule_structurer:
+            structured_data = rule_structurer.structure(raw_text)
+    except HTTPException as e:
+        if e.status_code == 503:
+            retry_after = float((e.headers or {}).get("Retry-After", parse_pool.retry_after))
+            raise JobRetryError(e.detail, retry_after, e.status_code)
+        raise JobError(e.detail, e.status_code)
+
+    return {
+        "success": True,
+        "filename": job.filename,
+        "raw_text": raw_text,
+        "structured_data": structured_data,
+        "message": STRUCTURE_MESSAGES.get(source, "Resume parsed successfully"),
+        "cached": cached,
+        "near_duplicate": source == "near_duplicate"
+    }
+
+
+job_store = JobStore(ttl_seconds=JOB_RESULT_TTL_SECONDS, max_jobs=JOB_MAX_JOBS)
+job_queue = JobQueue(
+    job_store,
+    _run_parse_job,
+    workers=JOB_WORKERS,
+    queue_size=JOB_QUEUE_SIZE,
+    max_payload_bytes=JOB_MAX_QUEUED_BYTES,
+    max_retries=JOB_SATURATED_RETRIES
+)
+
+
+def _job_response(job: Job, fields: ResponseFields = "both") -> Dict[str, Any]:
+    return {
+        "job_id": job.id,
+        "status": job.status,
+        "filename": job.filename,
+        "created_at": job.created_at,
+        "updated_at": job.updated_at,
+        "result": _select_fields(dict(job.result), fields) if job.result else None,
+        "error": job.error,
+        "status_code": job.status_code
+    }
 
 
 @app.get("/", response_model=HealthResponse)
@@ -49,69 +387,368 @@ async def root():
     }
 
 
-@app.post("/api/parse-resume", response_model=ParsedResumeResponse)
-async def parse_resume(
-    file: UploadFile = File(...),
-    structure_with_ai: bool = True
-):
+def _stage(name: str):
+    """Time a pipeline stage when metrics are enabled"""
+    return metrics.stage(name) if metrics else nullcontext()
+
+
+def _record_failure(reason: str) -> None:
+    if metrics:
+        metrics.failure(reason)
+
+
+def _select_fields(result: Dict[str, Any], fields: ResponseFields) -> Dict[str, Any]:
     """
-    Parse uploaded resume document (PDF, DOCX, TXT)
+    Drop the parts of a parse result the client did not ask for
+
+    Args:
+        result: Result dict with raw_text and structured_data
+        fields: "structured", "raw" or "both"
+
+    Returns:
+        The same dict, with the unrequested part set to None
+    """
+    if fields == "structured":
+        result["raw_text"] = None
+    elif fields == "raw":
+        result["structured_data"] = None
+    return result
+
+
+def _validate_file_type(file: UploadFile) -> None:
+    """
+    Reject uploads that are not PDF, DOCX or TXT
+
+    Args:
+        file: Uploaded resume file
+
+    Raises:
+        HTTPException: 400 if the type is unsupported
+    """
+    file_ext = os.path.splitext(file.filename)[1].lower()
+
+    if file.content_type not in ALLOWED_CONTENT_TYPES and file_ext not in ALLOWED_EXTENSIONS:
+        _record_failure("unsupported_type")
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported file type. Allowed types: PDF, DOCX, TXT. Got: {file.content_type}"
+        )
+
+
+async def _read_upload(file: UploadFile) -> SpooledUpload:
+    """
+    Stream an upload in chunks, hashing it and enforcing the size limit
 
     Args:
         file: Uploaded resume file
-        structure_with_ai: Whether to use Claude AI to structure the parsed content
 
     Returns:
-        ParsedResumeResponse with structured resume data
+        SpooledUpload with size and content hash
+
+    Raises:
+        HTTPException: 400 for empty or oversized uploads
     """
     try:
-        # Validate file type
-        allowed_types = ["application/pdf", "application/vnd.openxmlformats-officedocument.wordprocessingml.document", "text/plain"]
-        allowed_extensions = [".pdf", ".docx", ".txt"]
+        with _stage("upload_read"):
+            upload = await spool_upload(file, MAX_UPLOAD_BYTES, spool_threshold=UPLOAD_SPOOL_THRESHOLD)
+    except UploadTooLargeError as e:
+        _record_failure("upload_too_large")
+        raise HTTPException(status_code=400, detail=str(e))
 
-        file_ext = os.path.splitext(file.filename)[1].lower()
+    if upload.size == 0:
+        _record_failure("empty_file")
+        raise HTTPException(status_code=400, detail="Uploaded file is empty")
 
-        if file.content_type not in allowed_types and file_ext not in allowed_extensions:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Unsupported file type. Allowed types: PDF, DOCX, TXT. Got: {file.content_type}"
-            )
+    if metrics:
+        metrics.ingested_bytes.inc(upload.size, file_type=_file_type(file.filename))
 
-        # Read file content
-        content = await file.read()
+    logger.info(f"Parsing file: {file.filename} ({file.content_type}, {upload.size} bytes)")
+    return upload
 
-        if len(content) == 0:
-            raise HTTPException(status_code=400, detail="Uploaded file is empty")
 
-        # Limit file size to 10MB
-        if len(content) > 10 * 1024 * 1024:
-            raise HTTPException(status_code=400, detail="File size exceeds 10MB limit")
+def _file_type(filename: str) -> str:
+    """Lower-case extension without the dot, for metric labels"""
+    file_ext = os.path.splitext(filename)[1].lower().lstrip(".")
+    return file_ext if f".{file_ext}" in ALLOWED_EXTENSIONS else "other"
 
-        logger.info(f"Parsing file: {file.filename} ({file.content_type})")
 
-        # Parse document to extract raw text
-        raw_text = document_parser.parse(content, file.filename)
+async def _parse_source(source: DocumentSource, filename: str, cache_key: str) -> Tuple[str, bool]:
+    """
+    Extract text from a document, using the result cache when possible
 
-        if not raw_text or len(raw_text.strip()) < 50:
+    Args:
+        source: Raw file bytes or a seekable binary stream
+        filename: Original filename with extension
+        cache_key: Content key of the upload
+
+    Returns:
+        Tuple of (raw text, whether the text came from cache)
+
+    Raises:
+        HTTPException: 422/503 for unreadable documents or a saturated pool
+    """
+    # Profiled requests always parse, so the profile shows the extraction
+    use_cache = result_cache is not None and current_profile.get() is None
+    raw_text = result_cache.get("parse", cache_key) if use_cache else None
+    cached = raw_text is not None
+    if raw_text is None:
+        try:
+            with metrics.parse(_file_type(filename)) if metrics else nullcontext():
+                raw_text = await parse_pool.parse(source, filename)
+        except PoolSaturatedError as e:
+            _record_failure("pool_saturated")
             raise HTTPException(
-                status_code=422,
-                detail="Could not extract sufficient text from document. Please ensure the file contains readable text."
+                status_code=503,
+                detail="Server is busy parsing other documents. Please retry shortly.",
+                headers={"Retry-After": str(e.retry_after)}
             )
+        except Exception:
+            _record_failure("parse_error")
+            raise
+
+        if raw_text and len(raw_text.strip()) >= 50 and result_cache:
+            result_cache.set("parse", cache_key, raw_text)
+
+    if not raw_text or len(raw_text.strip()) < 50:
+        _record_failure("insufficient_text")
+        raise HTTPException(
+            status_code=422,
+            detail="Could not extract sufficient text from document. Please ensure the file contains readable text."
+        )
+
+    return raw_text, cached
+
+
+async def _extract_text(file: UploadFile) -> Tuple[str, str, bool]:
+    """
+    Read an upload and extract its text, using the result cache when possible
+
+    Args:
+        file: Uploaded resume file
+
+    Returns:
+        Tuple of (raw text, content key, whether the text came from cache)
+
+    Raises:
+        HTTPException: 400/422/503 for invalid, unreadable or rejected uploads
+    """
+    upload = await _read_upload(file)
+    raw_text, cached = await _parse_source(upload.open(), file.filename, upload.sha256)
+    return raw_text, upload.sha256, cached
+
+
+async def _structure_text(
+    raw_text: str, cache_key: str
+) -> Tuple[Optional[StructuredResumeData], str]:
+    """
+    Structure extracted text with Claude, using the result cache when possible
+
+    If Claude fails, or the client's circuit breaker is open, the rule-based
+    fast path is used instead so the caller still gets a partial result.
+    Concurrent calls for the same content share one structuring.
+
+    Args:
+        raw_text: Extracted resume text
+        cache_key: Content key of the upload
+
+    Returns:
+        Tuple of (structured data or None, source): source is "cache" for
+        an exact repeat upload, "near_duplicate" for data reused from a
+        similar upload, "fallback" for rule-based fields after a Claude
+        failure and "claude" otherwise
+    """
+    if single_flight is None:
+        return await _structure_text_once(raw_text, cache_key)
+    return await single_flight.run(("structure", cache_key), lambda: _structure_text_once(raw_text, cache_key))
+
+
+async def _structure_text_once(raw_text: str, cache_key: str) -> Tuple[Optional[StructuredResumeData], str]:
+    """Uncoalesced body of _structure_text"""
+    cached_json = result_cache.get("structure", cache_key) if result_cache else None
+    if cached_json is not None:
+        return StructuredResumeData.model_validate_json(cached_json), "cache"
+
+    near_duplicate = _near_duplicate_structure(raw_text)
+    if near_duplicate is not None:
+        return near_duplicate, "near_duplicate"
+
+    logger.info("Structuring content with Claude AI")
+    structured_data = await ai_structurer.structure_resume(raw_text)
+
+    if structured_data is None and rule_structurer:
+        logger.warning("AI structuring failed. Falling back to rule-based structuring.")
+        return rule_structurer.structure(raw_text), "fallback"
+
+    # Dummy data (no API key) and failed structurings are not cached
+    if structured_data is not None and ai_structurer.client:
+        _remember_structure(raw_text, cache_key, structured_data)
+
+    return structured_data, "claude"
+
+
+def _near_duplicate_structure(raw_text: str) -> Optional[StructuredResumeData]:
+    """
+    Reuse the structuring of a near-identical earlier upload
+
+    The stored entry may belong to a different person who used the same
+    template, so its personal info is never reused: personal_info holds only
+    the rule-based contact fields found in the new text, None where nothing
+    was found.
+
+    The rest is the other upload's structuring, so edits to experience,
+    education or skills are not reflected. Callers flag the response as
+    near_duplicate (never cached), and the result is not stored in the
+    result cache, so a repeat of this upload is flagged the same way.
+
+    Args:
+        raw_text: Extracted resume text
+
+    Returns:
+        Adapted StructuredResumeData, or None if no stored text is similar enough
+    """
+    if near_duplicate_index is None:
+        return None
+    match = near_duplicate_index.lookup(raw_text)
+    if match is None:
+        return None
+
+    structured_data = StructuredResumeData.model_validate_json(match.value)
+    structured_data.personal_info = rule_structurer.extract_personal_info(raw_text) if rule_structurer else None
+    return structured_data
+
+
+def _remember_structure(raw_text: str, cache_key: str, structured_data: StructuredResumeData) -> None:
+    """Store a Claude structuring in the result cache and the near-duplicate index"""
+    serialized = structured_data.model_dump_json()
+    if result_cache:
+        result_cache.set("structure", cache_key, serialized)
+    if near_duplicate_index:
+        near_duplicate_index.add(cache_key, raw_text, serialized)
+
+
+T = TypeVar("T")
 
-        # Structure with AI if requested
+
+async def _cancel_on_disconnect(request: Request, awaitable: Awaitable[T]) -> T:
+    """
+    Await work for a request, cancelling it if the client disconnects first
+
+    Starlette keeps running a handler after its client has gone, so without
+    this a closed tab would still wait for (and pay for) a Claude call.
+
+    Args:
+        request: Request whose body has already been read
+        awaitable: Work to run
+
+    Returns:
+        The work's result
+
+    Raises:
+        HTTPException: 499 if the client disconnected before the work finished
+    """
+    async def disconnected() -> None:
+        # With the body consumed, the next ASGI message is the disconnect
+        while (await request.receive())["type"] != "http.disconnect":
+            pass
+
+    work = asyncio.ensure_future(awaitable)
+    watcher = asyncio.ensure_future(disconnected())
+    try:
+        await asyncio.wait({work, watcher}, return_when=asyncio.FIRST_COMPLETED)
+    except asyncio.CancelledError:
+        work.cancel()
+        raise
+    finally:
+        watcher.cancel()
+
+    if work.done():
+        return work.result()
+    work.cancel()
+    logger.info("Client disconnected; abandoning structuring")
+    _record_failure("client_disconnected")
+    raise HTTPException(status_code=499, detail="Client closed request")
+
+
+@app.post("/api/parse-resume", response_model=ParsedResumeResponse)
+async def parse_resume(
+    request: Request,
+    file: UploadFile = File(...),
+    structure_with_ai: bool = True,
+    fields: ResponseFields = "both"
+):
+    """
+    Parse uploaded resume document (PDF, DOCX, TXT)
+
+    Args:
+        file: Uploaded resume file
+        structure_with_ai: Whether to use Claude AI to structure the parsed content
+        fields: Return "structured" data only, "raw" text only, or "both"
+
+    Returns:
+        ParsedResumeResponse with structured resume data
+    """
+    try:
+        _validate_file_type(file)
+
+        raw_text, cache_key, cached = await _extract_text(file)
+
+        # Structure with AI if requested, otherwise with the rule-based fast path
         structured_data = None
-        if structure_with_ai:
-            logger.info("Structuring content with Claude AI")
-            structured_data = await ai_structurer.structure_resume(raw_text)
+        source = None
+        if fields == "raw":
+            pass
+        elif structure_with_ai:
+            structured_data, source = await _cancel_on_disconnect(request, _structure_text(raw_text, cache_key))
+            cached = cached and source == "cache"
+        elif rule_structurer:
+            structured_data = rule_structurer.structure(raw_text)
 
-        return {
+        return _select_fields({
             "success": True,
             "filename": file.filename,
             "raw_text": raw_text,
             "structured_data": structured_data,
-            "message": "Resume parsed successfully"
-        }
+            "message": STRUCTURE_MESSAGES.get(source, "Resume parsed successfully"),
+            "cached": cached,
+            "near_duplicate": source == "near_duplicate"
+        }, fields)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error parsing resume: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to parse resume: {str(e)}"
+        )
+
+
+@app.post("/api/parse-resume/stream")
+async def parse_resume_stream(
+    file: UploadFile = File(...),
+    structure_with_ai: bool = True,
+    fields: ResponseFields = "both"
+):
+    """
+    Parse uploaded resume and stream structured sections as NDJSON
 
+    Upload validation and text extraction happen before the stream starts, so
+    those failures still return regular HTTP errors. The stream then emits a
+    "start" event with the raw text, "item"/"section" events as Claude
+    finishes each part of the resume, and a final "done" (or "error") event.
+
+    Args:
+        file: Uploaded resume file
+        structure_with_ai: Whether to use Claude AI to structure the parsed content
+        fields: "structured" omits raw_text from the start event; "raw" sends
+            only the start and done events
+
+    Returns:
+        StreamingResponse of newline-delimited JSON events
+    """
+    try:
+        _validate_file_type(file)
+        raw_text, cache_key, cached = await _extract_text(file)
     except HTTPException:
         raise
     except Exception as e:
@@ -121,6 +758,284 @@ async def parse_resume(
             detail=f"Failed to parse resume: {str(e)}"
         )
 
+    async def events():
+        nonlocal cached
+        near_duplicate = False
+        yield {
+            "event": "start",
+            "filename": file.filename,
+            "raw_text": None if fields == "structured" else raw_text
+        }
+
+        if fields == "raw":
+            pass
+        elif structure_with_ai:
+            cached_json = result_cache.get("structure", cache_key) if result_cache else None
+            if cached_json is not None:
+                structured_data = StructuredResumeData.model_validate_json(cached_json)
+            else:
+                cached = False
+                structured_data = _near_duplicate_structure(raw_text)
+                near_duplicate = structured_data is not None
+            if structured_data is not None:
+                for event in ai_structurer.iter_section_events(structured_data):
+                    yield event
+            else:
+                logger.info("Streaming structured content with Claude AI")
+                async for event in ai_structurer.stream_structure_resume(raw_text):
+                    if event["event"] == "error":
+                        if not rule_structurer:
+                            yield event
+                            return
+                        # Sections sent so far are superseded by the fallback
+                        yield {"event": "fallback", "detail": FALLBACK_MESSAGE}
+                        for fallback_event in ai_structurer.iter_section_events(rule_structurer.structure(raw_text)):
+                            yield fallback_event
+                        break
+                    if event["event"] == "complete":
+                        # Dummy data (no API key) and truncated output are not cached
+                        if not event["partial"] and ai_structurer.client:
+                            _remember_structure(raw_text, cache_key, event["structured_data"])
+                        continue
+                    yield event
+        elif rule_structurer:
+            for event in ai_structurer.iter_section_events(rule_structurer.structure(raw_text)):
+                yield event
+
+        yield {
+            "event": "done",
+            "success": True,
+            "cached": cached,
+            "near_duplicate": near_duplicate,
+            "message": NEAR_DUPLICATE_MESSAGE if near_duplicate else "Resume parsed successfully"
+        }
+
+    async def ndjson():
+        async for event in events():
+            yield _encode_json_line(event)
+
+    return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
+
+@app.post("/api/parse-resumes", response_model=BatchParseResponse)
+async def parse_resumes(
+    files: List[UploadFile] = File(...),
+    structure_with_ai: bool = True,
+    fields: ResponseFields = "both"
+):
+    """
+    Parse many resume documents in one request
+
+    Files flow through a two-stage pipeline (parse, then AI structuring) with a
+    separate concurrency limit per stage, so one file can be structured while
+    the next is still being parsed. Failures are reported per file.
+
+    Args:
+        files: Uploaded resume files
+        structure_with_ai: Whether to use Claude AI to structure the parsed content
+        fields: Return "structured" data only, "raw" text only, or "both"
+
+    Returns:
+        BatchParseResponse with one result per file, in upload order
+    """
+    if len(files) > MAX_BATCH_FILES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many files. A batch may contain at most {MAX_BATCH_FILES} files."
+        )
+
+    parse_slots = asyncio.Semaphore(BATCH_PARSE_CONCURRENCY)
+    structure_slots = asyncio.Semaphore(BATCH_STRUCTURE_CONCURRENCY)
+
+    async def process(file: UploadFile) -> Dict[str, Any]:
+        try:
+            _validate_file_type(file)
+
+            async with parse_slots:
+                raw_text, cache_key, cached = await _extract_text(file)
+
+            structured_data = None
+            source = None
+            if fields == "raw":
+                pass
+            elif structure_with_ai:
+                async with structure_slots:
+                    structured_data, source = await _structure_text(raw_text, cache_key)
+                cached = cached and source == "cache"
+            elif rule_structurer:
+                structured_data = rule_structurer.structure(raw_text)
+
+            return _select_fields({
+                "filename": file.filename,
+                "success": True,
+                "raw_text": raw_text,
+                "structured_data": structured_data,
+                "cached": cached,
+                "near_duplicate": source == "near_duplicate"
+            }, fields)
+
+        except HTTPException as e:
+            return {
+                "filename": file.filename,
+                "success": False,
+                "error": e.detail,
+                "status_code": e.status_code
+            }
+        except Exception as e:
+            logger.error(f"Error parsing resume {file.filename} in batch: {str(e)}", exc_info=True)
+            return {
+                "filename": file.filename,
+                "success": False,
+                "error": f"Failed to parse resume: {str(e)}",
+                "status_code": 500
+            }
+
+    results = await asyncio.gather(*(process(file) for file in files))
+    succeeded = sum(1 for result in results if result["success"])
+
+    return {
+        "success": succeeded > 0,
+        "total": len(results),
+        "succeeded": succeeded,
+        "failed": len(results) - succeeded,
+        "results": results,
+        "message": f"Parsed {succeeded} of {len(results)} resumes"
+    }
+
+
+@app.post("/api/jobs", response_model=JobResponse, status_code=202)
+async def create_parse_job(
+    file: UploadFile = File(...),
+    structure_with_ai: bool = True
+):
+    """
+    Queue a resume for asynchronous parsing and structuring
+
+    The upload is validated and read before returning; parsing and Claude
+    structuring run on background workers. Poll GET /api/jobs/{job_id}.
+
+    Args:
+        file: Uploaded resume file
+        structure_with_ai: Whether to use Claude AI to structure the parsed content
+
+    Returns:
+        JobResponse for the queued job (HTTP 202)
+    """
+    _validate_file_type(file)
+
+    upload = await _read_upload(file)
+    content = upload.read_bytes()
+
+    try:
+        job = job_store.create(file.filename, structure_with_ai)
+        try:
+            job_queue.submit(job, (content, upload.sha256), size=len(content))
+        except JobQueueFullError:
+            job_store.remove(job.id)
+            raise
+    except JobQueueFullError:
+        raise HTTPException(
+            status_code=503,
+            detail="Too many queued jobs. Please retry shortly.",
+            headers={"Retry-After": "5"}
+        )
+
+    logger.info(f"Queued parse job {job.id} for {file.filename}")
+    return _job_response(job)
+
+
+@app.get("/api/jobs/{job_id}", response_model=JobResponse)
+async def get_parse_job(
+    job_id: str,
+    wait: float = Query(0, ge=0, description="Seconds to long-poll for completion"),
+    fields: ResponseFields = "both"
+):
+    """
+    Get the status of a parse job, optionally waiting for it to finish
+
+    Args:
+        job_id: Identifier returned by POST /api/jobs
+        wait: Seconds to hold the request open until the job finishes
+        fields: Return "structured" data only, "raw" text only, or "both"
+
+    Returns:
+        JobResponse with the result once the job has succeeded
+    """
+    job = job_store.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found or expired")
+
+    await job_store.wait(job, min(wait, JOB_MAX_WAIT_SECONDS))
+    return _job_response(job, fields)
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """
+    Pipeline metrics in the Prometheus text exposition format
+
+    Returns:
+        Stage latency histograms and pipeline counters
+    """
+    if metrics is None:
+        raise HTTPException(status_code=404, detail="Metrics are disabled")
+    return PlainTextResponse(metrics.render(), media_type=PipelineMetrics.CONTENT_TYPE)
+
+
+def _require_profiler(request: Request) -> Profiler:
+    """Return the profiler, or raise 404/403 if profiling is off or the token is wrong"""
+    if profiler is None:
+        raise HTTPException(status_code=404, detail="Profiling is disabled")
+    if not profiler.authorized(request.headers.get("X-Profile")):
+        raise HTTPException(status_code=403, detail="Invalid profiling token")
+    return profiler
+
+
+@app.get("/api/profiles")
+async def list_profiles(request: Request):
+    """
+    List saved request profiles, newest first
+
+    Returns:
+        ID, label, status and duration of each stored profile
+    """
+    return {"profiles": _require_profiler(request).store.list()}
+
+
+@app.get("/api/profiles/{profile_id}")
+async def get_profile(profile_id: str, request: Request):
+    """
+    Get a saved request profile
+
+    Args:
+        profile_id: Value of a profiled response's X-Profile-Id header
+
+    Returns:
+        Per-stage top functions by cumulative time and allocation statistics
+    """
+    summary = _require_profiler(request).store.load(profile_id)
+    if summary is None:
+        raise HTTPException(status_code=404, detail="Profile not found or evicted")
+    return summary
+
+
+@app.get("/api/profiles/{profile_id}/{stage}.prof")
+async def download_profile_stats(profile_id: str, stage: str, request: Request):
+    """
+    Download a stage's full cProfile stats (for pstats or snakeviz)
+
+    Args:
+        profile_id: Profile ID
+        stage: Stage name from the profile summary
+
+    Returns:
+        Marshalled pstats file
+    """
+    path = _require_profiler(request).store.stats_path(profile_id, stage)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Profile stage not found or evicted")
+    return FileResponse(path, media_type="application/octet-stream", filename=f"{profile_id}.{stage}.prof")
+
 
 @app.get("/health")
 async def health_check():
@@ -132,7 +1047,19 @@ async def health_check():
         "services": {
             "document_parser": "ready",
             "ai_structurer": "ready" if anthropic_configured else "not_configured"
-        }
+        },
+        "cache": result_cache.stats() if result_cache else {"enabled": False},
+        "near_duplicates": near_duplicate_index.stats() if near_duplicate_index else {"enabled": False},
+        "single_flight": single_flight.stats() if single_flight else {"enabled": False},
+        "parse_pool": parse_pool.stats(),
+        "pdf_engines": {"engine": document_parser.pdf_engine, "available": document_parser.pdf_engines},
+        "admission": admission.stats() if admission else {"enabled": False},
+        "profiling": profiler.stats() if profiler else {"enabled": False},
+        "ai_client": anthropic_client.stats() if anthropic_client else {"configured": False},
+        "model_routing": {**model_router.describe(), "prompt_caching": ai_structurer.prompt_caching},
+        "jobs": {**job_store.stats(), **job_queue.stats()},
+        "warmup": {"mode": WARMUP_MODE, **startup_warmup.timings},
+        "metrics": metrics.summary() if metrics else {"enabled": False}
     }
 
 
@@ -0,0 +1,65 @@
+"""
+Shared fixtures: a local fake Anthropic server (tools/fake_anthropic.py)
+running in a background thread, and a client for the API app
+"""
+
+import os
+import threading
+import time
+
+# Caches would answer repeat uploads without reaching the structurer; tests
+# that need them install their own on main. Set before main is imported.
+os.environ["RESULT_CACHE_ENABLED"] = "false"
+os.environ["NEAR_DUPLICATE_ENABLED"] = "false"
+
+import pytest  # noqa: E402
+import uvicorn  # noqa: E402
+
+from tools.fake_anthropic import FakeConfig, create_app  # noqa: E402
+
+
+class FakeAnthropicServer:
+    """Handle on a running fake server; config changes apply to the next request"""
+
+    def __init__(self, config: FakeConfig):
+        self.config = config
+        self._server = uvicorn.Server(
+            uvicorn.Config(create_app(config), host="127.0.0.1", port=0, log_level="warning")
+        )
+        self._thread = threading.Thread(target=self._server.run, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        port = self._server.servers[0].sockets[0].getsockname()[1]
+        return f"http://127.0.0.1:{port}"
+
+    def start(self) -> "FakeAnthropicServer":
+        self._thread.start()
+        deadline = time.monotonic() + 10
+        while not self._server.started:
+            if time.monotonic() > deadline:
+                raise RuntimeError("Fake Anthropic server did not start")
+            time.sleep(0.01)
+        return self
+
+    def stop(self) -> None:
+        self._server.should_exit = True
+        self._thread.join(timeout=10)
+
+
+@pytest.fixture
+def fake_anthropic():
+    """Fake Messages API answering immediately, without failures"""
+    server = FakeAnthropicServer(FakeConfig(latency_ms=0, batch_seconds=0.2)).start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture(scope="session")
+def test_client():
+    """Client for main.app; one lifespan per session, since shutdown stops the parse pool"""
+    import main
+    from fastapi.testclient import TestClient
+
+    with TestClient(main.app) as client:
+        yield client
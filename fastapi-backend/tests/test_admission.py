@@ -0,0 +1,227 @@
+"""
+Tests for admission control: lane priority, shedding and Retry-After
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.middleware import admission as admission_middleware
+from app.services import admission
+from app.services.admission import AdmissionController, AdmissionRejectedError, LaneLimits
+
+
+class Clock:
+    """Manually advanced stand-in for time.monotonic"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(admission, "time", SimpleNamespace(monotonic=clock))
+    return clock
+
+
+def _controller(cheap_queue=4, ai_queue=1, max_wait=30.0, total_concurrency=1):
+    return AdmissionController(
+        lanes={
+            "cheap": LaneLimits(concurrency=1, queue_size=cheap_queue, max_wait_seconds=max_wait),
+            "ai": LaneLimits(concurrency=1, queue_size=ai_queue, max_wait_seconds=max_wait),
+        },
+        total_concurrency=total_concurrency,
+    )
+
+
+async def _hold(controller, lane, release, order=None):
+    """Hold a slot in a lane until release is set"""
+    async with controller.admit(lane):
+        if order is not None:
+            order.append(lane)
+        await release.wait()
+
+
+async def _settle():
+    for _ in range(3):
+        await asyncio.sleep(0)
+
+
+def test_freed_slots_go_to_the_higher_priority_lane_first():
+    async def scenario():
+        controller = _controller()
+        order = []
+        release = asyncio.Event()
+        holder = asyncio.create_task(_hold(controller, "ai", release))
+        await _settle()
+        # Queued low priority first, high priority second
+        waiters = [asyncio.create_task(_hold(controller, lane, release, order)) for lane in ("ai", "cheap")]
+        await _settle()
+        assert controller.stats()["lanes"]["ai"]["queued"] == 1
+        assert controller.stats()["lanes"]["cheap"]["queued"] == 1
+
+        release.set()
+        await asyncio.gather(holder, *waiters)
+        return order
+
+    assert asyncio.run(scenario()) == ["cheap", "ai"]
+
+
+def test_low_priority_requests_are_shed_first_when_full():
+    async def scenario():
+        controller = _controller(cheap_queue=4, ai_queue=1)
+        release = asyncio.Event()
+        holder = asyncio.create_task(_hold(controller, "cheap", release))
+        await _settle()
+        queued = [asyncio.create_task(_hold(controller, "ai", release))]
+        queued += [asyncio.create_task(_hold(controller, "cheap", release)) for _ in range(2)]
+        await _settle()
+
+        # The AI lane's queue is full while the cheap lane still queues
+        with pytest.raises(AdmissionRejectedError) as shed:
+            async with controller.admit("ai"):
+                pass
+        queued.append(asyncio.create_task(_hold(controller, "cheap", release)))
+        await _settle()
+        stats = controller.stats()["lanes"]
+
+        release.set()
+        await asyncio.gather(holder, *queued)
+        return shed.value, stats, controller.stats()["lanes"]
+
+    error, during, after = asyncio.run(scenario())
+
+    assert (error.lane, error.status_code, error.reason) == ("ai", 429, "queue full")
+    # No latency observed yet, so clients are told to wait out the budget
+    assert error.retry_after == 30
+    assert during["cheap"]["queued"] == 3 and during["cheap"]["rejected_queue_full"] == 0
+    assert after["ai"]["rejected_queue_full"] == 1
+    assert (after["cheap"]["admitted"], after["ai"]["admitted"]) == (4, 1)
+
+
+def test_queue_full_retry_after_follows_observed_latency(clock):
+    async def scenario():
+        controller = _controller(max_wait=10.0, total_concurrency=None)
+        # One AI request observed taking 4 seconds
+        async with controller.admit("ai"):
+            clock.now += 4
+        release = asyncio.Event()
+        holders = [asyncio.create_task(_hold(controller, "ai", release)) for _ in range(2)]
+        await _settle()
+
+        with pytest.raises(AdmissionRejectedError) as shed:
+            async with controller.admit("ai"):
+                pass
+        release.set()
+        await asyncio.gather(*holders)
+        return shed.value, controller.stats()["lanes"]["ai"]
+
+    error, stats = asyncio.run(scenario())
+
+    # One active, one queued (a queue of one): this request is past the queue
+    # and would have waited 2 x 4s
+    assert (error.status_code, error.retry_after) == (429, 8)
+    assert stats["rejected_queue_full"] == 1
+
+
+def test_predicted_wait_over_budget_gets_503(clock):
+    async def scenario():
+        controller = _controller(ai_queue=4, max_wait=5.0, total_concurrency=None)
+        async with controller.admit("ai"):
+            clock.now += 4
+        release = asyncio.Event()
+        holders = [asyncio.create_task(_hold(controller, "ai", release)) for _ in range(2)]
+        await _settle()
+
+        # One active, one queued: this request would wait 2 x 4s = 8s > 5s
+        with pytest.raises(AdmissionRejectedError) as shed:
+            async with controller.admit("ai"):
+                pass
+        stats = controller.stats()["lanes"]["ai"]
+        release.set()
+        await asyncio.gather(*holders)
+        return shed.value, stats
+
+    error, stats = asyncio.run(scenario())
+
+    assert (error.status_code, error.retry_after) == (503, 8)
+    assert stats["rejected_latency"] == 1
+    assert stats["latency_ms_avg"] == 4000.0
+
+
+def test_queued_request_past_its_budget_times_out():
+    async def scenario():
+        controller = _controller(max_wait=0.05)
+        release = asyncio.Event()
+        holder = asyncio.create_task(_hold(controller, "ai", release))
+        await _settle()
+        with pytest.raises(AdmissionRejectedError) as shed:
+            async with controller.admit("cheap"):
+                pass
+        release.set()
+        await holder
+        return shed.value, controller.stats()
+
+    error, stats = asyncio.run(scenario())
+
+    assert (error.status_code, error.reason, error.retry_after) == (503, "queue wait timed out", 1)
+    assert stats["lanes"]["cheap"]["timed_out"] == 1
+    assert stats["lanes"]["cheap"]["queued"] == 0
+    assert stats["total_active"] == 0
+
+
+async def _call(middleware, path):
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "method": "POST", "path": path, "headers": [], "query_string": b""}
+    await middleware(scope, None, send)
+    return sent
+
+
+def test_middleware_sheds_with_status_and_retry_after(clock):
+    async def scenario():
+        release = asyncio.Event()
+        rejected = []
+
+        async def app(scope, receive, send):
+            clock.now += 4
+            await release.wait()
+            await send({"type": "http.response.start", "status": 200, "headers": []})
+            await send({"type": "http.response.body", "body": b"{}"})
+
+        controller = _controller(ai_queue=4, max_wait=5.0, total_concurrency=None)
+        middleware = admission_middleware.AdmissionMiddleware(
+            app, controller,
+            classify=lambda scope: "ai" if scope["path"] == "/api/parse-resume" else None,
+            on_reject=rejected.append,
+        )
+        release.set()
+        await _call(middleware, "/api/parse-resume")
+        release.clear()
+
+        holders = [asyncio.create_task(_call(middleware, "/api/parse-resume")) for _ in range(2)]
+        await _settle()
+        shed = await _call(middleware, "/api/parse-resume")
+        # Unclassified routes bypass admission
+        release.set()
+        bypassed = await _call(middleware, "/health")
+        served = await asyncio.gather(*holders)
+        return shed, bypassed, served, rejected
+
+    shed, bypassed, served, rejected = asyncio.run(scenario())
+
+    start = shed[0]
+    assert start["status"] == 503
+    assert dict(start["headers"])[b"retry-after"] == b"8"
+    assert b"busy" in shed[1]["body"]
+    assert [error.status_code for error in rejected] == [503]
+    assert bypassed[0]["status"] == 200
+    assert [messages[0]["status"] for messages in served] == [200, 200]
@@ -0,0 +1,149 @@
+"""
+Retry, circuit breaker and rule-based fallback behaviour against the fake server
+"""
+
+import asyncio
+
+import pytest
+from anthropic import APIStatusError
+
+from app.services.anthropic_client import CircuitOpenError, ResilientAnthropicClient
+
+MESSAGE = {
+    "model": "claude-3-5-sonnet-20241022",
+    "max_tokens": 64,
+    "messages": [{"role": "user", "content": "Resume Text:\nJohn Doe"}],
+}
+
+
+def _client(server, **kwargs) -> ResilientAnthropicClient:
+    options = {"max_retries": 0, "failure_threshold": 2, "recovery_timeout": 0.2, "base_backoff": 0.01}
+    options.update(kwargs)
+    return ResilientAnthropicClient(api_key="test", base_url=server.base_url, **options)
+
+
+async def _open_circuit(client: ResilientAnthropicClient, server) -> None:
+    server.config.error_rate = 1.0
+    for _ in range(client.circuit_breaker.failure_threshold):
+        with pytest.raises(APIStatusError):
+            await client.create_message(**MESSAGE)
+    server.config.error_rate = 0.0
+    assert client.circuit_breaker.state == "open"
+
+
+def test_retries_transient_errors_before_failing(fake_anthropic):
+    async def run():
+        client = _client(fake_anthropic, max_retries=2, failure_threshold=5)
+        fake_anthropic.config.error_rate = 1.0
+        try:
+            with pytest.raises(APIStatusError):
+                await client.create_message(**MESSAGE)
+            fake_anthropic.config.error_rate = 0.0
+            await client.create_message(**MESSAGE)
+        finally:
+            await client.aclose()
+        return client.stats()
+
+    stats = asyncio.run(run())
+    assert stats["calls"] == 2
+    assert stats["retries"] == 2
+    assert stats["failures"] == 1
+    assert stats["circuit"] == "closed"
+
+
+def test_circuit_opens_and_fails_fast(fake_anthropic):
+    async def run():
+        client = _client(fake_anthropic)
+        try:
+            await _open_circuit(client, fake_anthropic)
+            with pytest.raises(CircuitOpenError):
+                await client.create_message(**MESSAGE)
+        finally:
+            await client.aclose()
+        return client.stats()
+
+    stats = asyncio.run(run())
+    assert stats["short_circuited"] == 1
+    assert stats["failures"] == 2
+
+
+def test_half_open_probe_success_closes_circuit(fake_anthropic):
+    async def run():
+        client = _client(fake_anthropic)
+        try:
+            await _open_circuit(client, fake_anthropic)
+            await asyncio.sleep(0.25)
+            await client.create_message(**MESSAGE)
+        finally:
+            await client.aclose()
+        return client.circuit_breaker.state
+
+    assert asyncio.run(run()) == "closed"
+
+
+def test_half_open_probe_failure_reopens_circuit(fake_anthropic):
+    async def run():
+        client = _client(fake_anthropic)
+        try:
+            await _open_circuit(client, fake_anthropic)
+            await asyncio.sleep(0.25)
+            fake_anthropic.config.error_rate = 1.0
+            with pytest.raises(APIStatusError):
+                await client.create_message(**MESSAGE)
+            state = client.circuit_breaker.state
+            with pytest.raises(CircuitOpenError):
+                await client.create_message(**MESSAGE)
+        finally:
+            await client.aclose()
+        return state
+
+    assert asyncio.run(run()) == "open"
+
+
+def test_cancelled_probe_releases_half_open_slot(fake_anthropic):
+    async def run():
+        client = _client(fake_anthropic)
+        try:
+            await _open_circuit(client, fake_anthropic)
+            await asyncio.sleep(0.25)
+
+            fake_anthropic.config.latency_ms = 2000
+            probe = asyncio.create_task(client.create_message(**MESSAGE))
+            await asyncio.sleep(0.1)
+            assert client.circuit_breaker.state == "half_open"
+            probe.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await probe
+
+            # The next call becomes the probe instead of being short-circuited forever
+            fake_anthropic.config.latency_ms = 0
+            await client.create_message(**MESSAGE)
+        finally:
+            await client.aclose()
+        return client.circuit_breaker.state
+
+    assert asyncio.run(run()) == "closed"
+
+
+def test_cancelled_while_queued_releases_half_open_slot(fake_anthropic):
+    async def run():
+        client = _client(fake_anthropic, max_concurrency=1)
+        try:
+            await _open_circuit(client, fake_anthropic)
+            await asyncio.sleep(0.25)
+
+            # Hold the only concurrency slot so the probe waits for it
+            await client._semaphore.acquire()
+            probe = asyncio.create_task(client.create_message(**MESSAGE))
+            await asyncio.sleep(0.05)
+            probe.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await probe
+            client._semaphore.release()
+
+            await client.create_message(**MESSAGE)
+        finally:
+            await client.aclose()
+        return client.circuit_breaker.state
+
+    assert asyncio.run(run()) == "closed"
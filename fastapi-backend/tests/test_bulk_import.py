@@ -0,0 +1,141 @@
+"""
+Tests for bulk_import.BulkImporter against the fake server's Message Batches API
+"""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+from anthropic import AsyncAnthropic
+
+from app.services.factory import build_ai_structurer, build_document_parser, build_model_router
+from benchmarks.corpus import render_text, resume_sections
+from bulk_import import BulkImporter, Checkpoint
+
+FILES = ["a.txt", "b.txt", "nested/c.txt"]
+
+
+class CrashAfterSubmit(BulkImporter):
+    """Importer that dies once its batch is submitted, before any result is written"""
+
+    async def _collect(self, batch_id: str) -> None:
+        raise RuntimeError("crash")
+
+
+@pytest.fixture
+def resume_dir(tmp_path):
+    root = tmp_path / "resumes"
+    for index, name in enumerate(FILES):
+        path = root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(render_text(resume_sections(2, seed=index)), encoding="utf-8")
+    (root / "blank.txt").write_text("too short", encoding="utf-8")
+    return root
+
+
+@pytest.fixture
+def sized_budget(monkeypatch):
+    """Sized max_tokens well below the fake answer, so every first answer is cut off"""
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "fake")
+    monkeypatch.setenv("CLAUDE_MIN_MAX_TOKENS", "64")
+    monkeypatch.setenv("CLAUDE_OUTPUT_TOKENS_PER_INPUT_TOKEN", "0.01")
+
+
+@pytest.fixture
+def default_budget(monkeypatch):
+    """Default router settings: no sizing, every request uses CLAUDE_MAX_TOKENS"""
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "fake")
+    monkeypatch.delenv("CLAUDE_OUTPUT_TOKENS_PER_INPUT_TOKEN", raising=False)
+    monkeypatch.delenv("CLAUDE_MIN_MAX_TOKENS", raising=False)
+
+
+def _run(importer_class, server, root, out):
+    async def scenario():
+        client = AsyncAnthropic(api_key="fake", base_url=server.base_url, max_retries=0)
+        importer = importer_class(
+            client=client,
+            parser=build_document_parser(page_parallel=False),
+            structurer=build_ai_structurer(client, None, None, build_model_router()),
+            output_path=str(out),
+            checkpoint=Checkpoint(f"{out}.checkpoint"),
+            parse_workers=1,
+            poll_interval=0.05,
+        )
+        try:
+            return await importer.run(str(root))
+        finally:
+            await client.close()
+
+    return asyncio.run(scenario())
+
+
+def _records(out):
+    return [json.loads(line) for line in out.read_text(encoding="utf-8").splitlines()]
+
+
+def _stats(server):
+    return httpx.get(f"{server.base_url}/stats").json()
+
+
+def test_truncated_answers_are_resubmitted_with_the_full_budget(fake_anthropic, resume_dir, tmp_path, sized_budget):
+    out = tmp_path / "out.jsonl"
+
+    counts = _run(BulkImporter, fake_anthropic, resume_dir, out)
+
+    assert counts == {"succeeded": 3, "insufficient_text": 1}
+    records = {record["file"]: record for record in _records(out)}
+    assert set(records) == {*FILES, "blank.txt"}
+    assert records["a.txt"]["structured_data"]["personal_info"]["full_name"]
+    # One batch cut off at the sized budget, one resubmission of all three
+    stats = _stats(fake_anthropic)
+    assert (stats["batches"], stats["batch_requests"]) == (2, 6)
+    assert json.loads((tmp_path / "out.jsonl.checkpoint").read_text())["pending_batches"] == {}
+
+
+def test_restart_polls_the_checkpointed_batch_instead_of_resubmitting(fake_anthropic, resume_dir, tmp_path,
+                                                                      sized_budget):
+    out = tmp_path / "out.jsonl"
+
+    with pytest.raises(RuntimeError, match="crash"):
+        _run(CrashAfterSubmit, fake_anthropic, resume_dir, out)
+    checkpoint = json.loads((tmp_path / "out.jsonl.checkpoint").read_text())["pending_batches"]
+    assert len(checkpoint) == 1
+    assert sorted(item["file"] for item in next(iter(checkpoint.values())).values()) == sorted(FILES)
+    assert [record["status"] for record in _records(out)] == ["insufficient_text"]
+
+    counts = _run(BulkImporter, fake_anthropic, resume_dir, out)
+
+    assert counts == {"succeeded": 3}
+    assert sorted(record["file"] for record in _records(out) if record["status"] == "succeeded") == sorted(FILES)
+    # The original batch was polled, not paid for twice; only the truncated answers went again
+    stats = _stats(fake_anthropic)
+    assert (stats["batches"], stats["batch_requests"]) == (2, 6)
+
+    # A third run finds everything done
+    assert _run(BulkImporter, fake_anthropic, resume_dir, out) == {}
+    assert _stats(fake_anthropic)["batches"] == 2
+
+
+def test_full_budget_answers_are_written_in_one_batch(fake_anthropic, resume_dir, tmp_path, default_budget):
+    out = tmp_path / "out.jsonl"
+
+    assert _run(BulkImporter, fake_anthropic, resume_dir, out) == {"succeeded": 3, "insufficient_text": 1}
+    stats = _stats(fake_anthropic)
+    assert (stats["batches"], stats["batch_requests"]) == (1, 3)
+
+
+def test_answers_cut_off_at_the_full_budget_are_not_resubmitted(fake_anthropic, resume_dir, tmp_path,
+                                                               default_budget, monkeypatch):
+    monkeypatch.setenv("CLAUDE_MAX_TOKENS", "64")
+    out = tmp_path / "out.jsonl"
+
+    counts = _run(BulkImporter, fake_anthropic, resume_dir, out)
+
+    # A larger budget does not exist, so the truncated answers are recorded as failures
+    assert counts.get("succeeded", 0) == 0
+    assert sum(counts.values()) == 4
+    stats = _stats(fake_anthropic)
+    assert (stats["batches"], stats["batch_requests"]) == (1, 3)
+    checkpoint = json.loads((tmp_path / "out.jsonl.checkpoint").read_text())
+    assert checkpoint["pending_batches"] == {}
@@ -0,0 +1,71 @@
+"""
+Rule-based fallback when Claude structuring fails
+"""
+
+import main
+from fastapi.testclient import TestClient
+
+from app.services.anthropic_client import ResilientAnthropicClient
+from benchmarks.corpus import render_text, resume_sections
+
+RESUME = render_text(resume_sections(3)).encode("utf-8")
+
+
+def _use_fake_server(monkeypatch, server, **kwargs):
+    client = ResilientAnthropicClient(api_key="test", base_url=server.base_url, max_retries=0, **kwargs)
+    monkeypatch.setattr(main.ai_structurer, "client", client)
+    return client
+
+
+def _upload(test_client: TestClient, query: str = ""):
+    return test_client.post(
+        f"/api/parse-resume{query}", files={"file": ("resume.txt", RESUME, "text/plain")}
+    )
+
+
+def test_claude_errors_fall_back_to_rules(monkeypatch, fake_anthropic, test_client):
+    _use_fake_server(monkeypatch, fake_anthropic)
+    fake_anthropic.config.error_rate = 1.0
+
+    response = _upload(test_client)
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["message"] == main.FALLBACK_MESSAGE
+    assert body["structured_data"]["personal_info"]["email"] == "john.doe@email.com"
+    assert body["structured_data"]["skills"]
+
+
+def test_open_circuit_falls_back_without_calling_claude(monkeypatch, fake_anthropic, test_client):
+    client = _use_fake_server(monkeypatch, fake_anthropic, failure_threshold=1, recovery_timeout=60)
+    fake_anthropic.config.error_rate = 1.0
+
+    first = _upload(test_client)
+    second = _upload(test_client, "?fields=structured")
+
+    assert client.circuit_breaker.state == "open"
+    assert client.stats()["short_circuited"] == 1
+    assert first.json()["message"] == main.FALLBACK_MESSAGE
+    assert second.json()["structured_data"]["skills"]
+
+
+def test_stream_falls_back_to_rules(monkeypatch, fake_anthropic, test_client):
+    _use_fake_server(monkeypatch, fake_anthropic)
+    fake_anthropic.config.error_rate = 1.0
+
+    response = test_client.post(
+        "/api/parse-resume/stream", files={"file": ("resume.txt", RESUME, "text/plain")}
+    )
+
+    assert response.status_code == 200
+    assert '"event":"fallback"' in response.text
+    assert '"event":"done"' in response.text
+
+
+def test_successful_structuring_is_not_a_fallback(monkeypatch, fake_anthropic, test_client):
+    client = _use_fake_server(monkeypatch, fake_anthropic)
+
+    response = _upload(test_client)
+
+    assert response.json()["message"] != main.FALLBACK_MESSAGE
+    assert client.circuit_breaker.state == "closed"
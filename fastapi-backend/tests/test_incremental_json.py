@@ -0,0 +1,136 @@
+"""
+Tests for IncrementalSectionParser over arbitrarily chunked model output
+"""
+
+import json
+import random
+
+import pytest
+
+from app.services.incremental_json import IncrementalSectionParser
+
+RESUME = {
+    "personal_info": {
+        "full_name": "Zoë \"Z\" O'Neil",
+        "email": "zoe@example.com",
+        "links": ["github.com/zoe", "https://zoe.dev/{cv}?a=1&b=[2]"],
+    },
+    "summary": "Escapes: \\ backslash, \"quotes\", braces {}, brackets [], commas, colons: and \n newlines — done",
+    "work_experience": [
+        {
+            "company": "Initech, Inc.",
+            "highlights": ["Cut latency 48%", "Led {platform} team"],
+            "dates": {"start": "2021-01", "end": None},
+        },
+        {"company": "Globex \\ \"Labs\"", "highlights": [], "dates": {"start": "2019-01", "end": "2021-01"}},
+    ],
+    "education": [],
+    "skills": ["Python", "C++", "SQL, advanced", "漢字"],
+    "matrix": [[1, 2], [], [[3]]],
+    "certifications": [None, "AWS", False, 0],
+    "years": 7,
+    "score": -1.5e3,
+    "remote": True,
+    "manager": None,
+    "we\"ird:key{": "value",
+}
+
+DOCUMENTS = {
+    "compact": json.dumps(RESUME, separators=(",", ":")),
+    "indented": json.dumps(RESUME, indent=2),
+    "ascii": json.dumps(RESUME, ensure_ascii=True),
+    "fenced": "Here is the JSON:\n```json\n" + json.dumps(RESUME, ensure_ascii=False, indent=1) + "\n```\nDone.",
+}
+
+
+def _feed(chunks):
+    parser = IncrementalSectionParser()
+    events = []
+    for chunk in chunks:
+        events.extend(parser.feed(chunk))
+    return parser, events
+
+
+def _assert_matches_final(parser, events, document):
+    expected = json.loads(document[document.index("{"):document.rindex("}") + 1])
+    members = [(key, value) for key, index, value in events if index is None]
+    elements = [(key, index, value) for key, index, value in events if index is not None]
+
+    assert parser.finished
+    # Every member exactly once, in document order, equal to the decoded document
+    assert [key for key, _ in members] == list(expected)
+    assert dict(members) == expected
+    assert elements == [
+        (key, index, value)
+        for key, value in expected.items() if isinstance(value, list)
+        for index, value in enumerate(value)
+    ]
+
+
+def _split(document, boundaries):
+    edges = [0, *sorted(boundaries), len(document)]
+    return [document[start:end] for start, end in zip(edges, edges[1:])]
+
+
+@pytest.mark.parametrize("name", DOCUMENTS)
+def test_one_chunk(name):
+    _assert_matches_final(*_feed([DOCUMENTS[name]]), DOCUMENTS[name])
+
+
+@pytest.mark.parametrize("name", DOCUMENTS)
+def test_one_character_per_chunk(name):
+    _assert_matches_final(*_feed(list(DOCUMENTS[name])), DOCUMENTS[name])
+
+
+@pytest.mark.parametrize("name", DOCUMENTS)
+def test_every_two_way_split(name):
+    # Covers splits inside keys, strings, escape sequences and nested values
+    document = DOCUMENTS[name]
+    for boundary in range(1, len(document)):
+        _assert_matches_final(*_feed(_split(document, [boundary])), document)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_random_chunk_sizes(seed):
+    rng = random.Random(seed)
+    document = DOCUMENTS["indented"]
+    boundaries = rng.sample(range(1, len(document)), rng.randint(2, 60))
+
+    _assert_matches_final(*_feed(_split(document, boundaries)), document)
+
+
+def test_split_right_after_a_backslash():
+    document = DOCUMENTS["compact"]
+    boundaries = [pos + 1 for pos, char in enumerate(document) if char == "\\"]
+
+    _assert_matches_final(*_feed(_split(document, boundaries)), document)
+
+
+def test_sections_are_emitted_as_soon_as_they_close():
+    parser = IncrementalSectionParser()
+
+    assert parser.feed('{"skills": ["Py') == []
+    assert parser.feed('thon", "SQL"') == [("skills", 0, "Python")]
+    assert parser.feed('], "ye') == [("skills", 1, "SQL"), ("skills", None, ["Python", "SQL"])]
+    assert parser.feed('ars": 7') == []
+    assert parser.feed("}") == [("years", None, 7)]
+    assert parser.finished
+
+
+def test_text_after_the_object_is_ignored():
+    parser, events = _feed(['{"a": 1}', ' trailing {"b": 2}'])
+
+    assert events == [("a", None, 1)]
+    assert parser.feed('{"c": 3}') == []
+
+
+def test_unfinished_object_emits_only_complete_sections():
+    document = DOCUMENTS["compact"]
+    cut = document.index('"skills"')
+
+    parser, events = _feed([document[:cut + 20]])
+
+    assert not parser.finished
+    assert [key for key, index, _ in events if index is None] == [
+        "personal_info", "summary", "work_experience", "education"
+    ]
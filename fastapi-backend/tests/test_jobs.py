@@ -0,0 +1,81 @@
+"""
+Tests for the asynchronous job queue
+"""
+
+import asyncio
+
+import pytest
+
+from app.services.jobs import JobError, JobQueue, JobQueueFullError, JobRetryError, JobStore
+
+
+def _run_job(handler, **kwargs):
+    async def scenario():
+        store = JobStore()
+        queue = JobQueue(store, handler, workers=1, **kwargs)
+        queue.start()
+        try:
+            job = store.create("resume.pdf", structure_with_ai=False)
+            queue.submit(job, b"payload", size=7)
+            await asyncio.wait_for(job.done.wait(), 5)
+            return job, queue.stats()
+        finally:
+            await queue.stop()
+
+    return asyncio.run(scenario())
+
+
+def test_saturation_is_retried_until_the_job_succeeds():
+    attempts = []
+
+    async def handler(job, payload):
+        attempts.append(job.status)
+        if len(attempts) < 3:
+            raise JobRetryError("busy", retry_after=0.01)
+        return {"ok": True}
+
+    job, stats = _run_job(handler, max_retries=5)
+
+    assert job.status == "succeeded"
+    assert job.result == {"ok": True}
+    assert attempts == ["running"] * 3
+    assert stats["retries"] == 2
+    assert stats["payload_bytes"] == 0
+
+
+def test_saturation_fails_the_job_once_retries_run_out():
+    async def handler(job, payload):
+        raise JobRetryError("busy", retry_after=0.01)
+
+    job, stats = _run_job(handler, max_retries=2)
+
+    assert job.status == "failed"
+    assert job.status_code == 503
+    assert stats["retries"] == 2
+
+
+def test_client_errors_fail_without_retrying():
+    async def handler(job, payload):
+        raise JobError("unreadable", 422)
+
+    job, stats = _run_job(handler, max_retries=5)
+
+    assert (job.status, job.status_code, job.error) == ("failed", 422, "unreadable")
+    assert stats["retries"] == 0
+
+
+def test_queued_payload_bytes_are_capped():
+    async def scenario():
+        store = JobStore()
+        # Workers are never started, so submitted payloads stay queued
+        queue = JobQueue(store, None, workers=1, max_payload_bytes=10)
+        queue.submit(store.create("a.pdf", False), b"", size=6)
+        with pytest.raises(JobQueueFullError):
+            queue.submit(store.create("b.pdf", False), b"", size=6)
+        queue.submit(store.create("c.pdf", False), b"", size=4)
+        return queue.stats()
+
+    stats = asyncio.run(scenario())
+
+    assert stats["queued"] == 2
+    assert stats["payload_bytes"] == 10
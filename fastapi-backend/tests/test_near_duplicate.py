@@ -0,0 +1,110 @@
+"""
+Tests for the near-duplicate index and its use by the parse endpoint
+"""
+
+import main
+import pytest
+
+from app.services.anthropic_client import ResilientAnthropicClient
+from app.services.near_duplicate import NearDuplicateIndex
+from benchmarks.corpus import render_text, resume_sections
+
+TEXT = render_text(resume_sections(6))
+
+
+def _edit(text: str, every: int) -> str:
+    """Replace every n-th word, from the middle of the text outwards"""
+    words = text.split()
+    for position in range(len(words) // 2, len(words), every):
+        words[position] = f"edited{position}"
+    return " ".join(words)
+
+
+def test_small_edits_match_and_heavy_edits_do_not():
+    index = NearDuplicateIndex(threshold=0.8)
+    index.add("original", TEXT, "stored")
+
+    match = index.lookup(_edit(TEXT, every=1000))
+
+    assert match is not None and match.key == "original" and match.value == "stored"
+    assert 0.8 <= match.similarity < 1
+    assert index.lookup(_edit(TEXT, every=5)) is None
+    assert index.lookup(render_text(resume_sections(6, seed=5))) is None
+    assert (index.stats()["hits"], index.stats()["misses"]) == (1, 2)
+
+
+@pytest.mark.parametrize("every", [1000, 100, 40], ids=["one-word", "few-words", "more-words"])
+def test_threshold_is_inclusive(every):
+    # Estimates use the process's hash seed, so the threshold is set around
+    # the edit's own estimate rather than at a fixed value
+    probe = NearDuplicateIndex()
+    edited = _edit(TEXT, every)
+    score = probe.similarity(probe.signature(TEXT), probe.signature(edited))
+    assert 0 < score < 1
+
+    just_under = NearDuplicateIndex(threshold=score)
+    just_under.add("original", TEXT, "stored")
+    just_over = NearDuplicateIndex(threshold=score + 0.001)
+    just_over.add("original", TEXT, "stored")
+
+    assert just_under.lookup(edited).similarity == round(score, 4)
+    assert just_over.lookup(edited) is None
+
+
+def test_least_recently_used_entries_are_evicted():
+    index = NearDuplicateIndex(max_entries=2)
+    texts = {f"resume-{seed}": render_text(resume_sections(6, seed=seed)) for seed in range(3)}
+    index.add("resume-0", texts["resume-0"], "0")
+    index.add("resume-1", texts["resume-1"], "1")
+    assert index.lookup(texts["resume-0"]).key == "resume-0"
+
+    index.add("resume-2", texts["resume-2"], "2")
+
+    assert index.stats()["evictions"] == 1
+    assert index.stats()["entries"] == 2
+    assert index.lookup(texts["resume-1"]) is None
+    assert index.lookup(texts["resume-0"]).key == "resume-0"
+    assert index.lookup(texts["resume-2"]).key == "resume-2"
+
+
+def test_expired_entries_are_dropped():
+    index = NearDuplicateIndex(ttl_seconds=0)
+    index.add("original", TEXT, "stored")
+
+    assert index.lookup(TEXT) is None
+    assert index.stats()["expirations"] == 1
+    assert index.stats()["entries"] == 0
+
+
+def test_short_texts_are_neither_indexed_nor_matched():
+    index = NearDuplicateIndex()
+
+    assert not index.add("short", "John Doe, engineer", "stored")
+    assert index.lookup("John Doe, engineer") is None
+    assert index.stats()["skipped"] == 1
+
+
+@pytest.mark.parametrize("kwargs", [{"threshold": 0}, {"threshold": 1.5}, {"num_slots": 100, "bands": 16}])
+def test_invalid_settings_are_rejected(kwargs):
+    with pytest.raises(ValueError):
+        NearDuplicateIndex(**kwargs)
+
+
+def test_near_duplicate_upload_is_flagged_not_cached(monkeypatch, fake_anthropic, test_client):
+    client = ResilientAnthropicClient(api_key="test", base_url=fake_anthropic.base_url, max_retries=0)
+    monkeypatch.setattr(main.ai_structurer, "client", client)
+    monkeypatch.setattr(main, "near_duplicate_index", NearDuplicateIndex(threshold=0.8))
+
+    def upload(text):
+        files = {"file": ("resume.txt", text.encode("utf-8"), "text/plain")}
+        return test_client.post("/api/parse-resume", files=files).json()
+
+    first = upload(TEXT)
+    second = upload(_edit(TEXT, every=1000))
+
+    assert not first["near_duplicate"]
+    assert second["near_duplicate"] and not second["cached"]
+    assert second["message"] == main.NEAR_DUPLICATE_MESSAGE
+    assert second["structured_data"]["skills"] == first["structured_data"]["skills"]
+    # Personal info comes from the new text, not the stored structuring
+    assert second["structured_data"]["personal_info"]["email"] == "john.doe@email.com"
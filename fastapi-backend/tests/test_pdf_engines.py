@@ -0,0 +1,172 @@
+"""
+PDF engine selection and fallback
+"""
+
+import io
+
+import pytest
+
+from app.services.document_parser import DocumentParser
+from app.services.metrics import PipelineMetrics
+from app.services.pdf_engines import (
+    PDF_ENGINES,
+    PdfDocument,
+    PdfEngine,
+    PdfProbe,
+    available_pdf_engines,
+    choose_pdf_engine,
+    probe_pdf,
+)
+from benchmarks.corpus import make_pdf, render_text, resume_sections
+
+RESUME_PDF = make_pdf(render_text(resume_sections(4)))
+# One page without any text operators, like a scanned resume
+IMAGE_ONLY_PDF = make_pdf("")
+
+ALL_ENGINES = ["pypdf", "pypdf-layout", "pdfminer"]
+
+
+def _runs(metrics: PipelineMetrics):
+    return {"/".join(key): int(value) for key, value in metrics.pdf_engine_documents.values().items()}
+
+
+def _probe(**overrides) -> PdfProbe:
+    values = {"pages": 2, "complex_fonts": 0, "chars": 1500, "seconds": 0.01,
+              "garbled_ratio": 0.0, "long_token_ratio": 0.0}
+    values.update(overrides)
+    return PdfProbe(**values)
+
+
+@pytest.mark.parametrize("probe, candidates, expected", [
+    (_probe(), ALL_ENGINES, ("pypdf", "default")),
+    (_probe(chars=0), ALL_ENGINES, ("pdfminer", "no_text")),
+    (_probe(garbled_ratio=0.3), ALL_ENGINES, ("pdfminer", "garbled_text")),
+    (_probe(complex_fonts=1), ALL_ENGINES, ("pdfminer", "complex_fonts")),
+    (_probe(seconds=2.0), ALL_ENGINES, ("pdfminer", "slow_pypdf")),
+    (_probe(long_token_ratio=0.5), ALL_ENGINES, ("pypdf-layout", "missing_spaces")),
+    (_probe(long_token_ratio=0.5, pages=40), ALL_ENGINES, ("pypdf", "default")),
+    # Without pdfminer installed, nothing is routed to it
+    (_probe(chars=0), ["pypdf", "pypdf-layout"], ("pypdf", "default")),
+    (_probe(complex_fonts=2), ["pypdf", "pypdf-layout"], ("pypdf", "default")),
+])
+def test_choose_pdf_engine(probe, candidates, expected):
+    assert choose_pdf_engine(probe, candidates) == expected
+
+
+def test_probe_counts_type3_fonts():
+    # Same length as /Type1, so the xref offsets stay valid
+    document = PdfDocument(io.BytesIO(RESUME_PDF.replace(b"/Subtype /Type1", b"/Subtype /Type3")))
+    assert probe_pdf(document, 1).complex_fonts == 1
+    assert probe_pdf(PdfDocument(io.BytesIO(RESUME_PDF)), 1).complex_fonts == 0
+
+
+def test_auto_keeps_clean_text_on_plain_pypdf():
+    metrics = PipelineMetrics()
+    text = DocumentParser(metrics=metrics).parse(RESUME_PDF, "resume.pdf")
+
+    assert "john.doe@email.com" in text
+    assert _runs(metrics) == {"pypdf/text": 1}
+    selections = {"/".join(key): int(value) for key, value in metrics.pdf_engine_selections.values().items()}
+    assert selections == {"pypdf/default": 1}
+
+
+def test_image_only_pdf_stops_after_the_probe_and_one_engine():
+    metrics = PipelineMetrics()
+
+    with pytest.raises(ValueError, match="image-based"):
+        DocumentParser(metrics=metrics).parse(IMAGE_ONLY_PDF, "scan.pdf")
+
+    runs = _runs(metrics)
+    assert sum(runs.values()) == 1
+    assert all(key.endswith("/empty") for key in runs)
+
+
+@pytest.mark.parametrize("engine", ["pypdf", "pypdf-layout"])
+def test_empty_pypdf_mode_skips_the_other_mode(engine):
+    metrics = PipelineMetrics()
+
+    with pytest.raises(ValueError, match="image-based"):
+        DocumentParser(metrics=metrics, pdf_engine=engine).parse(IMAGE_ONLY_PDF, "scan.pdf")
+
+    # A configured engine has no probe, so another engine family still gets a try
+    expected = {f"{engine}/empty": 1}
+    if "pdfminer" in available_pdf_engines():
+        expected["pdfminer/empty"] = 1
+    assert _runs(metrics) == expected
+
+
+def test_fallback_after_engine_error(monkeypatch):
+    def broken(*args, **kwargs):
+        raise RuntimeError("unsupported filter")
+
+    monkeypatch.setattr(PDF_ENGINES["pypdf"], "extract_pages", broken)
+    metrics = PipelineMetrics()
+    text = DocumentParser(metrics=metrics, pdf_engine="pypdf").parse(RESUME_PDF, "resume.pdf")
+
+    assert "john.doe@email.com" in text
+    assert _runs(metrics) == {"pypdf/error": 1, "pypdf-layout/text": 1}
+
+
+def test_every_engine_failing_reports_the_first_error(monkeypatch):
+    def broken(*args, **kwargs):
+        raise RuntimeError("unsupported filter")
+
+    for engine in PDF_ENGINES.values():
+        monkeypatch.setattr(engine, "extract_pages", broken)
+
+    with pytest.raises(ValueError, match="unsupported filter"):
+        DocumentParser(pdf_engine="pypdf").parse(RESUME_PDF, "resume.pdf")
+
+
+def test_no_fallback_when_disabled(monkeypatch):
+    monkeypatch.setattr(PDF_ENGINES["pypdf"], "extract_pages", lambda *args: [])
+    metrics = PipelineMetrics()
+
+    with pytest.raises(ValueError, match="image-based"):
+        DocumentParser(metrics=metrics, pdf_engine="pypdf", pdf_engine_fallback=False).parse(
+            RESUME_PDF, "resume.pdf"
+        )
+    assert _runs(metrics) == {"pypdf/empty": 1}
+
+
+def test_unknown_engine_is_rejected():
+    with pytest.raises(ValueError, match="Unknown PDF engine"):
+        DocumentParser(pdf_engine="ocr")
+
+
+@pytest.mark.skipif("pdfminer" not in available_pdf_engines(), reason="pdfminer.six not installed")
+class TestPdfminer:
+    def test_extracts_the_same_words_as_pypdf(self):
+        pdfminer_text = DocumentParser(pdf_engine="pdfminer").parse(RESUME_PDF, "resume.pdf")
+        pypdf_text = DocumentParser(pdf_engine="pypdf").parse(RESUME_PDF, "resume.pdf")
+        assert pdfminer_text.split() == pypdf_text.split()
+
+    def test_respects_the_character_budget(self):
+        text = DocumentParser(pdf_engine="pdfminer", max_pdf_chars=500).parse(
+            make_pdf(render_text(resume_sections(60))), "long.pdf"
+        )
+        assert len(text) <= 500
+
+    def test_auto_sends_no_text_pdf_to_pdfminer_then_stops(self):
+        metrics = PipelineMetrics()
+        with pytest.raises(ValueError, match="image-based"):
+            DocumentParser(metrics=metrics).parse(IMAGE_ONLY_PDF, "scan.pdf")
+        assert _runs(metrics) == {"pdfminer/empty": 1}
+
+    def test_falls_back_to_pypdf_when_pdfminer_fails(self, monkeypatch):
+        def broken(*args, **kwargs):
+            raise RuntimeError("bad cmap")
+
+        monkeypatch.setattr(PDF_ENGINES["pdfminer"], "extract_pages", broken)
+        metrics = PipelineMetrics()
+        text = DocumentParser(metrics=metrics, pdf_engine="pdfminer").parse(RESUME_PDF, "resume.pdf")
+        assert "john.doe@email.com" in text
+        assert _runs(metrics) == {"pdfminer/error": 1, "pypdf/text": 1}
+
+
+def test_engine_without_extract_pages_cannot_be_created():
+    class Incomplete(PdfEngine):
+        name = "incomplete"
+
+    with pytest.raises(TypeError, match="extract_pages"):
+        Incomplete()
@@ -0,0 +1,94 @@
+"""
+Tests for the request profiler's access control and profile saving
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from app.middleware.profiling import ProfilingMiddleware
+from app.services.profiler import ProfileStore, Profiler, profile_stage
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ProfileStore(str(tmp_path / "profiles"), max_profiles=2)
+
+
+def test_token_is_required(store):
+    with pytest.raises(ValueError):
+        Profiler(store, token="")
+
+
+def test_only_the_token_requests_or_reads_profiles(store):
+    profiler = Profiler(store, token="s3cret")
+
+    assert profiler.requested("s3cret")
+    assert not profiler.requested("1")
+    assert not profiler.requested(None)
+    assert profiler.authorized("s3cret")
+    assert not profiler.authorized("1")
+    assert not profiler.authorized(None)
+
+
+def test_profiles_are_saved_off_the_event_loop(store, monkeypatch):
+    profiler = Profiler(store, token="s3cret")
+    save_threads = []
+    save = store.save
+
+    def recording_save(profile):
+        save_threads.append(threading.current_thread())
+        return save(profile)
+
+    monkeypatch.setattr(store, "save", recording_save)
+
+    async def scenario():
+        async with profiler.begin("POST /api/parse-resume") as profile:
+            with profile_stage("validation"):
+                sum(range(1000))
+        return profile
+
+    profile = asyncio.run(scenario())
+
+    assert save_threads and save_threads[0] is not threading.main_thread()
+    summary = store.load(profile.id)
+    assert list(summary["stages"]) == ["validation"]
+    assert store.stats_path(profile.id, "validation") is not None
+
+
+def test_concurrent_profile_is_skipped(store):
+    profiler = Profiler(store, token="s3cret")
+
+    async def scenario():
+        async with profiler.begin("first") as first:
+            async with profiler.begin("second") as second:
+                return first, second
+
+    first, second = asyncio.run(scenario())
+
+    assert first is not None and second is None
+    assert profiler.stats()["skipped_busy"] == 1
+
+
+@pytest.mark.parametrize("headers,query,profiled", [
+    ([(b"x-profile", b"s3cret")], b"", True),
+    ([], b"profile=s3cret", False),
+    ([(b"x-profile", b"wrong")], b"profile=s3cret", False),
+], ids=["header", "query", "wrong-header"])
+def test_middleware_reads_the_token_from_the_header_only(store, headers, query, profiled):
+    sent = []
+
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    async def send(message):
+        sent.append(message)
+
+    middleware = ProfilingMiddleware(app, Profiler(store, token="s3cret"), should_profile=lambda scope: True)
+    scope = {"type": "http", "method": "POST", "path": "/api/parse-resume", "headers": headers, "query_string": query}
+    asyncio.run(middleware(scope, None, send))
+
+    assert (b"x-profile-id" in dict(sent[0]["headers"])) is profiled
+    assert len(store.list()) == int(profiled)
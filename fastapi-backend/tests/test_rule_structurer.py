@@ -0,0 +1,35 @@
+"""
+Tests for contact extraction and stripping in the rule-based structurer
+"""
+
+import pytest
+
+from app.services.rule_structurer import RuleBasedStructurer
+from benchmarks.fixtures import HEADLINE, text_fixtures
+
+structurer = RuleBasedStructurer()
+
+
+@pytest.mark.parametrize("name,text,expected", text_fixtures(), ids=[f[0] for f in text_fixtures()])
+def test_fixture_personal_info(name, text, expected):
+    assert structurer.structure(text).personal_info == expected.personal_info
+
+
+def test_dotted_words_are_not_urls():
+    text = f"Jane Doe\n{HEADLINE}\njane@example.com\n\nSkills\nC#, ASP.NET"
+
+    assert structurer.strip_contact_lines(text).splitlines()[:2] == ["Jane Doe", HEADLINE]
+    assert structurer.extract_personal_info(text).portfolio is None
+
+
+@pytest.mark.parametrize("line,portfolio", [
+    ("janedoe.dev", "janedoe.dev"),
+    ("jane@example.com | janedoe.dev | Austin, TX", "janedoe.dev"),
+    ("Portfolio: https://www.janedoe.dev/work", "janedoe.dev/work"),
+    ("See www.janedoe.io for work samples", "janedoe.io"),
+])
+def test_portfolio_forms(line, portfolio):
+    text = f"Jane Doe\n{line}\n\nSkills\nPython"
+
+    assert structurer.extract_personal_info(text).portfolio == portfolio
+    assert "janedoe" not in structurer.strip_contact_lines(text)
@@ -0,0 +1,158 @@
+"""
+Tests for coalescing concurrent calls with SingleFlight
+"""
+
+import asyncio
+
+import pytest
+
+from app.services.single_flight import SingleFlight
+
+
+class Work:
+    """Factory whose calls block until released, counting how often it ran"""
+
+    def __init__(self, result=None, error=None):
+        self.calls = 0
+        self.cancelled = False
+        self.release = asyncio.Event()
+        self.result = result
+        self.error = error
+
+    async def __call__(self):
+        self.calls += 1
+        try:
+            await self.release.wait()
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        if self.error:
+            raise self.error
+        return self.result
+
+
+async def _settle():
+    """Let started tasks reach their first await"""
+    for _ in range(3):
+        await asyncio.sleep(0)
+
+
+def test_concurrent_callers_share_one_call():
+    async def scenario():
+        flight = SingleFlight()
+        work = Work(result={"skills": ["Python"]})
+        callers = [asyncio.create_task(flight.run("key", work)) for _ in range(3)]
+        await _settle()
+        assert flight.stats()["waiters"] == 3
+        work.release.set()
+        results = await asyncio.gather(*callers)
+        return flight, work, results
+
+    flight, work, results = asyncio.run(scenario())
+
+    assert work.calls == 1
+    assert all(result is results[0] for result in results)
+    assert flight.stats() == {"started": 1, "coalesced": 2, "cancelled": 0, "in_flight": 0, "waiters": 0}
+
+
+def test_cancelling_one_caller_leaves_the_others_waiting():
+    async def scenario():
+        flight = SingleFlight()
+        work = Work(result="done")
+        first = asyncio.create_task(flight.run("key", work))
+        second = asyncio.create_task(flight.run("key", work))
+        await _settle()
+
+        first.cancel()
+        await _settle()
+        assert first.cancelled()
+        assert not second.done() and not work.cancelled
+        assert flight.stats()["waiters"] == 1
+
+        work.release.set()
+        return flight, work, await second
+
+    flight, work, result = asyncio.run(scenario())
+
+    assert result == "done"
+    assert work.calls == 1
+    assert flight.stats()["cancelled"] == 0
+
+
+def test_cancelling_every_caller_cancels_the_call_and_releases_the_key():
+    async def scenario():
+        flight = SingleFlight()
+        work = Work(result="stale")
+        callers = [asyncio.create_task(flight.run("key", work)) for _ in range(2)]
+        await _settle()
+        for caller in callers:
+            caller.cancel()
+        await _settle()
+        assert work.cancelled
+        assert flight.stats()["in_flight"] == 0
+
+        # A new caller starts afresh instead of joining the cancelled call
+        fresh = Work(result="fresh")
+        fresh.release.set()
+        return flight, work, fresh, await flight.run("key", fresh)
+
+    flight, work, fresh, result = asyncio.run(scenario())
+
+    assert result == "fresh"
+    assert (work.calls, fresh.calls) == (1, 1)
+    assert flight.stats()["cancelled"] == 1
+
+
+def test_errors_reach_every_caller():
+    async def scenario():
+        flight = SingleFlight()
+        work = Work(error=RuntimeError("claude down"))
+        callers = [asyncio.create_task(flight.run("key", work)) for _ in range(3)]
+        await _settle()
+        work.release.set()
+        return flight, work, await asyncio.gather(*callers, return_exceptions=True)
+
+    flight, work, results = asyncio.run(scenario())
+
+    assert work.calls == 1
+    assert len(results) == 3
+    assert all(isinstance(result, RuntimeError) and str(result) == "claude down" for result in results)
+    assert flight.stats()["in_flight"] == 0
+
+
+@pytest.mark.parametrize("error", [None, RuntimeError("claude down")], ids=["success", "error"])
+def test_key_is_released_once_the_call_finishes(error):
+    async def scenario():
+        flight = SingleFlight()
+        first = Work(result="first", error=error)
+        first.release.set()
+        try:
+            await flight.run("key", first)
+        except RuntimeError:
+            pass
+        assert flight.stats()["in_flight"] == 0
+
+        # Results are not cached: a later caller runs the work again
+        second = Work(result="second")
+        second.release.set()
+        return flight, await flight.run("key", second)
+
+    flight, result = asyncio.run(scenario())
+
+    assert result == "second"
+    assert flight.stats()["started"] == 2
+    assert flight.stats()["coalesced"] == 0
+
+
+def test_different_keys_do_not_share_calls():
+    async def scenario():
+        flight = SingleFlight()
+        works = {key: Work(result=key) for key in ("a", "b")}
+        for work in works.values():
+            work.release.set()
+        return flight, await asyncio.gather(*(flight.run(key, work) for key, work in works.items()))
+
+    flight, results = asyncio.run(scenario())
+
+    assert results == ["a", "b"]
+    assert flight.stats()["started"] == 2
@@ -0,0 +1,80 @@
+"""
+Tests for chunked upload spooling
+"""
+
+import asyncio
+import io
+from tempfile import SpooledTemporaryFile
+
+import pytest
+from fastapi import UploadFile
+from starlette.formparsers import MultiPartParser
+
+from app.services.document_parser import DocumentParser
+from app.services.upload_reader import UploadTooLargeError, spool_upload
+from benchmarks.corpus import make_docx, make_pdf, render_text, resume_sections
+
+PDF = make_pdf(render_text(resume_sections(3)))
+
+
+def _spooled(content: bytes, max_size: int) -> UploadFile:
+    spool = SpooledTemporaryFile(max_size=max_size)
+    spool.write(content)
+    spool.seek(0)
+    return UploadFile(spool, filename="resume.pdf")
+
+
+def _spool(upload: UploadFile, **kwargs):
+    return asyncio.run(spool_upload(upload, max_bytes=10 * 1024 * 1024, **kwargs))
+
+
+@pytest.mark.parametrize("content,filename", [
+    (PDF, "resume.pdf"),
+    (make_docx(resume_sections(3)), "resume.docx"),
+], ids=["pdf", "docx"])
+@pytest.mark.parametrize("in_memory", [True, False], ids=["memory", "disk"])
+def test_parsers_read_the_spool(content, filename, in_memory):
+    threshold = len(content) * 2 if in_memory else 1024
+    upload = _spool(_spooled(content, max_size=threshold), spool_threshold=threshold)
+
+    assert upload.on_disk is not in_memory
+    assert upload.open() is upload._spool
+    assert upload.read_bytes() == content
+    assert "Experience" in DocumentParser().parse(upload.open(), filename)
+
+
+def test_large_upload_still_in_memory_is_rolled_over():
+    # Spool size larger than the threshold, as when the limits disagree
+    spooled = _spooled(PDF, max_size=len(PDF) * 2)
+    upload = _spool(spooled, spool_threshold=1024)
+
+    # An in-memory spool has no name; a rolled-over one has its temp file's
+    assert spooled.file.name is None
+    assert upload.read_bytes() == PDF
+    assert spooled.file.name is not None
+
+
+def test_plain_in_memory_file_is_returned_as_is():
+    upload = _spool(UploadFile(io.BytesIO(PDF), filename="resume.pdf"), spool_threshold=1024)
+
+    assert upload.read_bytes() == PDF
+
+
+def test_oversized_upload_is_rejected():
+    with pytest.raises(UploadTooLargeError):
+        asyncio.run(spool_upload(_spooled(PDF, max_size=1024), max_bytes=len(PDF) - 1))
+
+
+def test_threshold_is_capped_at_starlettes_spool_size():
+    big = PDF * (2 * MultiPartParser.max_file_size // len(PDF))
+    upload = _spool(UploadFile(io.BytesIO(big), filename="resume.pdf"), spool_threshold=64 * 1024 * 1024)
+
+    # Starlette already moved an upload this size to disk
+    assert upload.spool_threshold == MultiPartParser.max_file_size
+    assert upload.on_disk
+
+
+def test_starlettes_spool_size_is_not_modified():
+    import main  # noqa: F401
+
+    assert MultiPartParser.max_file_size == 1024 * 1024
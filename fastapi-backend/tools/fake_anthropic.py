@@ -0,0 +1,351 @@
+"""
+Fake Anthropic Server
+Local stand-in for the Claude Messages API with injectable latency and failures
+
+Usage:
+    python -m tools.fake_anthropic [--port 8081] [--latency-ms 800]
+        [--latency-distribution lognormal --latency-spread 0.5]
+        [--error-rate 0.05] [--rate-limit-rate 0.05] [--overload-rate 0.0]
+        [--rate-limit-rps 5 --rate-limit-burst 10] [--cache-min-tokens 1024]
+
+Also serves the Message Batches API (/v1/messages/batches); a batch ends
+--batch-seconds after it is created.
+
+Point the backend at it with:
+    ANTHROPIC_API_KEY=fake ANTHROPIC_BASE_URL=http://127.0.0.1:8081
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict
+
+import uvicorn
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response, StreamingResponse
+from starlette.routing import Route
+
+from benchmarks.fixtures import dummy_resume
+
+
+@dataclass
+class FakeConfig:
+    """Failure and latency behaviour of the fake server"""
+    latency_ms: float = 800.0
+    # fixed, uniform (latency_ms +/- spread fraction), lognormal (median
+    # latency_ms, sigma spread) or exponential (mean latency_ms)
+    latency_distribution: str = "fixed"
+    latency_spread: float = 0.5
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    overload_rate: float = 0.0
+    retry_after_seconds: int = 1
+    # Token-bucket request limit answered with 429 like the real API (0 disables)
+    rate_limit_rps: float = 0.0
+    rate_limit_burst: int = 10
+    stream_chunk_chars: int = 40
+    # Prompt caching: shortest cacheable system prefix and cache entry lifetime
+    cache_min_tokens: int = 1024
+    cache_ttl_seconds: float = 300.0
+    # Time from batch creation until its results are available
+    batch_seconds: float = 2.0
+
+
+LATENCY_DISTRIBUTIONS = ("fixed", "uniform", "lognormal", "exponential")
+
+
+def sample_latency(config: FakeConfig) -> float:
+    """Draw one response latency in seconds from the configured distribution"""
+    latency_ms = config.latency_ms
+    if config.latency_distribution == "uniform":
+        latency_ms *= random.uniform(1 - config.latency_spread, 1 + config.latency_spread)
+    elif config.latency_distribution == "lognormal":
+        latency_ms *= random.lognormvariate(0, config.latency_spread)
+    elif config.latency_distribution == "exponential" and latency_ms > 0:
+        latency_ms = random.expovariate(1 / latency_ms)
+    return max(latency_ms, 0.0) / 1000
+
+
+class _TokenBucket:
+    """Request limiter refilled continuously at rate per second"""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.capacity = max(burst, 1)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+
+    def take(self) -> float:
+        """Take a token; returns 0 on success, else seconds until one is available"""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+
+def _error(status: int, error_type: str, message: str, headers: Dict[str, str] = None) -> JSONResponse:
+    return JSONResponse(
+        {"type": "error", "error": {"type": error_type, "message": message}},
+        status_code=status,
+        headers=headers,
+    )
+
+
+def _sse(event: str, data: Dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def create_app(config: FakeConfig) -> Starlette:
+    """
+    Build the fake Messages API application
+
+    Args:
+        config: Latency and failure behaviour
+
+    Returns:
+        Starlette application serving POST /v1/messages and the batch endpoints
+    """
+    if config.latency_distribution not in LATENCY_DISTRIBUTIONS:
+        raise ValueError(f"Unknown latency distribution: {config.latency_distribution}")
+    response_text = dummy_resume().model_dump_json(indent=2)
+    stats = {"requests": 0, "ok": 0, "errors": 0, "rate_limited": 0, "overloaded": 0, "in_flight": 0,
+             "max_in_flight": 0, "cache_reads": 0, "cache_writes": 0, "batches": 0, "batch_requests": 0}
+    prompt_cache: Dict[str, float] = {}
+    batches: Dict[str, Dict[str, Any]] = {}
+
+    def usage_for(body: Dict[str, Any]) -> Dict[str, int]:
+        """Input token usage, splitting out a cache_control system prefix like the real API"""
+        system = body.get("system") or []
+        if isinstance(system, str):
+            system = [{"type": "text", "text": system}]
+        message_tokens = sum(len(json.dumps(message)) for message in body.get("messages", [])) // 4
+        system_text = "".join(block.get("text", "") for block in system)
+        system_tokens = len(system_text) // 4
+        usage = {"input_tokens": max(1, message_tokens + system_tokens)}
+        if any("cache_control" in block for block in system) and system_tokens >= config.cache_min_tokens:
+            now = time.monotonic()
+            if prompt_cache.get(system_text, 0) > now:
+                usage["cache_read_input_tokens"] = system_tokens
+                stats["cache_reads"] += 1
+            else:
+                usage["cache_creation_input_tokens"] = system_tokens
+                stats["cache_writes"] += 1
+            prompt_cache[system_text] = now + config.cache_ttl_seconds
+            usage["input_tokens"] = max(1, message_tokens)
+        return usage
+    bucket = _TokenBucket(config.rate_limit_rps, config.rate_limit_burst) if config.rate_limit_rps > 0 else None
+
+    def injected_failure():
+        if bucket:
+            wait = bucket.take()
+            if wait:
+                stats["rate_limited"] += 1
+                return _error(429, "rate_limit_error", "Fake request rate limit exceeded",
+                              {"retry-after": str(math.ceil(wait))})
+        roll = random.random()
+        if roll < config.rate_limit_rate:
+            stats["rate_limited"] += 1
+            return _error(429, "rate_limit_error", "Fake rate limit",
+                          {"retry-after": str(config.retry_after_seconds)})
+        roll -= config.rate_limit_rate
+        if roll < config.overload_rate:
+            stats["overloaded"] += 1
+            return _error(529, "overloaded_error", "Fake overload")
+        roll -= config.overload_rate
+        if roll < config.error_rate:
+            stats["errors"] += 1
+            return _error(500, "api_error", "Fake internal error")
+        return None
+
+    def enter():
+        stats["in_flight"] += 1
+        stats["max_in_flight"] = max(stats["max_in_flight"], stats["in_flight"])
+
+    async def messages(request: Request):
+        stats["requests"] += 1
+        body = await request.json()
+        output_tokens = max(1, len(response_text) // 4)
+
+        failure = injected_failure()
+        if failure is not None:
+            return failure
+        usage = usage_for(body)
+
+        model = body.get("model", "claude-fake")
+        if not body.get("stream"):
+            enter()
+            try:
+                await asyncio.sleep(sample_latency(config))
+            finally:
+                stats["in_flight"] -= 1
+            stats["ok"] += 1
+            return JSONResponse({
+                "id": "msg_fake",
+                "type": "message",
+                "role": "assistant",
+                "model": model,
+                "content": [{"type": "text", "text": response_text}],
+                "stop_reason": "end_turn",
+                "stop_sequence": None,
+                "usage": {**usage, "output_tokens": output_tokens},
+            })
+
+        async def events():
+            yield _sse("message_start", {"type": "message_start", "message": {
+                "id": "msg_fake", "type": "message", "role": "assistant", "model": model,
+                "content": [], "stop_reason": None, "stop_sequence": None,
+                "usage": {**usage, "output_tokens": 1},
+            }})
+            yield _sse("content_block_start", {"type": "content_block_start", "index": 0,
+                                               "content_block": {"type": "text", "text": ""}})
+            chunks = [response_text[i:i + config.stream_chunk_chars]
+                      for i in range(0, len(response_text), config.stream_chunk_chars)]
+            delay = sample_latency(config) / max(len(chunks), 1)
+            enter()
+            try:
+                for chunk in chunks:
+                    await asyncio.sleep(delay)
+                    yield _sse("content_block_delta", {"type": "content_block_delta", "index": 0,
+                                                       "delta": {"type": "text_delta", "text": chunk}})
+            finally:
+                stats["in_flight"] -= 1
+            yield _sse("content_block_stop", {"type": "content_block_stop", "index": 0})
+            yield _sse("message_delta", {"type": "message_delta",
+                                         "delta": {"stop_reason": "end_turn", "stop_sequence": None},
+                                         "usage": {"output_tokens": output_tokens}})
+            yield _sse("message_stop", {"type": "message_stop"})
+            stats["ok"] += 1
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    def batch_result(params: Dict[str, Any]) -> Dict[str, Any]:
+        """Result of one batch request; answers longer than max_tokens are cut off"""
+        if random.random() < config.error_rate:
+            stats["errors"] += 1
+            return {"type": "errored", "error": {"type": "error", "error": {
+                "type": "api_error", "message": "Fake internal error"}}}
+        text, stop_reason = response_text, "end_turn"
+        if len(text) // 4 > params.get("max_tokens", 4096):
+            text, stop_reason = text[:params["max_tokens"] * 4], "max_tokens"
+        stats["ok"] += 1
+        return {"type": "succeeded", "message": {
+            "id": f"msg_fake_{uuid.uuid4().hex[:12]}",
+            "type": "message",
+            "role": "assistant",
+            "model": params.get("model", "claude-fake"),
+            "content": [{"type": "text", "text": text}],
+            "stop_reason": stop_reason,
+            "stop_sequence": None,
+            "usage": {**usage_for(params), "output_tokens": max(1, len(text) // 4)},
+        }}
+
+    def batch_object(batch: Dict[str, Any], request: Request) -> Dict[str, Any]:
+        ended = datetime.now(timezone.utc) >= batch["ends_at"]
+        counts = {"processing": 0, "succeeded": 0, "errored": 0, "canceled": 0, "expired": 0}
+        for result in batch["results"]:
+            counts[result["result"]["type"] if ended else "processing"] += 1
+        return {
+            "id": batch["id"],
+            "type": "message_batch",
+            "processing_status": "ended" if ended else "in_progress",
+            "request_counts": counts,
+            "created_at": batch["created_at"].isoformat(),
+            "expires_at": (batch["created_at"] + timedelta(hours=24)).isoformat(),
+            "ended_at": batch["ends_at"].isoformat() if ended else None,
+            "archived_at": None,
+            "cancel_initiated_at": None,
+            "results_url": str(request.url_for("batch_results", batch_id=batch["id"])) if ended else None,
+        }
+
+    async def create_batch(request: Request):
+        body = await request.json()
+        created_at = datetime.now(timezone.utc)
+        batch = {
+            "id": f"msgbatch_fake_{uuid.uuid4().hex[:16]}",
+            "created_at": created_at,
+            "ends_at": created_at + timedelta(seconds=config.batch_seconds),
+            "results": [
+                {"custom_id": item["custom_id"], "result": batch_result(item["params"])}
+                for item in body["requests"]
+            ],
+        }
+        batches[batch["id"]] = batch
+        stats["batches"] += 1
+        stats["batch_requests"] += len(body["requests"])
+        return JSONResponse(batch_object(batch, request))
+
+    async def get_batch(request: Request):
+        batch = batches.get(request.path_params["batch_id"])
+        if batch is None:
+            return _error(404, "not_found_error", "Batch not found")
+        return JSONResponse(batch_object(batch, request))
+
+    async def batch_results(request: Request):
+        batch = batches.get(request.path_params["batch_id"])
+        if batch is None or datetime.now(timezone.utc) < batch["ends_at"]:
+            return _error(404, "not_found_error", "Batch results not available")
+        lines = "".join(json.dumps(result) + "\n" for result in batch["results"])
+        return Response(lines, media_type="application/binary")
+
+    async def get_stats(request: Request):
+        return JSONResponse(stats)
+
+    return Starlette(routes=[
+        Route("/v1/messages", messages, methods=["POST"]),
+        Route("/v1/messages/batches", create_batch, methods=["POST"]),
+        Route("/v1/messages/batches/{batch_id}", get_batch, methods=["GET"]),
+        Route("/v1/messages/batches/{batch_id}/results", batch_results, methods=["GET"], name="batch_results"),
+        Route("/stats", get_stats, methods=["GET"]),
+    ])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--latency-ms", type=float, default=800.0, help="Response latency (median/mean)")
+    parser.add_argument("--latency-distribution", choices=LATENCY_DISTRIBUTIONS, default="fixed",
+                        help="Shape of the latency distribution")
+    parser.add_argument("--latency-spread", type=float, default=0.5,
+                        help="Uniform +/- fraction or lognormal sigma")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of 500 responses")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Fraction of 429 responses")
+    parser.add_argument("--overload-rate", type=float, default=0.0, help="Fraction of 529 responses")
+    parser.add_argument("--retry-after", type=int, default=1, help="Retry-After seconds sent with random 429s")
+    parser.add_argument("--rate-limit-rps", type=float, default=0.0,
+                        help="Requests per second before 429s (token bucket, 0 disables)")
+    parser.add_argument("--rate-limit-burst", type=int, default=10, help="Token bucket size")
+    parser.add_argument("--batch-seconds", type=float, default=2.0,
+                        help="Seconds until a message batch ends")
+    parser.add_argument("--cache-min-tokens", type=int, default=1024,
+                        help="Shortest system prompt (in tokens) that prompt caching applies to")
+    args = parser.parse_args()
+
+    config = FakeConfig(
+        latency_ms=args.latency_ms,
+        latency_distribution=args.latency_distribution,
+        latency_spread=args.latency_spread,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        overload_rate=args.overload_rate,
+        retry_after_seconds=args.retry_after,
+        rate_limit_rps=args.rate_limit_rps,
+        rate_limit_burst=args.rate_limit_burst,
+        cache_min_tokens=args.cache_min_tokens,
+        batch_seconds=args.batch_seconds,
+    )
+    uvicorn.run(create_app(config), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,394 @@
+"""
+Load Test
+Drives concurrent /api/parse-resume traffic against a real uvicorn server
+backed by the fake Anthropic server, at increasing concurrency levels
+
+Both servers run as subprocesses on free ports, so no API credits are spent
+and the app is measured with its production middleware, pools and workers.
+Clients upload a weighted mix of PDF, DOCX and TXT resumes in a closed loop:
+each of the --concurrency clients sends its next request as soon as the
+previous one finishes. Every level reports throughput, latency percentiles,
+an error breakdown by status code, the Claude calls the fake server saw and
+the RSS of every uvicorn worker (read from /proc, so Linux only).
+
+The result cache, near-duplicate index and request coalescing are disabled
+by default so that every request reaches Claude; pass --keep-caches to
+measure them too. Each combination of --workers and --claude-concurrency
+gets a fresh server.
+
+Usage:
+    python -m tools.load_test [--concurrency 1 4 16 64] [--duration 15]
+        [--workers 1 2] [--claude-concurrency 8] [--mix pdf=0.4,docx=0.4,txt=0.2]
+        [--latency-ms 800 --latency-distribution lognormal]
+        [--error-rate 0.02] [--rate-limit-rps 20] [--out report.json]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import httpx
+
+from benchmarks.corpus import make_docx, make_pdf, render_text, resume_sections
+from benchmarks.harness import percentile
+from tools.fake_anthropic import LATENCY_DISTRIBUTIONS
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CONTENT_TYPES = {
+    "pdf": "application/pdf",
+    "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    "txt": "text/plain",
+}
+# Work experience entries of the generated resumes, cycled through per document
+JOB_COUNTS = (2, 4, 8)
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_until_ready(process: subprocess.Popen, url: str, timeout: float = 30) -> None:
+    """Poll a URL until it answers 200, failing early if the process exits"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Server exited with code {process.returncode}")
+        try:
+            if httpx.get(url, timeout=1).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    process.kill()
+    raise RuntimeError(f"Server at {url} did not become ready")
+
+
+def _stop(process: subprocess.Popen) -> None:
+    process.terminate()
+    try:
+        process.wait(timeout=15)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+
+def parse_mix(value: str) -> Dict[str, float]:
+    """
+    Parse a "pdf=0.4,docx=0.4,txt=0.2" upload mix
+
+    Args:
+        value: Comma-separated type=weight pairs
+
+    Returns:
+        File type -> weight
+    """
+    mix = {}
+    for part in value.split(","):
+        kind, _, weight = part.partition("=")
+        kind = kind.strip().lower()
+        if kind not in CONTENT_TYPES:
+            raise argparse.ArgumentTypeError(f"Unknown file type in mix: {kind}")
+        mix[kind] = float(weight or 1)
+    return mix
+
+
+def build_documents(mix: Dict[str, float], per_type: int) -> List[Tuple[str, bytes, str]]:
+    """
+    Generate distinct resumes for every file type in the mix
+
+    Args:
+        mix: File type -> weight
+        per_type: Documents generated per file type
+
+    Returns:
+        (filename, content, content type) tuples
+    """
+    documents = []
+    for kind in mix:
+        for index in range(per_type):
+            sections = resume_sections(JOB_COUNTS[index % len(JOB_COUNTS)], seed=index)
+            if kind == "pdf":
+                content = make_pdf(render_text(sections))
+            elif kind == "docx":
+                content = make_docx(sections)
+            else:
+                content = render_text(sections).encode("utf-8")
+            documents.append((f"resume_{index}.{kind}", content, CONTENT_TYPES[kind]))
+    return documents
+
+
+def worker_pids(master_pid: int) -> List[int]:
+    """
+    Find the uvicorn worker processes of a server
+
+    With --workers 1 uvicorn serves from the master process itself;
+    otherwise the workers are its children (the multiprocessing resource
+    tracker is skipped).
+
+    Args:
+        master_pid: PID of the uvicorn process
+
+    Returns:
+        Worker PIDs
+    """
+    children = []
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                # The command name may contain spaces; fields resume after the last ")"
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+            if ppid != master_pid:
+                continue
+            with open(f"/proc/{entry}/cmdline", "rb") as f:
+                if b"resource_tracker" in f.read():
+                    continue
+        except (OSError, IndexError, ValueError):
+            continue
+        children.append(int(entry))
+    return sorted(children) or [master_pid]
+
+
+def read_rss_kb(pid: int) -> Dict[str, int]:
+    """
+    Read current and peak resident set size of a process
+
+    Args:
+        pid: Process ID
+
+    Returns:
+        {"rss_kb": VmRSS, "peak_rss_kb": VmHWM}, empty if the process is gone
+    """
+    fields = {"VmRSS:": "rss_kb", "VmHWM:": "peak_rss_kb"}
+    result = {}
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                parts = line.split()
+                if parts and parts[0] in fields:
+                    result[fields[parts[0]]] = int(parts[1])
+    except OSError:
+        pass
+    return result
+
+
+async def run_level(
+    base_url: str,
+    documents: List[Tuple[str, bytes, str]],
+    weights: List[float],
+    concurrency: int,
+    duration: float,
+    timeout: float,
+) -> Dict[str, Any]:
+    """
+    Run closed-loop clients against the app for a fixed time
+
+    Args:
+        base_url: App URL
+        documents: Upload candidates
+        weights: Sampling weight per document
+        concurrency: Concurrent clients
+        duration: Seconds to keep sending new requests
+        timeout: Per-request timeout in seconds
+
+    Returns:
+        Request counts, throughput, latency percentiles and errors
+    """
+    latencies: List[float] = []
+    outcomes: Counter = Counter()
+    deadline = time.monotonic() + duration
+
+    async def client_loop(client: httpx.AsyncClient) -> None:
+        while time.monotonic() < deadline:
+            filename, content, content_type = random.choices(documents, weights)[0]
+            started = time.perf_counter()
+            try:
+                response = await client.post("/api/parse-resume", files={"file": (filename, content, content_type)})
+                outcome = str(response.status_code)
+            except httpx.TimeoutException:
+                outcome = "timeout"
+            except httpx.HTTPError as e:
+                outcome = type(e).__name__
+            elapsed = (time.perf_counter() - started) * 1000
+            outcomes[outcome] += 1
+            if outcome == "200":
+                latencies.append(elapsed)
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, timeout=timeout, limits=limits) as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(client_loop(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    total = sum(outcomes.values())
+    latencies.sort()
+    result: Dict[str, Any] = {
+        "concurrency": concurrency,
+        "requests": total,
+        "succeeded": len(latencies),
+        "throughput_per_s": round(len(latencies) / elapsed, 2),
+        "error_rate": round(1 - len(latencies) / total, 4) if total else 0.0,
+        "errors": {outcome: count for outcome, count in sorted(outcomes.items()) if outcome != "200"},
+    }
+    if latencies:
+        result.update({
+            "latency_ms_p50": round(statistics.median(latencies), 1),
+            "latency_ms_p90": round(percentile(latencies, 0.90), 1),
+            "latency_ms_p99": round(percentile(latencies, 0.99), 1),
+            "latency_ms_max": round(latencies[-1], 1),
+        })
+    return result
+
+
+def run_server(args: argparse.Namespace, workers: int, claude_concurrency: int,
+               documents: List[Tuple[str, bytes, str]], weights: List[float]) -> List[Dict[str, Any]]:
+    """
+    Start the fake Anthropic server and the app, and sweep the concurrency levels
+
+    Args:
+        args: Parsed command line
+        workers: uvicorn worker processes
+        claude_concurrency: ANTHROPIC_MAX_CONCURRENCY per worker
+        documents: Upload candidates
+        weights: Sampling weight per document
+
+    Returns:
+        One result per concurrency level
+    """
+    log = open(args.server_log or os.devnull, "ab")
+    fake_port, app_port = _free_port(), _free_port()
+    fake_url, app_url = f"http://127.0.0.1:{fake_port}", f"http://127.0.0.1:{app_port}"
+    fake = subprocess.Popen([
+        sys.executable, "-m", "tools.fake_anthropic", "--port", str(fake_port),
+        "--latency-ms", str(args.latency_ms),
+        "--latency-distribution", args.latency_distribution,
+        "--latency-spread", str(args.latency_spread),
+        "--error-rate", str(args.error_rate),
+        "--rate-limit-rate", str(args.rate_limit_rate),
+        "--rate-limit-rps", str(args.rate_limit_rps),
+        "--rate-limit-burst", str(args.rate_limit_burst),
+    ], cwd=ROOT, stdout=log, stderr=log)
+    env = {
+        **os.environ,
+        "PYTHONPATH": ROOT,
+        "ANTHROPIC_API_KEY": "fake",
+        "ANTHROPIC_BASE_URL": fake_url,
+        "ANTHROPIC_MAX_CONCURRENCY": str(claude_concurrency),
+    }
+    if not args.keep_caches:
+        env.update({"RESULT_CACHE_ENABLED": "false", "NEAR_DUPLICATE_ENABLED": "false",
+                    "SINGLE_FLIGHT_ENABLED": "false"})
+    app = subprocess.Popen([
+        sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(app_port),
+        "--workers", str(workers), "--log-level", "warning", "--no-access-log",
+    ], cwd=ROOT, env=env, stdout=log, stderr=log)
+
+    levels = []
+    try:
+        _wait_until_ready(fake, f"{fake_url}/stats")
+        _wait_until_ready(app, f"{app_url}/health")
+        for concurrency in args.concurrency:
+            claude_before = httpx.get(f"{fake_url}/stats").json()
+            result = asyncio.run(run_level(app_url, documents, weights, concurrency, args.duration, args.timeout))
+            claude_after = httpx.get(f"{fake_url}/stats").json()
+            result["claude"] = {
+                name: claude_after[name] - claude_before[name]
+                for name in ("requests", "ok", "errors", "rate_limited", "overloaded")
+            }
+            result["claude"]["max_in_flight"] = claude_after["max_in_flight"]
+            result["workers"] = {str(pid): read_rss_kb(pid) for pid in worker_pids(app.pid)}
+            levels.append(result)
+            _print_level(workers, claude_concurrency, result)
+    finally:
+        _stop(app)
+        _stop(fake)
+        log.close()
+    return levels
+
+
+def _print_level(workers: int, claude_concurrency: int, result: Dict[str, Any]) -> None:
+    rss = [worker.get("rss_kb", 0) for worker in result["workers"].values()]
+    print(
+        f"workers={workers} claude={claude_concurrency} concurrency={result['concurrency']:4d} "
+        f"rps={result['throughput_per_s']:7.2f} p50={result.get('latency_ms_p50', 0):8.1f}ms "
+        f"p99={result.get('latency_ms_p99', 0):8.1f}ms errors={result['errors']} "
+        f"claude_calls={result['claude']['requests']} rss_mb={[round(kb / 1024) for kb in rss]}",
+        file=sys.stderr,
+    )
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    """
+    Run the full sweep
+
+    Args:
+        args: Parsed command line
+
+    Returns:
+        Report with the configuration and one entry per server configuration
+    """
+    mix = args.mix
+    documents = build_documents(mix, args.documents_per_type)
+    weights = [mix[filename.rsplit(".", 1)[1]] / args.documents_per_type for filename, _, _ in documents]
+
+    report: Dict[str, Any] = {"config": {
+        key: value for key, value in vars(args).items() if key not in ("out", "server_log")
+    }, "runs": []}
+    for workers in args.workers:
+        for claude_concurrency in args.claude_concurrency:
+            report["runs"].append({
+                "workers": workers,
+                "claude_concurrency": claude_concurrency,
+                "levels": run_server(args, workers, claude_concurrency, documents, weights),
+            })
+    return report
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16, 64],
+                        help="Concurrent clients per level, in order")
+    parser.add_argument("--duration", type=float, default=15, help="Seconds per level")
+    parser.add_argument("--timeout", type=float, default=120, help="Per-request client timeout")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1], help="uvicorn worker counts to test")
+    parser.add_argument("--claude-concurrency", type=int, nargs="+", default=[8],
+                        help="ANTHROPIC_MAX_CONCURRENCY values to test")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix("pdf=0.4,docx=0.4,txt=0.2"),
+                        help="Upload mix as type=weight pairs")
+    parser.add_argument("--documents-per-type", type=int, default=12, help="Distinct resumes per file type")
+    parser.add_argument("--keep-caches", action="store_true",
+                        help="Leave the result cache, near-duplicate index and coalescing enabled")
+    parser.add_argument("--latency-ms", type=float, default=800, help="Fake Claude latency (median/mean)")
+    parser.add_argument("--latency-distribution", choices=LATENCY_DISTRIBUTIONS, default="lognormal")
+    parser.add_argument("--latency-spread", type=float, default=0.5, help="Uniform fraction or lognormal sigma")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of fake 500 responses")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Fraction of random fake 429s")
+    parser.add_argument("--rate-limit-rps", type=float, default=0.0,
+                        help="Fake Claude request limit before 429s (0 disables)")
+    parser.add_argument("--rate-limit-burst", type=int, default=10, help="Fake Claude token bucket size")
+    parser.add_argument("--server-log", help="Append both servers' output to this file (default: discarded)")
+    parser.add_argument("--out", help="Also write the JSON report to this file")
+    args = parser.parse_args(argv)
+
+    report = run(args)
+    output = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(output + "\n")
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
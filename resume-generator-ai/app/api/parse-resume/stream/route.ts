@@ -0,0 +1,71 @@
+/**
+ * Next.js API Route - Streaming Resume Parser Proxy
+ * Proxies NDJSON section events from the FastAPI backend as they arrive
+ */
+
+import { NextRequest, NextResponse } from 'next/server';
+
+const FASTAPI_URL = process.env.FASTAPI_URL || 'http://localhost:8000';
+
+export async function POST(request: NextRequest) {
+  try {
+    const formData = await request.formData();
+    const file = formData.get('file') as File;
+    const structureWithAI = formData.get('structure_with_ai') !== 'false'; // Default true
+
+    if (!file) {
+      return NextResponse.json(
+        { error: 'No file provided' },
+        { status: 400 }
+      );
+    }
+
+    // Validate file size (10MB limit)
+    if (file.size > 10 * 1024 * 1024) {
+      return NextResponse.json(
+        { error: 'File size exceeds 10MB limit' },
+        { status: 400 }
+      );
+    }
+
+    const fastapiFormData = new FormData();
+    fastapiFormData.append('file', file);
+
+    const fastapiResponse = await fetch(
+      `${FASTAPI_URL}/api/parse-resume/stream?structure_with_ai=${structureWithAI}`,
+      {
+        method: 'POST',
+        body: fastapiFormData,
+      }
+    );
+
+    if (!fastapiResponse.ok || !fastapiResponse.body) {
+      const errorData = await fastapiResponse.json().catch(() => ({}));
+      return NextResponse.json(
+        {
+          error: errorData.detail || 'Failed to parse resume',
+          status: fastapiResponse.status
+        },
+        { status: fastapiResponse.status }
+      );
+    }
+
+    // Pass the event stream through untouched so sections reach the client immediately
+    return new Response(fastapiResponse.body, {
+      headers: {
+        'Content-Type': 'application/x-ndjson',
+        'Cache-Control': 'no-cache',
+      },
+    });
+
+  } catch (error) {
+    console.error('Error in parse-resume stream API route:', error);
+    return NextResponse.json(
+      {
+        error: 'Internal server error while processing resume',
+        details: error instanceof Error ? error.message : 'Unknown error'
+      },
+      { status: 500 }
+    );
+  }
+}